@@ -10,6 +10,48 @@ class _DaftSettings(BaseSettings):
 
     DAFT_PACKAGE_ZIP_S3_LOCATION: Optional[str] = "s3://eventual-release-artifacts-bucket/daft_package-amd64/latest.zip"
     DAFT_RUNNER: str = "PY"
+    # Files are split into partitions of roughly this many bytes when they are scanned
+    DAFT_SCAN_PARTITION_SIZE_BYTES: int = 128 * 1024 * 1024
+    # Partitions are read in batches of roughly this many bytes, which are filtered and projected as they are read
+    DAFT_SCAN_BATCH_SIZE_BYTES: int = 16 * 1024 * 1024
+    # Maximum number of Parquet footers that are cached in each process
+    DAFT_PARQUET_METADATA_CACHE_SIZE: int = 4096
+    # Number of threads used to list, sample and read files concurrently
+    DAFT_IO_NUM_THREADS: int = 32
+    # Listings of paths are reused for this many seconds, where 0 disables caching. Files that are added, removed or
+    # overwritten while a listing is cached are not seen until it expires
+    DAFT_LISTING_CACHE_TTL_SECONDS: float = 0
+    # Number of files whose schemas are inferred and unified when reading CSV, JSON or Parquet files
+    DAFT_SCHEMA_INFERENCE_NUM_FILES: int = 8
+    # Files written by DataFrame.write_parquet and write_csv are split to hold roughly this many bytes of data each
+    DAFT_WRITE_TARGET_FILE_SIZE_BYTES: int = 512 * 1024 * 1024
+    # Directory that blocks of remote files are cached in as they are read, where None disables the cache
+    DAFT_BLOCK_CACHE_DIR: Optional[str] = None
+    # Least recently used blocks are evicted from the block cache when it holds more than this many bytes
+    DAFT_BLOCK_CACHE_SIZE_BYTES: int = 16 * 1024 * 1024 * 1024
+    # Remote files are read and cached in blocks of this many bytes when the block cache is enabled
+    DAFT_BLOCK_CACHE_BLOCK_SIZE_BYTES: int = 4 * 1024 * 1024
+    # Maximum number of URLs that url.download() fetches concurrently in each partition
+    DAFT_DOWNLOAD_MAX_CONNECTIONS: int = 32
+    # Maximum number of bytes that url.download() fetches concurrently in each partition, estimated from the sizes of
+    # the URLs that have already been downloaded, and at first from an even share of the bytes per connection
+    DAFT_DOWNLOAD_MAX_INFLIGHT_BYTES: int = 256 * 1024 * 1024
+    # Number of times that url.download() retries a failed URL, waiting exponentially longer after each failure
+    DAFT_DOWNLOAD_NUM_RETRIES: int = 3
+    DAFT_DOWNLOAD_RETRY_BACKOFF_SECONDS: float = 0.1
+    # Directory that url.download() caches downloaded bytes in, where None disables the cache
+    DAFT_DOWNLOAD_CACHE_DIR: Optional[str] = None
+    # Least recently used downloads are evicted from the download cache when it holds more than this many bytes
+    DAFT_DOWNLOAD_CACHE_SIZE_BYTES: int = 16 * 1024 * 1024 * 1024
+    # Whether cached downloads are checked against the ETag or size of their URL before they are used. If disabled,
+    # cached downloads are used without contacting the filesystem, and a URL whose contents change is not read again
+    DAFT_DOWNLOAD_CACHE_REVALIDATE: bool = True
+    # Partitions that are followed by a limit are computed in waves, multiplying the number of computed partitions by
+    # this factor with each wave, until they produce enough rows for the limit
+    DAFT_LIMIT_SCALE_UP_FACTOR: int = 4
+    # Joins where one side is estimated to be smaller than this many bytes broadcast that side to every partition of
+    # the other side, instead of repartitioning both sides by their keys
+    DAFT_BROADCAST_JOIN_THRESHOLD_BYTES: int = 10 * 1024 * 1024
     CI: bool = False
 
 
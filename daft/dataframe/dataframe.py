@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import functools
 import io
+import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import partial
 from typing import IO, Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 import pandas
 import pyarrow as pa
-import pyarrow.parquet as papq
 from loguru import logger
 from pyarrow import csv, json
 
@@ -16,13 +18,21 @@ from daft.dataframe.schema import DataFrameSchema
 from daft.datasources import (
     CSVSourceInfo,
     InMemorySourceInfo,
+    IPCSourceInfo,
     JSONSourceInfo,
     ParquetSourceInfo,
+    ScanType,
+    infer_hive_partition_schema,
+    plan_ipc_partitions,
+    plan_parquet_partitions,
+    plan_text_partitions,
 )
-from daft.execution.operators import ExpressionType
-from daft.expressions import ColumnExpression, Expression, col
-from daft.filesystem import get_filesystem_from_path
+from daft.execution.operators import ExpressionType, PythonExpressionType
+from daft.execution.scan_operators import open_ipc_file
+from daft.expressions import ColumnExpression, Expression, col, lit
+from daft.filesystem import FileInfo, get_parquet_metadata, list_files, open_file
 from daft.logical import logical_plan
+from daft.logical.optimizer import get_num_rows_from_metadata
 from daft.logical.schema import ExpressionList
 from daft.runners.partitioning import PartitionSet
 from daft.runners.pyrunner import PyRunner
@@ -39,35 +49,117 @@ from daft.config import DaftSettings
 
 _RUNNER: Optional[Runner] = None
 
+# Maximum number of inferred schemas of CSV and JSON files that are cached
+_SCHEMA_CACHE_SIZE = 1024
+
+# Aggregation of approximate quantiles, with an optional quantile such as `approx_quantile(0.99)`
+_APPROX_QUANTILE_PATTERN = re.compile(r"approx_quantile(?:\((?P<q>[0-9.eE+-]+)\))?")
+
 
 def _sample_with_pyarrow(
     loader_func: Callable[[IO], pa.Table],
     filepath: str,
     max_bytes: int = 5 * 1024**2,
-) -> ExpressionList:
-    fs = get_filesystem_from_path(filepath)
-    sampled_bytes = io.BytesIO()
-    with fs.open(filepath, compression="infer") as f:
-        lines = f.readlines(max_bytes)
-        for line in lines:
-            sampled_bytes.write(line)
-    sampled_bytes.seek(0)
-    sampled_tbl = loader_func(sampled_bytes)
-    fields = [(field.name, field.type) for field in sampled_tbl.schema]
-    schema = ExpressionList(
-        [ColumnExpression(name, expr_type=ExpressionType.from_arrow_type(type_)) for name, type_ in fields]
+) -> pa.Schema:
+    with open_file(filepath, compression="infer") as f:
+        sampled_bytes = f.read(max_bytes)
+    if len(sampled_bytes) == max_bytes and b"\n" in sampled_bytes:
+        # Drop the last line, which may have been cut off
+        sampled_bytes = sampled_bytes[: sampled_bytes.rindex(b"\n") + 1]
+    sampled_tbl = loader_func(io.BytesIO(sampled_bytes))
+    assert sampled_tbl is not None, f"Unable to read file {filepath} to determine schema"
+    return sampled_tbl.schema
+
+
+@functools.lru_cache(maxsize=_SCHEMA_CACHE_SIZE)
+def _infer_csv_schema(
+    file: FileInfo, delimiter: str, has_headers: bool, column_names: Optional[Tuple[str, ...]]
+) -> pa.Schema:
+    return _sample_with_pyarrow(
+        partial(
+            csv.read_csv,
+            parse_options=csv.ParseOptions(
+                delimiter=delimiter,
+            ),
+            read_options=csv.ReadOptions(
+                # Column names will be read from the first CSV row if column_names is None/empty and has_headers
+                autogenerate_column_names=(not has_headers) and (column_names is None),
+                column_names=column_names,
+                # If user specifies that CSV has headers, and also provides column names, we skip the header row
+                skip_rows_after_names=1 if has_headers and column_names is not None else 0,
+            ),
+        ),
+        file.path,
     )
-    assert schema is not None, f"Unable to read file {filepath} to determine schema"
-    return schema
 
 
-def _get_filepaths(path: str):
-    fs = get_filesystem_from_path(path)
-    if fs.isdir(path):
-        return fs.ls(path)
-    elif fs.isfile(path):
-        return [path]
-    return fs.expand_path(path)
+@functools.lru_cache(maxsize=_SCHEMA_CACHE_SIZE)
+def _infer_json_schema(file: FileInfo) -> pa.Schema:
+    return _sample_with_pyarrow(json.read_json, file.path)
+
+
+def _infer_parquet_schema(file: FileInfo) -> pa.Schema:
+    return get_parquet_metadata(file.path).schema.to_arrow_schema()
+
+
+def _infer_ipc_schema(file: FileInfo) -> pa.Schema:
+    return open_ipc_file(file.path).schema
+
+
+def _unify_types(left: pa.DataType, right: pa.DataType) -> Optional[pa.DataType]:
+    if left == right or pa.types.is_null(right):
+        return left
+    elif pa.types.is_null(left):
+        return right
+    elif pa.types.is_integer(left) and pa.types.is_integer(right):
+        return pa.int64()
+    elif (pa.types.is_integer(left) or pa.types.is_floating(left)) and (
+        pa.types.is_integer(right) or pa.types.is_floating(right)
+    ):
+        return pa.float64()
+    return None
+
+
+def _infer_schema(infer_file_schema: Callable[[FileInfo], pa.Schema], files: List[FileInfo]) -> ExpressionList:
+    """Infers the schemas of the first DAFT_SCHEMA_INFERENCE_NUM_FILES files concurrently, and unifies them into
+    one schema. Columns with different numeric types are widened, and other differences are reported as errors.
+    """
+    sampled_files = files[: max(DaftSettings.DAFT_SCHEMA_INFERENCE_NUM_FILES, 1)]
+    with ThreadPoolExecutor(max_workers=DaftSettings.DAFT_IO_NUM_THREADS) as pool:
+        schemas = list(pool.map(infer_file_schema, sampled_files))
+
+    unified = schemas[0]
+    for file, schema in zip(sampled_files[1:], schemas[1:]):
+        if schema.names != unified.names:
+            raise ValueError(
+                f"Columns {schema.names} of {file.path} do not match columns {unified.names} of {sampled_files[0].path}"
+            )
+        fields = []
+        for unified_field, field in zip(unified, schema):
+            unified_type = _unify_types(unified_field.type, field.type)
+            if unified_type is None:
+                raise ValueError(
+                    f"Column {field.name} of {file.path} has type {field.type}, which does not match type "
+                    f"{unified_field.type} in other files"
+                )
+            fields.append(pa.field(field.name, unified_type))
+        unified = pa.schema(fields)
+    return ExpressionList(
+        [ColumnExpression(field.name, expr_type=ExpressionType.from_arrow_type(field.type)) for field in unified]
+    )
+
+
+def _with_hive_partition_columns(
+    schema: ExpressionList, path: str, files: List[FileInfo]
+) -> Tuple[ExpressionList, Tuple[str, ...]]:
+    """Appends the Hive partition columns discovered in the directories of the files to their schema. Columns in the
+    files take precedence over partition columns with the same name.
+    """
+    hive_fields = [field for field in infer_hive_partition_schema(path, files) if field.name not in schema.names]
+    hive_columns = [
+        ColumnExpression(field.name, expr_type=ExpressionType.from_arrow_type(field.type)) for field in hive_fields
+    ]
+    return ExpressionList(list(schema) + hive_columns), tuple(field.name for field in hive_fields)
 
 
 class DataFrame:
@@ -149,19 +241,7 @@ class DataFrame:
         """
         if not data:
             raise ValueError("Unable to create DataFrame from empty list")
-        schema = ExpressionList(
-            [
-                ColumnExpression(header, expr_type=ExpressionType.from_py_type(type(data[0][header])))
-                for header in data[0]
-            ]
-        )
-        plan = logical_plan.Scan(
-            schema=schema,
-            predicate=None,
-            columns=None,
-            source_info=InMemorySourceInfo(data={header: [row[header] for row in data] for header in data[0]}),
-        )
-        return cls(plan)
+        return cls.from_pydict({header: [row[header] for row in data] for header in data[0]})
 
     @classmethod
     def from_pydict(cls, data: Dict[str, Any]) -> DataFrame:
@@ -179,11 +259,98 @@ class DataFrame:
         schema = ExpressionList(
             [ColumnExpression(header, expr_type=ExpressionType.from_py_type(type(data[header][0]))) for header in data]
         )
+        # Columns are converted to Arrow once here, instead of every time that the DataFrame is executed
+        arrow_columns = {}
+        py_columns = {}
+        for column in schema:
+            name = column.name()
+            assert name is not None
+            if isinstance(column.resolved_type(), PythonExpressionType):
+                py_columns[name] = list(data[name])
+            else:
+                arrow_columns[name] = pa.array(data[name])
+        return cls._from_in_memory_data(schema, pa.table(arrow_columns), py_columns)
+
+    @classmethod
+    def from_arrow(cls, data: Union[pa.Table, List[pa.RecordBatch]], num_partitions: int = 1) -> DataFrame:
+        """Creates a DataFrame from an Arrow Table or a list of Arrow RecordBatches, without copying their data.
+        Each partition is a slice of the data, and partitions differ in size by at most one row.
+
+        Example:
+            >>> df = DataFrame.from_arrow(pa.table({"foo": [1, 2]}), num_partitions=2)
+
+        Args:
+            data (Union[pa.Table, List[pa.RecordBatch]]): Arrow data to create the DataFrame from
+            num_partitions (int): number of partitions to split the data into, defaults to 1
+
+        Returns:
+            DataFrame: DataFrame backed by the Arrow data
+        """
+        if num_partitions < 1:
+            raise ValueError(f"num_partitions must be at least 1, got {num_partitions}")
+        table = data if isinstance(data, pa.Table) else pa.Table.from_batches(data)
+        schema = ExpressionList(
+            [
+                ColumnExpression(field.name, expr_type=ExpressionType.from_arrow_type(field.type))
+                for field in table.schema
+            ]
+        )
+        # Columns of Arrow types that Daft does not support, such as nested types, are read as Python objects
+        py_column_names = [
+            field.name
+            for field, column in zip(table.schema, schema)
+            if isinstance(column.resolved_type(), PythonExpressionType)
+        ]
+        py_columns = {name: table[name].to_pylist() for name in py_column_names}
+        arrow_table = table.drop(py_column_names) if py_column_names else table
+        return cls._from_in_memory_data(schema, arrow_table, py_columns, num_partitions=num_partitions)
+
+    @classmethod
+    def from_pandas(cls, data: pandas.DataFrame, num_partitions: int = 1) -> DataFrame:
+        """Creates a DataFrame from a pandas DataFrame. Columns are converted to Arrow without copying where Arrow
+        can share the memory of the pandas columns, such as numeric columns without nulls. The index is dropped.
+
+        Example:
+            >>> df = DataFrame.from_pandas(pd.DataFrame({"foo": [1, 2]}), num_partitions=2)
+
+        Args:
+            data (pandas.DataFrame): pandas DataFrame to create the DataFrame from
+            num_partitions (int): number of partitions to split the data into, defaults to 1
+
+        Returns:
+            DataFrame: DataFrame created from the pandas DataFrame
+        """
+        if num_partitions < 1:
+            raise ValueError(f"num_partitions must be at least 1, got {num_partitions}")
+        columns = []
+        arrow_columns = {}
+        py_columns = {}
+        for name in data.columns:
+            series = data[name]
+            try:
+                arrow_columns[name] = pa.Array.from_pandas(series)
+                expr_type = ExpressionType.from_arrow_type(arrow_columns[name].type)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                expr_type = ExpressionType.python_object()
+            if isinstance(expr_type, PythonExpressionType):
+                arrow_columns.pop(name, None)
+                py_columns[name] = series.to_list()
+                if len(series) > 0:
+                    expr_type = ExpressionType.from_py_type(type(series.iloc[0]))
+            columns.append(ColumnExpression(name, expr_type=expr_type))
+        return cls._from_in_memory_data(
+            ExpressionList(columns), pa.table(arrow_columns), py_columns, num_partitions=num_partitions
+        )
+
+    @classmethod
+    def _from_in_memory_data(
+        cls, schema: ExpressionList, table: pa.Table, py_columns: Dict[str, List[Any]], num_partitions: int = 1
+    ) -> DataFrame:
         plan = logical_plan.Scan(
             schema=schema,
             predicate=None,
             columns=None,
-            source_info=InMemorySourceInfo(data=data),
+            source_info=InMemorySourceInfo(table=table, py_columns=py_columns, num_partitions=num_partitions),
         )
         return cls(plan)
 
@@ -194,6 +361,10 @@ class DataFrame:
     ) -> DataFrame:
         """Creates a DataFrame from line-delimited JSON file(s)
 
+        Directories named `key=value` under the path, such as `date=2022-08-01/region=us`, are read as Hive
+        partitions: each key becomes a column with the value from the path of each file, and filters on these
+        columns skip the directories that do not match without reading their files.
+
         Example:
             >>> df = DataFrame.from_json("/path/to/file.json")
             >>> df = DataFrame.from_json("/path/to/directory")
@@ -206,18 +377,26 @@ class DataFrame:
         returns:
             DataFrame: parsed DataFrame
         """
-        filepaths = _get_filepaths(path)
+        files = list_files(path)
+        filepaths = [file.path for file in files]
 
         if len(filepaths) == 0:
             raise ValueError(f"No JSON files found at {path}")
 
-        schema = _sample_with_pyarrow(json.read_json, filepaths[0])
+        schema, hive_partition_columns = _with_hive_partition_columns(
+            _infer_schema(_infer_json_schema, files), path, files
+        )
 
         plan = logical_plan.Scan(
             schema=schema,
             predicate=None,
             columns=None,
-            source_info=JSONSourceInfo(filepaths=filepaths),
+            source_info=JSONSourceInfo(
+                filepaths=filepaths,
+                partitions=plan_text_partitions(files, DaftSettings.DAFT_SCAN_PARTITION_SIZE_BYTES),
+                hive_partition_columns=hive_partition_columns,
+                size_bytes=sum(file.size for file in files),
+            ),
         )
         return cls(plan)
 
@@ -231,6 +410,10 @@ class DataFrame:
     ) -> DataFrame:
         """Creates a DataFrame from CSV file(s)
 
+        Directories named `key=value` under the path, such as `date=2022-08-01/region=us`, are read as Hive
+        partitions: each key becomes a column with the value from the path of each file, and filters on these
+        columns skip the directories that do not match without reading their files.
+
         Example:
             >>> df = DataFrame.from_csv("/path/to/file.csv")
             >>> df = DataFrame.from_csv("/path/to/directory")
@@ -246,27 +429,22 @@ class DataFrame:
         returns:
             DataFrame: parsed DataFrame
         """
-        filepaths = _get_filepaths(path)
+        files = list_files(path)
+        filepaths = [file.path for file in files]
 
         if len(filepaths) == 0:
             raise ValueError(f"No CSV files found at {path}")
 
-        schema = _sample_with_pyarrow(
+        schema = _infer_schema(
             partial(
-                csv.read_csv,
-                parse_options=csv.ParseOptions(
-                    delimiter=delimiter,
-                ),
-                read_options=csv.ReadOptions(
-                    # Column names will be read from the first CSV row if column_names is None/empty and has_headers
-                    autogenerate_column_names=(not has_headers) and (column_names is None),
-                    column_names=column_names,
-                    # If user specifies that CSV has headers, and also provides column names, we skip the header row
-                    skip_rows_after_names=1 if has_headers and column_names is not None else 0,
-                ),
+                _infer_csv_schema,
+                delimiter=delimiter,
+                has_headers=has_headers,
+                column_names=tuple(column_names) if column_names is not None else None,
             ),
-            filepaths[0],
+            files,
         )
+        schema, hive_partition_columns = _with_hive_partition_columns(schema, path, files)
         plan = logical_plan.Scan(
             schema=schema,
             predicate=None,
@@ -275,6 +453,9 @@ class DataFrame:
                 filepaths=filepaths,
                 delimiter=delimiter,
                 has_headers=has_headers,
+                partitions=plan_text_partitions(files, DaftSettings.DAFT_SCAN_PARTITION_SIZE_BYTES),
+                hive_partition_columns=hive_partition_columns,
+                size_bytes=sum(file.size for file in files),
             ),
         )
         return cls(plan)
@@ -283,6 +464,10 @@ class DataFrame:
     def from_parquet(cls, path: str) -> DataFrame:
         """Creates a DataFrame from Parquet file(s)
 
+        Directories named `key=value` under the path, such as `date=2022-08-01/region=us`, are read as Hive
+        partitions: each key becomes a column with the value from the path of each file, and filters on these
+        columns skip the directories that do not match without reading their files.
+
         Example:
             >>> df = DataFrame.from_parquet("/path/to/file.parquet")
             >>> df = DataFrame.from_parquet("/path/to/directory")
@@ -295,21 +480,15 @@ class DataFrame:
         returns:
             DataFrame: parsed DataFrame
         """
-        filepaths = _get_filepaths(path)
+        files = list_files(path)
+        filepaths = [file.path for file in files]
 
         if len(filepaths) == 0:
             raise ValueError(f"No Parquet files found at {path}")
 
-        filepath = filepaths[0]
-        fs = get_filesystem_from_path(filepath)
-        with fs.open(filepath, "rb") as f:
-            # Read first Parquet file to ascertain schema
-            schema = ExpressionList(
-                [
-                    ColumnExpression(field.name, expr_type=ExpressionType.from_arrow_type(field.type))
-                    for field in papq.ParquetFile(f).metadata.schema.to_arrow_schema()
-                ]
-            )
+        schema, hive_partition_columns = _with_hive_partition_columns(
+            _infer_schema(_infer_parquet_schema, files), path, files
+        )
 
         plan = logical_plan.Scan(
             schema=schema,
@@ -317,10 +496,141 @@ class DataFrame:
             columns=None,
             source_info=ParquetSourceInfo(
                 filepaths=filepaths,
+                partitions=plan_parquet_partitions(files, DaftSettings.DAFT_SCAN_PARTITION_SIZE_BYTES),
+                hive_partition_columns=hive_partition_columns,
+                size_bytes=sum(file.size for file in files),
+            ),
+        )
+        return cls(plan)
+
+    @classmethod
+    def from_ipc(cls, path: str) -> DataFrame:
+        """Creates a DataFrame from Arrow IPC file(s), also known as Feather V2 files
+
+        Local files are memory-mapped rather than read, so scans only read the pages of the columns that are
+        accessed, and do not copy their data. Hive partitions under the path are read as columns, as in
+        :meth:`from_parquet <daft.DataFrame.from_parquet>`.
+
+        Example:
+            >>> df = DataFrame.from_ipc("/path/to/file.arrow")
+            >>> df = DataFrame.from_ipc("/path/to/directory")
+            >>> df = DataFrame.from_ipc("s3://path/to/files-*.feather")
+
+        Args:
+            path (str): Path to Arrow IPC file (allows for wildcards)
+
+        returns:
+            DataFrame: parsed DataFrame
+        """
+        files = list_files(path)
+        filepaths = [file.path for file in files]
+
+        if len(filepaths) == 0:
+            raise ValueError(f"No Arrow IPC files found at {path}")
+
+        schema, hive_partition_columns = _with_hive_partition_columns(
+            _infer_schema(_infer_ipc_schema, files), path, files
+        )
+
+        plan = logical_plan.Scan(
+            schema=schema,
+            predicate=None,
+            columns=None,
+            source_info=IPCSourceInfo(
+                filepaths=filepaths,
+                partitions=plan_ipc_partitions(files, DaftSettings.DAFT_SCAN_PARTITION_SIZE_BYTES),
+                hive_partition_columns=hive_partition_columns,
+                size_bytes=sum(file.size for file in files),
             ),
         )
         return cls(plan)
 
+    ###
+    # Write methods
+    ###
+
+    def write_parquet(
+        self, root_dir: str, partition_by: Optional[List[str]] = None, target_file_size: Optional[int] = None
+    ) -> DataFrame:
+        """Writes the DataFrame to Parquet files under a directory. Each partition is written by its own task, into
+        one or more files of roughly `target_file_size` bytes of data each. This is a blocking operation.
+
+        Example:
+            >>> written = df.write_parquet("s3://path/to/events", partition_by=["date"])
+
+        Args:
+            root_dir (str): directory to write the files under
+            partition_by (Optional[List[str]]): columns to partition the files by into Hive-style `key=value`
+                directories, which are not written to the files themselves, defaults to None
+            target_file_size (Optional[int]): target number of bytes of data per file, defaults to
+                DAFT_WRITE_TARGET_FILE_SIZE_BYTES
+
+        Returns:
+            DataFrame: DataFrame with the `path`, `num_rows`, `size_bytes` and `column_stats` of each written file
+        """
+        return self._write(ScanType.PARQUET, root_dir, partition_by=partition_by, target_file_size=target_file_size)
+
+    def write_csv(
+        self, root_dir: str, partition_by: Optional[List[str]] = None, target_file_size: Optional[int] = None
+    ) -> DataFrame:
+        """Writes the DataFrame to CSV files with headers under a directory. Each partition is written by its own
+        task, into one or more files of roughly `target_file_size` bytes of data each. This is a blocking operation.
+
+        Example:
+            >>> written = df.write_csv("s3://path/to/events", partition_by=["date"])
+
+        Args:
+            root_dir (str): directory to write the files under
+            partition_by (Optional[List[str]]): columns to partition the files by into Hive-style `key=value`
+                directories, which are not written to the files themselves, defaults to None
+            target_file_size (Optional[int]): target number of bytes of data per file, defaults to
+                DAFT_WRITE_TARGET_FILE_SIZE_BYTES
+
+        Returns:
+            DataFrame: DataFrame with the `path`, `num_rows`, `size_bytes` and `column_stats` of each written file
+        """
+        return self._write(ScanType.CSV, root_dir, partition_by=partition_by, target_file_size=target_file_size)
+
+    def write_ipc(
+        self, root_dir: str, partition_by: Optional[List[str]] = None, target_file_size: Optional[int] = None
+    ) -> DataFrame:
+        """Writes the DataFrame to Arrow IPC files (Feather V2) under a directory, which can be memory-mapped when
+        they are read back with :meth:`from_ipc <daft.DataFrame.from_ipc>`. Each partition is written by its own
+        task, into one or more files of roughly `target_file_size` bytes of data each. This is a blocking operation.
+
+        Example:
+            >>> written = df.write_ipc("/path/to/events", partition_by=["date"])
+
+        Args:
+            root_dir (str): directory to write the files under
+            partition_by (Optional[List[str]]): columns to partition the files by into Hive-style `key=value`
+                directories, which are not written to the files themselves, defaults to None
+            target_file_size (Optional[int]): target number of bytes of data per file, defaults to
+                DAFT_WRITE_TARGET_FILE_SIZE_BYTES
+
+        Returns:
+            DataFrame: DataFrame with the `path`, `num_rows`, `size_bytes` and `column_stats` of each written file
+        """
+        return self._write(ScanType.IPC, root_dir, partition_by=partition_by, target_file_size=target_file_size)
+
+    def _write(
+        self,
+        storage_type: ScanType,
+        root_dir: str,
+        partition_by: Optional[List[str]],
+        target_file_size: Optional[int],
+    ) -> DataFrame:
+        plan = logical_plan.FileWrite(
+            self._plan,
+            storage_type=storage_type,
+            root_dir=root_dir,
+            partition_cols=partition_by,
+            target_file_size=target_file_size
+            if target_file_size is not None
+            else DaftSettings.DAFT_WRITE_TARGET_FILE_SIZE_BYTES,
+        )
+        return DataFrame(plan).collect()
+
     ###
     # DataFrame operations
     ###
@@ -369,7 +679,7 @@ class DataFrame:
         gb = self.groupby(*[col(e.name()) for e in all_exprs])
         first_e_name = [e.name() for e in all_exprs][0]
         dummy_col_name = str(uuid.uuid4())
-        return gb.agg([(col(first_e_name).alias(dummy_col_name), "min")]).exclude(dummy_col_name)
+        return gb.agg([(col(first_e_name).alias(dummy_col_name), "first")]).exclude(dummy_col_name)
 
     def exclude(self, *names: str) -> DataFrame:
         """Drops columns from the current DataFrame by name.
@@ -495,6 +805,7 @@ class DataFrame:
         left_on: Optional[Union[List[ColumnInputType], ColumnInputType]] = None,
         right_on: Optional[Union[List[ColumnInputType], ColumnInputType]] = None,
         how: str = "inner",
+        strategy: Optional[str] = None,
     ) -> DataFrame:
         """Joins left (self) DataFrame on the right on a set of keys.
         Key names can be the same or different for left and right DataFrame.
@@ -509,6 +820,11 @@ class DataFrame:
             left_on (Optional[Union[List[ColumnInputType], ColumnInputType]], optional): key or keys to join on left DataFrame.. Defaults to None.
             right_on (Optional[Union[List[ColumnInputType], ColumnInputType]], optional): key or keys to join on right DataFrame. Defaults to None.
             how (str, optional): what type of join to performing, currently only `inner` is supported. Defaults to "inner".
+            strategy (Optional[str], optional): how to distribute the join, either `hash` to repartition both sides by their
+                keys, `broadcast` to join the smaller side with every partition of the other side without repartitioning
+                it, or `sort_merge` to merge join sides that are both sorted by their keys. Defaults to None, which merge
+                joins sorted sides, and otherwise broadcasts a side if its estimated size is under
+                `DAFT_BROADCAST_JOIN_THRESHOLD_BYTES`.
 
         Raises:
             ValueError: if `on` is passed in and `left_on` or `right_on` is not None.
@@ -530,7 +846,12 @@ class DataFrame:
         left_exprs = self.__column_input_to_expression(tuple(left_on) if isinstance(left_on, list) else (left_on,))
         right_exprs = self.__column_input_to_expression(tuple(right_on) if isinstance(right_on, list) else (right_on,))
         join_op = logical_plan.Join(
-            self._plan, other._plan, left_on=left_exprs, right_on=right_exprs, how=logical_plan.JoinType.INNER
+            self._plan,
+            other._plan,
+            left_on=left_exprs,
+            right_on=right_exprs,
+            how=logical_plan.JoinType.INNER,
+            strategy=logical_plan.JoinStrategy(strategy) if strategy is not None else None,
         )
         return DataFrame(join_op)
 
@@ -544,54 +865,96 @@ class DataFrame:
             "count": Expression._count,
             "min": Expression._min,
             "max": Expression._max,
-            "count": Expression._count,
+            "first": Expression._first,
+            "count_distinct": Expression._count_distinct,
+            "distinct": Expression._distinct,
+            "moments": Expression._moments,
+            "moments_merge": Expression._moments_merge,
+            "hll_sketch": Expression._hll_sketch,
+            "hll_merge": Expression._hll_merge,
+            "tdigest_sketch": Expression._tdigest_sketch,
+            "tdigest_merge": Expression._tdigest_merge,
         }
+        # Each aggregation is computed in two phases: the first phase reduces each partition to small partial states,
+        # which the second phase merges after the partial states of each group are moved to the same partition
         intermediate_ops = {
             "sum": ("sum",),
             "count": ("count",),
             "mean": ("sum", "count"),
             "min": ("min",),
             "max": ("max",),
+            "first": ("first",),
+            "count_distinct": ("distinct",),
+            "variance": ("moments",),
+            "stddev": ("moments",),
+            "approx_count_distinct": ("hll_sketch",),
+            "approx_quantile": ("tdigest_sketch",),
         }
 
-        reduction_ops = {"sum": ("sum",), "count": ("sum",), "mean": ("sum", "sum"), "min": ("min",), "max": ("max",)}
+        # The expressions that the partial states are merged with, as functions of the columns of the partial states
+        reduction_ops: Dict[str, Tuple[Tuple[str, Callable], ...]] = {
+            "sum": (("sum", lambda s: s),),
+            "count": (("sum", lambda n: n),),
+            "mean": (("sum", lambda s, n: s), ("sum", lambda s, n: n)),
+            "min": (("min", lambda m: m),),
+            "max": (("max", lambda m: m),),
+            "first": (("first", lambda f: f),),
+            "count_distinct": (("count_distinct", lambda d: d),),
+            "variance": (("moments_merge", lambda m: m),),
+            "stddev": (("moments_merge", lambda m: m),),
+            "approx_count_distinct": (("hll_merge", lambda s: s),),
+            "approx_quantile": (("tdigest_merge", lambda d: d),),
+        }
 
-        finalizer_ops_funcs = {"mean": lambda x, y: (x + 0.0) / (y + 0.0)}
+        finalizer_ops_funcs: Dict[str, Callable] = {
+            "mean": lambda x, y: (x + 0.0) / (y + 0.0),
+            "variance": lambda m: m._moments_variance(),
+            "stddev": lambda m: m._moments_variance() ** 0.5,
+            "approx_count_distinct": lambda s: s._hll_cardinality(),
+            "approx_quantile": lambda d, q: d._tdigest_quantile(lit(q)),
+        }
 
         first_phase_ops: List[Tuple[Expression, str]] = []
         second_phase_ops: List[Tuple[Expression, str]] = []
         finalizer_phase_ops: List[Expression] = []
         need_final_projection = False
         for e, op in zip(exprs_to_agg, ops):
-            assert op in intermediate_ops
+            # Approximate quantiles are requested as `approx_quantile(q)`, and default to the median
+            quantile = 0.5
+            quantile_match = _APPROX_QUANTILE_PATTERN.fullmatch(op)
+            if quantile_match is not None:
+                op = "approx_quantile"
+                if quantile_match.group("q") is not None:
+                    quantile = float(quantile_match.group("q"))
+                if not 0.0 <= quantile <= 1.0:
+                    raise ValueError(f"quantile of approx_quantile must be in [0, 1], got {quantile}")
+            if op not in intermediate_ops:
+                raise ValueError(f"unknown aggregation {op}, expected one of {list(intermediate_ops)}")
             ops_to_add = intermediate_ops[op]
 
-            e_intermediate_name = []
+            intermediate_cols = []
             for agg_op in ops_to_add:
                 name = f"{e.name()}_{agg_op}"
                 f = function_lookup[agg_op]
                 new_e = f(e).alias(name)
                 first_phase_ops.append((new_e, agg_op))
-                e_intermediate_name.append(new_e.name())
+                intermediate_cols.append(col(name))
 
-            assert op in reduction_ops
-            ops_to_add = reduction_ops[op]
             added_exprs = []
-            for agg_op, result_name in zip(ops_to_add, e_intermediate_name):
-                assert result_name is not None
-                col_e = col(result_name)
+            for i, (agg_op, merge_fn) in enumerate(reduction_ops[op]):
                 f = function_lookup[agg_op]
-                added: Expression = f(col_e)
+                added: Expression = f(merge_fn(*intermediate_cols))
                 if op in finalizer_ops_funcs:
-                    name = f"{result_name}_{agg_op}"
-                    added = added.alias(name)
+                    added = added.alias(f"{e.name()}_{op}_{i}")
                 else:
                     added = added.alias(e.name())
                 second_phase_ops.append((added, agg_op))
                 added_exprs.append(added)
 
             if op in finalizer_ops_funcs:
-                f = finalizer_ops_funcs[op]
+                finalize = finalizer_ops_funcs[op]
+                if op == "approx_quantile":
+                    finalize = partial(finalize, q=quantile)
                 operand_args = []
                 for ae in added_exprs:
                     col_name = ae.name()
@@ -599,7 +962,7 @@ class DataFrame:
                     operand_args.append(col(col_name))
                 final_name = e.name()
                 assert final_name is not None
-                new_e = f(*operand_args).alias(final_name)
+                new_e = finalize(*operand_args).alias(final_name)
                 finalizer_phase_ops.append(new_e)
                 need_final_projection = True
             else:
@@ -657,6 +1020,84 @@ class DataFrame:
         assert len(cols) > 0, "no columns were passed in"
         return self._agg([(c, "mean") for c in cols])
 
+    def min(self, *cols: ColumnInputType) -> DataFrame:
+        """Performs a global min on the DataFrame on a sequence of columns.
+
+        Args:
+            *cols (Union[str, Expression]): columns to min
+        Returns:
+            DataFrame: Globally aggregated min. Should be a single row.
+        """
+        assert len(cols) > 0, "no columns were passed in"
+        return self._agg([(c, "min") for c in cols])
+
+    def max(self, *cols: ColumnInputType) -> DataFrame:
+        """Performs a global max on the DataFrame on a sequence of columns.
+
+        Args:
+            *cols (Union[str, Expression]): columns to max
+        Returns:
+            DataFrame: Globally aggregated max. Should be a single row.
+        """
+        assert len(cols) > 0, "no columns were passed in"
+        return self._agg([(c, "max") for c in cols])
+
+    def agg(self, to_agg: List[Tuple[ColumnInputType, str]]) -> DataFrame:
+        """Performs global aggregations on the DataFrame. Allows for mixed aggregations.
+
+        Supported aggregations are `sum`, `count`, `mean`, `min`, `max`, `first`, `count_distinct`, `variance` and
+        `stddev`. Nulls are ignored, except by `first` which takes the value of the first row.
+
+        `approx_count_distinct` and `approx_quantile(q)` estimate the number of distinct values and the quantile `q` of
+        a column from HyperLogLog and t-digest sketches, which are a few KB however many values they summarize.
+        `approx_quantile` without a quantile estimates the median.
+
+        Example:
+            >>> df = df.agg([
+            >>>     ('x', 'sum'),
+            >>>     ('y', 'count_distinct'),
+            >>>     (col('z').alias('z_stddev'), 'stddev'),
+            >>>     (col('z').alias('z_p99'), 'approx_quantile(0.99)'),
+            >>> ])
+
+        Args:
+            to_agg (List[Tuple[ColumnInputType, str]]): list of (column, agg_type)
+
+        Returns:
+            DataFrame: Globally aggregated DataFrame. Should be a single row.
+        """
+        return self._agg(to_agg)
+
+    def count(self) -> int:
+        """Counts the rows of the DataFrame. This is a blocking operation.
+
+        Scans of Parquet files that are not filtered, or only filtered on Hive partition columns, are counted from the
+        row counts in the Parquet footers without reading any data. Otherwise only one column is read to count the rows.
+
+        Example:
+            >>> num_rows = DataFrame.from_parquet("s3://path/to/events").count()
+
+        Returns:
+            int: number of rows in the DataFrame
+        """
+        if self._result is not None:
+            return len(self._result)
+        num_rows_from_metadata = get_num_rows_from_metadata(self._plan)
+        if num_rows_from_metadata is not None:
+            return num_rows_from_metadata
+
+        schema = self._plan.schema()
+        arrow_columns = [e.name() for e in schema if not isinstance(e.resolved_type(), PythonExpressionType)]
+        if len(arrow_columns) == 0:
+            # Python objects cannot be aggregated, so the rows of one column are materialized and counted instead
+            result = self.select(schema.names[0]).collect()._result
+            assert result is not None
+            return len(result)
+        # Null checks are never null, so counting them counts every row
+        counted = self._agg([(col(arrow_columns[0]).is_null().alias("count"), "count")]).to_arrow()
+        num_rows: int = counted["count"][0].as_py() if len(counted) > 0 else 0
+        return num_rows
+
     def groupby(self, *group_by: ColumnInputType) -> GroupedDataFrame:
         """Performs a GroupBy on the DataFrame for Aggregation.
 
@@ -692,6 +1133,21 @@ class DataFrame:
         self._result = None
         return pd_df
 
+    def to_arrow(self) -> pa.Table:
+        """Converts the current DataFrame to an Arrow Table, whose columns are made of the chunks of each partition
+        without copying them. Columns of Python objects are converted to Arrow, which fails if Arrow cannot represent
+        the objects. If results have not computed yet, collect will be called.
+
+        Returns:
+            pa.Table: Arrow Table converted from a Daft DataFrame
+        """
+        self.collect()
+        assert self._result is not None
+        table = self._result.to_arrow(schema=self._plan.schema())
+        del self._result
+        self._result = None
+        return table
+
     def _get_runner(self) -> Runner:
         global _RUNNER
         if _RUNNER is not None:
@@ -733,9 +1189,38 @@ class GroupedDataFrame:
 
         return self.df._agg([(c, "mean") for c in cols], group_by=self.group_by)
 
+    def min(self, *cols: ColumnInputType) -> DataFrame:
+        """Performs grouped min on this GroupedDataFrame.
+
+        Args:
+            *cols (Union[str, Expression]): columns to min
+
+        Returns:
+            DataFrame: DataFrame with grouped min.
+        """
+        return self.df._agg([(c, "min") for c in cols], group_by=self.group_by)
+
+    def max(self, *cols: ColumnInputType) -> DataFrame:
+        """Performs grouped max on this GroupedDataFrame.
+
+        Args:
+            *cols (Union[str, Expression]): columns to max
+
+        Returns:
+            DataFrame: DataFrame with grouped max.
+        """
+        return self.df._agg([(c, "max") for c in cols], group_by=self.group_by)
+
     def agg(self, to_agg: List[Tuple[ColumnInputType, str]]) -> DataFrame:
         """Perform aggregations on this GroupedDataFrame. Allows for mixed aggregations.
 
+        Supported aggregations are `sum`, `count`, `mean`, `min`, `max`, `first`, `count_distinct`, `variance` and
+        `stddev`. Nulls are ignored, except by `first` which takes the value of the first row of each group.
+
+        `approx_count_distinct` and `approx_quantile(q)` estimate the number of distinct values and the quantile `q` of
+        each group from HyperLogLog and t-digest sketches, which are a few KB however many values they summarize.
+        `approx_quantile` without a quantile estimates the median.
+
         Example:
         >>> df = df.groupby('x').agg([
         >>>     ('x', 'sum'),
@@ -1,7 +1,21 @@
+import math
+import re
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+import pyarrow as pa
+from fsspec.utils import infer_compression
+from pyarrow import parquet
+
+from daft.filesystem import (
+    FileInfo,
+    get_listing_root,
+    get_parquet_metadata,
+    strip_protocol,
+)
 
 if sys.version_info < (3, 8):
     from typing_extensions import Protocol
@@ -14,6 +28,19 @@ class ScanType(Enum):
     PARQUET = "PARQUET"
     IN_MEMORY = "IN_MEMORY"
     JSON = "JSON"
+    IPC = "IPC"
+
+
+@dataclass(frozen=True)
+class FileSplit:
+    """A part of a file that is read as one partition of a Scan"""
+
+    path: str
+    # Byte range [start, end) of a text file, where each line is read by the split that it starts in
+    start: int = 0
+    end: Optional[int] = None
+    # Row groups of a Parquet file, where None reads all row groups
+    row_groups: Optional[Tuple[int, ...]] = None
 
 
 class SourceInfo(Protocol):
@@ -32,46 +59,329 @@ class CSVSourceInfo(SourceInfo):
     filepaths: List[str]
     delimiter: str
     has_headers: bool
+    partitions: Optional[List[List[FileSplit]]] = None
+    # Columns whose values are parsed from `key=value` directories in the path of each file
+    hive_partition_columns: Tuple[str, ...] = ()
+    # Total size of the files in bytes, if known, which is used to estimate the size of the data
+    size_bytes: Optional[int] = None
 
     def scan_type(self):
         return ScanType.CSV
 
     def get_num_partitions(self) -> int:
-        return len(self.filepaths)
+        return len(self.partitions) if self.partitions is not None else len(self.filepaths)
+
+    def get_splits(self, partition_id: int) -> List[FileSplit]:
+        if self.partitions is not None:
+            return self.partitions[partition_id]
+        return [FileSplit(self.filepaths[partition_id])]
 
 
 @dataclass(frozen=True)
 class JSONSourceInfo(SourceInfo):
 
     filepaths: List[str]
+    partitions: Optional[List[List[FileSplit]]] = None
+    # Columns whose values are parsed from `key=value` directories in the path of each file
+    hive_partition_columns: Tuple[str, ...] = ()
+    # Total size of the files in bytes, if known, which is used to estimate the size of the data
+    size_bytes: Optional[int] = None
 
     def scan_type(self):
         return ScanType.JSON
 
     def get_num_partitions(self) -> int:
-        return len(self.filepaths)
+        return len(self.partitions) if self.partitions is not None else len(self.filepaths)
+
+    def get_splits(self, partition_id: int) -> List[FileSplit]:
+        if self.partitions is not None:
+            return self.partitions[partition_id]
+        return [FileSplit(self.filepaths[partition_id])]
 
 
 @dataclass(frozen=True)
 class InMemorySourceInfo(SourceInfo):
 
-    data: Dict[str, List[Any]]
+    # Columns that are stored in Arrow, which are converted once so that every partition is a zero-copy slice
+    table: pa.Table
+    # Columns of Python objects that cannot be stored in Arrow
+    py_columns: Dict[str, List[Any]] = field(default_factory=dict)
     num_partitions: int = 1
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "InMemorySourceInfo":
+        # The data is never modified, so copies of a plan (such as those made by the optimizer) share its buffers
+        return self
+
     def scan_type(self):
         return ScanType.IN_MEMORY
 
     def get_num_partitions(self) -> int:
         return self.num_partitions
 
+    def num_rows(self) -> int:
+        if self.table.num_columns > 0:
+            num_rows: int = self.table.num_rows
+            return num_rows
+        return len(next(iter(self.py_columns.values()), []))
+
+    def get_partition_bounds(self, partition_id: int) -> Tuple[int, int]:
+        """Returns the range of rows [start, end) in a partition, where partitions differ in size by at most one row"""
+        num_rows = self.num_rows()
+        return (
+            num_rows * partition_id // self.num_partitions,
+            num_rows * (partition_id + 1) // self.num_partitions,
+        )
+
 
 @dataclass(frozen=True)
 class ParquetSourceInfo(SourceInfo):
 
     filepaths: List[str]
+    partitions: Optional[List[List[FileSplit]]] = None
+    # Columns whose values are parsed from `key=value` directories in the path of each file
+    hive_partition_columns: Tuple[str, ...] = ()
+    # Total size of the files in bytes, if known, which is used to estimate the size of the data
+    size_bytes: Optional[int] = None
 
     def scan_type(self):
         return ScanType.PARQUET
 
     def get_num_partitions(self) -> int:
-        return len(self.filepaths)
+        return len(self.partitions) if self.partitions is not None else len(self.filepaths)
+
+    def get_splits(self, partition_id: int) -> List[FileSplit]:
+        if self.partitions is not None:
+            return self.partitions[partition_id]
+        return [FileSplit(self.filepaths[partition_id])]
+
+
+@dataclass(frozen=True)
+class IPCSourceInfo(SourceInfo):
+    """Arrow IPC files, also known as Feather V2 files, which are memory-mapped when they are read"""
+
+    filepaths: List[str]
+    partitions: Optional[List[List[FileSplit]]] = None
+    # Columns whose values are parsed from `key=value` directories in the path of each file
+    hive_partition_columns: Tuple[str, ...] = ()
+    # Total size of the files in bytes, if known, which is used to estimate the size of the data
+    size_bytes: Optional[int] = None
+
+    def scan_type(self):
+        return ScanType.IPC
+
+    def get_num_partitions(self) -> int:
+        return len(self.partitions) if self.partitions is not None else len(self.filepaths)
+
+    def get_splits(self, partition_id: int) -> List[FileSplit]:
+        if self.partitions is not None:
+            return self.partitions[partition_id]
+        return [FileSplit(self.filepaths[partition_id])]
+
+
+# Name of the directory that Hive uses for partitions whose value is null
+HIVE_DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+_INTEGER_PATTERN = re.compile(r"[+-]?[0-9]+")
+
+
+def get_hive_partitions(path: str) -> Dict[str, Optional[str]]:
+    """Parses the values of Hive partitions from the `key=value` directories in a path, such as
+    `events/date=2022-08-01/region=us/part-0.parquet`. Values of the default partition are parsed as None.
+    """
+    partitions: Dict[str, Optional[str]] = {}
+    for component in path.split("/")[:-1]:
+        key, sep, value = component.partition("=")
+        if sep and key:
+            value = unquote(value)
+            partitions[unquote(key)] = None if value == HIVE_DEFAULT_PARTITION else value
+    return partitions
+
+
+def _infer_hive_partition_type(values: List[Optional[str]]) -> pa.DataType:
+    non_null_values = [value for value in values if value is not None]
+    if len(non_null_values) == 0:
+        return pa.string()
+    if all(_INTEGER_PATTERN.fullmatch(value) for value in non_null_values):
+        return pa.int64()
+    try:
+        for value in non_null_values:
+            float(value)
+        return pa.float64()
+    except ValueError:
+        return pa.string()
+
+
+def infer_hive_partition_schema(path: str, files: List[FileInfo]) -> pa.Schema:
+    """Discovers the Hive partitions of the files listed at a path. Only the directories below the root of the
+    listing are considered, and only partition keys that are found in the path of every file are used. Values
+    are typed as integers or floats if all of them can be parsed as such, and as strings otherwise.
+
+    Args:
+        path (str): path that was listed, which may be a directory or a glob
+        files (List[FileInfo]): files listed at the path
+
+    Returns:
+        pa.Schema: the partition columns, ordered as their directories are nested
+    """
+    root = strip_protocol(get_listing_root(path)).rstrip("/")
+    relative_paths = []
+    for file in files:
+        file_path = strip_protocol(file.path)
+        relative_paths.append(file_path[len(root) :] if file_path.startswith(root + "/") else "")
+    partitions = [get_hive_partitions(relative_path) for relative_path in relative_paths]
+    if len(partitions) == 0:
+        return pa.schema([])
+    keys = [key for key in partitions[0] if all(key in file_partitions for file_partitions in partitions)]
+    return pa.schema(
+        [(key, _infer_hive_partition_type([file_partitions[key] for file_partitions in partitions])) for key in keys]
+    )
+
+
+def get_hive_partition_table(paths: List[str], schema: pa.Schema) -> pa.Table:
+    """Builds a table with the values of the Hive partitions in `schema` for each path"""
+    partitions = [get_hive_partitions(path) for path in paths]
+    return pa.table(
+        {
+            field.name: pa.array([p.get(field.name) for p in partitions], type=pa.string()).cast(field.type)
+            for field in schema
+        },
+        schema=schema,
+    )
+
+
+def split_text_file(path: str, size: int, target_partition_size: int) -> List[FileSplit]:
+    """Splits a line-delimited text file into byte ranges of roughly `target_partition_size` bytes each.
+    Compressed files cannot be read from an arbitrary offset, and are never split.
+
+    Args:
+        path (str): path to the file
+        size (int): size of the file in bytes
+        target_partition_size (int): target number of bytes to read per split
+
+    Returns:
+        List[FileSplit]: splits that together cover the whole file
+    """
+    if infer_compression(path) is not None or size <= target_partition_size:
+        return [FileSplit(path)]
+    num_splits = math.ceil(size / target_partition_size)
+    boundaries = [size * i // num_splits for i in range(num_splits + 1)]
+    return [FileSplit(path, start=start, end=end) for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+
+def _row_group_size(metadata: parquet.FileMetaData, i: int) -> int:
+    row_group = metadata.row_group(i)
+    return sum(row_group.column(j).total_compressed_size for j in range(row_group.num_columns))
+
+
+def split_parquet_file(path: str, metadata: parquet.FileMetaData, target_partition_size: int) -> List[FileSplit]:
+    """Splits a Parquet file at row group boundaries into splits of roughly `target_partition_size` bytes each,
+    as measured by the compressed size of the row groups.
+
+    Args:
+        path (str): path to the file
+        metadata (parquet.FileMetaData): footer of the file
+        target_partition_size (int): target number of bytes to read per split
+
+    Returns:
+        List[FileSplit]: splits that together cover all row groups of the file
+    """
+    if metadata.num_row_groups <= 1:
+        return [FileSplit(path)]
+    splits = []
+    row_groups: List[int] = []
+    split_size = 0
+    for i in range(metadata.num_row_groups):
+        row_group_size = _row_group_size(metadata, i)
+        if row_groups and split_size + row_group_size > target_partition_size:
+            splits.append(FileSplit(path, row_groups=tuple(row_groups)))
+            row_groups, split_size = [], 0
+        row_groups.append(i)
+        split_size += row_group_size
+    if len(splits) == 0:
+        return [FileSplit(path)]
+    splits.append(FileSplit(path, row_groups=tuple(row_groups)))
+    return splits
+
+
+def pack_splits(sized_splits: List[Tuple[FileSplit, int]], target_partition_size: int) -> List[List[FileSplit]]:
+    """Packs consecutive splits into partitions of up to `target_partition_size` bytes each, so that many small
+    files are read by a single task. Splits keep their order, and a split larger than the target is a partition
+    on its own.
+
+    Args:
+        sized_splits (List[Tuple[FileSplit, int]]): splits and their sizes in bytes
+        target_partition_size (int): target number of bytes to read per partition
+
+    Returns:
+        List[List[FileSplit]]: splits to read for each partition
+    """
+    partitions: List[List[FileSplit]] = []
+    partition: List[FileSplit] = []
+    partition_size = 0
+    for split, size in sized_splits:
+        if partition and partition_size + size > target_partition_size:
+            partitions.append(partition)
+            partition, partition_size = [], 0
+        partition.append(split)
+        partition_size += size
+    if partition:
+        partitions.append(partition)
+    return partitions
+
+
+def plan_text_partitions(files: List[FileInfo], target_partition_size: int) -> List[List[FileSplit]]:
+    """Plans the partitions of a Scan over line-delimited text files, splitting large files and packing small ones
+
+    Args:
+        files (List[FileInfo]): files to scan
+        target_partition_size (int): target number of bytes to read per partition
+
+    Returns:
+        List[List[FileSplit]]: splits to read for each partition
+    """
+    sized_splits = [
+        (split, (split.end if split.end is not None else file.size) - split.start)
+        for file in files
+        for split in split_text_file(file.path, file.size, target_partition_size)
+    ]
+    return pack_splits(sized_splits, target_partition_size)
+
+
+def plan_parquet_partitions(files: List[FileInfo], target_partition_size: int) -> List[List[FileSplit]]:
+    """Plans the partitions of a Scan over Parquet files, splitting large files at row group boundaries and
+    packing small ones
+
+    Args:
+        files (List[FileInfo]): files to scan
+        target_partition_size (int): target number of bytes to read per partition
+
+    Returns:
+        List[List[FileSplit]]: splits to read for each partition
+    """
+    sized_splits = []
+    for file in files:
+        if file.size <= target_partition_size:
+            # Small files are read whole, so their footers do not need to be read while planning
+            sized_splits.append((FileSplit(file.path), file.size))
+            continue
+        metadata = get_parquet_metadata(file.path)
+        for split in split_parquet_file(file.path, metadata, target_partition_size):
+            if split.row_groups is None:
+                sized_splits.append((split, file.size))
+            else:
+                sized_splits.append((split, sum(_row_group_size(metadata, i) for i in split.row_groups)))
+    return pack_splits(sized_splits, target_partition_size)
+
+
+def plan_ipc_partitions(files: List[FileInfo], target_partition_size: int) -> List[List[FileSplit]]:
+    """Plans the partitions of a Scan over Arrow IPC files, packing small files. Files are not split, since
+    reading a whole file only maps it into memory.
+
+    Args:
+        files (List[FileInfo]): files to scan
+        target_partition_size (int): target number of bytes to read per partition
+
+    Returns:
+        List[List[FileSplit]]: splits to read for each partition
+    """
+    return pack_splits([(FileSplit(file.path), file.size) for file in files], target_partition_size)
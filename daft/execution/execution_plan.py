@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from io import StringIO
-from typing import ClassVar, List
+from typing import ClassVar, List, Optional
 
-from daft.logical.logical_plan import LogicalPlan, OpLevel
+from daft.logical.logical_plan import GlobalLimit, Join, LogicalPlan, OpLevel
 from daft.resource_request import ResourceRequest
 
 
@@ -12,11 +12,15 @@ class ExecutionOp:
     logical_ops: List[LogicalPlan]
     num_partitions: int
     data_deps: List[int]
+    # Number of rows of the output that are used, if it is followed by a GlobalLimit, so that partitions after the
+    # ones that produce these rows do not need to be computed
+    limit: Optional[int]
     is_global_op: ClassVar[bool] = False
 
     def __init__(self, logical_ops: List[LogicalPlan], num_partitions: int) -> None:
         self.logical_ops = logical_ops
         self.num_partitions = num_partitions
+        self.limit = None
         all_deps = set()
         for node in logical_ops:
             for child in node._children():
@@ -25,7 +29,8 @@ class ExecutionOp:
 
     def __repr__(self) -> str:
         builder = StringIO()
-        builder.write(f"{self.__class__.__name__}(num_partitions={self.num_partitions})\n")
+        limit = f", limit={self.limit}" if self.limit is not None else ""
+        builder.write(f"{self.__class__.__name__}(num_partitions={self.num_partitions}{limit})\n")
         for op in self.logical_ops:
             builder.write(f"\t{repr(op)}\n\n")
         return builder.getvalue()
@@ -64,7 +69,13 @@ class ExecutionPlan:
         for lop in post_order:
             if lop.op_level() == OpLevel.ROW or lop.op_level() == OpLevel.PARTITION:
                 if len(for_each_so_far) > 0:
-                    if (for_each_so_far[-1].num_partitions() != lop.num_partitions()) or (len(lop._children()) == 0):
+                    # A sort merge Join reads partitions of its children other than its own, so its children are
+                    # computed in full before it
+                    if (
+                        (for_each_so_far[-1].num_partitions() != lop.num_partitions())
+                        or (len(lop._children()) == 0)
+                        or (isinstance(lop, Join) and lop.sorted_desc() is not None)
+                    ):
                         exec_plan.append(
                             ForEachPartition(for_each_so_far, num_partitions=for_each_so_far[-1].num_partitions())
                         )
@@ -86,4 +97,13 @@ class ExecutionPlan:
             exec_plan.append(ForEachPartition(for_each_so_far, num_partitions=for_each_so_far[-1].num_partitions()))
             for_each_so_far = []
 
+        for op, next_op in zip(exec_plan, exec_plan[1:]):
+            next_lop = next_op.logical_ops[0]
+            if (
+                not op.is_global_op
+                and isinstance(next_lop, GlobalLimit)
+                and next_lop._children()[0].id() == op.logical_ops[-1].id()
+            ):
+                op.limit = next_lop._num
+
         return cls(exec_plan)
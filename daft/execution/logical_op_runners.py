@@ -1,20 +1,38 @@
 from abc import abstractmethod
 from bisect import bisect_right
 from itertools import accumulate
-from typing import Callable, ClassVar, Dict, List, Type, TypeVar
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
-from pyarrow import csv, json, parquet
+import pyarrow as pa
+import pyarrow.compute as pac
 
+from daft.config import DaftSettings
 from daft.datasources import (
     CSVSourceInfo,
     InMemorySourceInfo,
+    IPCSourceInfo,
     JSONSourceInfo,
     ParquetSourceInfo,
     ScanType,
 )
-from daft.filesystem import get_filesystem_from_path
+from daft.execution import scan_operators, write_operators
+from daft.expressions import Expression
 from daft.logical.logical_plan import (
     Coalesce,
+    FileWrite,
     Filter,
     GlobalLimit,
     Join,
@@ -30,7 +48,7 @@ from daft.logical.logical_plan import (
 from daft.logical.schema import ExpressionList
 from daft.resource_request import ResourceRequest
 from daft.runners.blocks import DataBlock
-from daft.runners.partitioning import PartitionSet, vPartition
+from daft.runners.partitioning import PartID, PartitionSet, vPartition
 from daft.runners.shuffle_ops import (
     CoalesceOp,
     RepartitionHashOp,
@@ -41,6 +59,16 @@ from daft.runners.shuffle_ops import (
 )
 
 
+def partition_key_range(part: vPartition, expr: Expression) -> Optional[Tuple[Any, Any]]:
+    """Returns the minimum and maximum of an expression over the non-null rows of a partition, or None if the
+    partition has no such rows
+    """
+    min_max = pac.min_max(part.eval_expression(expr).block.data)
+    if not min_max["min"].is_valid:
+        return None
+    return min_max["min"].as_py(), min_max["max"].as_py()
+
+
 class LogicalPartitionOpRunner:
     @abstractmethod
     def run_node_list(
@@ -49,20 +77,107 @@ class LogicalPartitionOpRunner:
         nodes: List[LogicalPlan],
         num_partitions: int,
         resource_request: ResourceRequest,
+        limit: Optional[int] = None,
     ):
+        """Runs a list of nodes on each partition. If a limit is given, only the output rows up to the limit are used,
+        so partitions are computed in order until they have produced that many rows, and the rest of the partitions
+        are left empty.
+        """
         raise NotImplementedError()
 
     def run_node_list_single_partition(
         self, inputs: Dict[int, vPartition], nodes: List[LogicalPlan], partition_id: int
     ) -> vPartition:
         part_set = {nid: part for nid, part in inputs.items()}
-        for node in nodes:
+        num_streamed = self._num_streamed_nodes(nodes)
+        if num_streamed > 0:
+            output = self._run_streamed_nodes(nodes[:num_streamed], partition_id=partition_id)
+            part_set[nodes[num_streamed - 1].id()] = output
+        for node in nodes[num_streamed:]:
             output = self.run_single_node(inputs=part_set, node=node, partition_id=partition_id)
             part_set[node.id()] = output
             for child in node._children():
                 del part_set[child.id()]
         return output
 
+    @abstractmethod
+    def _key_ranges(self, pset: PartitionSet, expr: Expression) -> List[Optional[Tuple[Any, Any]]]:
+        """Returns the minimum and maximum of an expression over the non-null rows of each partition, which is None
+        for partitions without such rows
+        """
+        raise NotImplementedError()
+
+    def _input_partition_ids(
+        self, inputs: Dict[int, PartitionSet], nodes: List[LogicalPlan], num_partitions: int
+    ) -> Dict[int, List[List[PartID]]]:
+        """Returns the IDs of the partitions of each input that are read by each partition of `nodes`, which are
+        merged into a single partition of the input. Inputs are read partition by partition, except for the broadcast
+        side of a Join, which is a single partition that is read by every partition, and the right side of a sort
+        merge Join, of which every partition whose keys overlap with the keys of a left partition is read.
+        """
+        partition_ids = {nid: [[PartID(i)] for i in range(num_partitions)] for nid in inputs}
+        for node in nodes:
+            if not isinstance(node, Join):
+                continue
+            broadcast_child = node.broadcast_child()
+            if broadcast_child is not None:
+                partition_ids[broadcast_child.id()] = [[PartID(0)] for _ in range(num_partitions)]
+            if node.sorted_desc() is not None:
+                left, right = node._children()
+                left_ranges = self._key_ranges(inputs[left.id()], node._left_on.exprs[0])
+                right_ranges = self._key_ranges(inputs[right.id()], node._right_on.exprs[0])
+                partition_ids[right.id()] = [
+                    [
+                        PartID(j)
+                        for j, right_range in enumerate(right_ranges)
+                        if left_range is not None
+                        and right_range is not None
+                        and right_range[0] <= left_range[1]
+                        and left_range[0] <= right_range[1]
+                    ]
+                    for left_range in left_ranges
+                ]
+        return partition_ids
+
+    def _num_streamed_nodes(self, nodes: List[LogicalPlan]) -> int:
+        """Returns the length of the chain of nodes at the start of `nodes` that can be run batch by batch: a Scan
+        followed by Filters, Projections and LocalLimits that each consume the output of the previous node
+        """
+        if len(nodes) == 0 or not isinstance(nodes[0], Scan):
+            return 0
+        num_streamed = 1
+        for prev, node in zip(nodes, nodes[1:]):
+            if not isinstance(node, (Filter, Projection, LocalLimit)) or node._children()[0].id() != prev.id():
+                break
+            num_streamed += 1
+        return num_streamed
+
+    def _run_streamed_nodes(self, nodes: List[LogicalPlan], partition_id: int) -> vPartition:
+        """Runs a Scan and the Filters, Projections and LocalLimits after it on each batch read by the Scan, so that
+        the whole input of the partition is never held in memory at once
+        """
+        scan = nodes[0]
+        assert isinstance(scan, Scan)
+        limits = {node.id(): node._num for node in nodes if isinstance(node, LocalLimit)}
+        outputs = []
+        batches = self._iter_scan(scan, partition_id=partition_id)
+        try:
+            for batch in batches:
+                for prev, node in zip(nodes, nodes[1:]):
+                    if isinstance(node, LocalLimit):
+                        batch = batch.head(limits[node.id()])
+                        limits[node.id()] -= len(batch)
+                    else:
+                        batch = self.run_single_node(inputs={prev.id(): batch}, node=node, partition_id=partition_id)
+                outputs.append(batch)
+                # Every row passes through all the LocalLimits, so no more batches are needed once one is reached
+                if any(num == 0 for num in limits.values()):
+                    break
+        finally:
+            batches.close()
+        non_empty_outputs = [output for output in outputs if len(output) > 0]
+        return vPartition.merge_partitions(non_empty_outputs if len(non_empty_outputs) > 0 else outputs[:1])
+
     def run_single_node(self, inputs: Dict[int, vPartition], node: LogicalPlan, partition_id: int) -> vPartition:
         if isinstance(node, Scan):
             return self._handle_scan(inputs, node, partition_id=partition_id)
@@ -76,50 +191,110 @@ class LogicalPartitionOpRunner:
             return self._handle_local_aggregate(inputs, node, partition_id=partition_id)
         elif isinstance(node, Join):
             return self._handle_join(inputs, node, partition_id=partition_id)
+        elif isinstance(node, FileWrite):
+            return self._handle_file_write(inputs, node, partition_id=partition_id)
         else:
             raise NotImplementedError(f"{type(node)} not implemented")
 
     def _handle_scan(self, inputs: Dict[int, vPartition], scan: Scan, partition_id: int) -> vPartition:
+        return vPartition.merge_partitions(list(self._iter_scan(scan, partition_id=partition_id)))
+
+    def _iter_scan(self, scan: Scan, partition_id: int) -> Generator[vPartition, None, None]:
+        """Reads a partition of a Scan in batches of roughly DAFT_SCAN_BATCH_SIZE_BYTES, yielding at least one batch
+        and stopping once the limit of the Scan is reached
+        """
         schema = scan.schema()
-        column_ids = [col.get_id() for col in schema.to_column_expressions()]
+        # Columns that need to be read: the Scan's output columns and any columns required by its predicate
+        predicate_ids = scan._predicate.required_columns().to_id_set()
+        read_column_names = schema.names + [
+            col.name() for col in scan._schema if col.get_id() in predicate_ids and col.name() not in schema.names
+        ]
+        read_schema = scan._schema.keep(read_column_names)
+        column_ids = [col.get_id() for col in read_schema]
+        batch_size = DaftSettings.DAFT_SCAN_BATCH_SIZE_BYTES
+
+        vparts: Iterable[vPartition]
         if scan._source_info.scan_type() == ScanType.IN_MEMORY:
-            assert isinstance(scan._source_info, InMemorySourceInfo)
-            table_len = [len(scan._source_info.data[key]) for key in scan._source_info.data][0]
-            partition_size = table_len // scan._source_info.num_partitions
-            start, end = (partition_size * partition_id, partition_size * (partition_id + 1))
-            data = {key: scan._source_info.data[key][start:end] for key in scan._source_info.data}
-            vpart = vPartition.from_pydict(data, schema=schema, partition_id=partition_id)
-            return vpart
-        elif scan._source_info.scan_type() == ScanType.CSV:
-            assert isinstance(scan._source_info, CSVSourceInfo)
-            path = scan._source_info.filepaths[partition_id]
-            fs = get_filesystem_from_path(path)
-            table = csv.read_csv(
-                fs.open(path, compression="infer"),
-                parse_options=csv.ParseOptions(
-                    delimiter=scan._source_info.delimiter,
-                ),
-                read_options=csv.ReadOptions(
-                    column_names=[expr.name() for expr in schema],
-                    skip_rows_after_names=1 if scan._source_info.has_headers else 0,
-                ),
-            )
-            vpart = vPartition.from_arrow_table(table, column_ids=column_ids, partition_id=partition_id)
-            return vpart
-        elif scan._source_info.scan_type() == ScanType.JSON:
-            assert isinstance(scan._source_info, JSONSourceInfo)
-            path = scan._source_info.filepaths[partition_id]
-            fs = get_filesystem_from_path(path)
-            table = json.read_json(fs.open(path, compression="infer")).select([col.name() for col in schema])
-            vpart = vPartition.from_arrow_table(table, column_ids=column_ids, partition_id=partition_id)
-            return vpart
-        elif scan._source_info.scan_type() == ScanType.PARQUET:
-            assert isinstance(scan._source_info, ParquetSourceInfo)
-            table = parquet.read_table(scan._source_info.filepaths[partition_id])
-            vpart = vPartition.from_arrow_table(table, column_ids=column_ids, partition_id=partition_id)
-            return vpart
+            source_info = scan._source_info
+            assert isinstance(source_info, InMemorySourceInfo)
+            start, end = source_info.get_partition_bounds(partition_id)
+            # Slices of the Arrow table share its buffers, so no data is copied
+            table = source_info.table.slice(start, end - start)
+            data = {
+                name: source_info.py_columns[name][start:end] if name in source_info.py_columns else table[name]
+                for name in read_column_names
+            }
+            vparts = [vPartition.from_pydict(data, schema=read_schema, partition_id=partition_id)]
         else:
-            raise NotImplementedError(f"PyRunner has not implemented scan: {scan._source_info.scan_type()}")
+            vparts = (
+                vPartition.from_arrow_table(table, column_ids=column_ids, partition_id=partition_id)
+                for table in self._iter_scan_tables(scan, partition_id, read_schema, batch_size)
+            )
+
+        is_empty = True
+        num_remaining = scan._limit
+        for vpart in vparts:
+            if len(scan._predicate) > 0:
+                vpart = vpart.filter(scan._predicate)
+            if len(read_column_names) > len(schema):
+                vpart = vpart.eval_expression_list(schema)
+            if num_remaining is not None:
+                vpart = vpart.head(num_remaining)
+                num_remaining -= len(vpart)
+            is_empty = False
+            yield vpart
+            # No more batches are read once the limit of the Scan is reached
+            if num_remaining == 0:
+                break
+        if is_empty:
+            empty = vPartition.from_arrow_table(
+                scan_operators.empty_table(read_schema), column_ids=column_ids, partition_id=partition_id
+            )
+            yield empty.eval_expression_list(schema) if len(read_column_names) > len(schema) else empty
+
+    def _iter_scan_tables(
+        self, scan: Scan, partition_id: int, read_schema: ExpressionList, batch_size: int
+    ) -> Iterator[pa.Table]:
+        source_info = scan._source_info
+        if not isinstance(source_info, (CSVSourceInfo, JSONSourceInfo, ParquetSourceInfo, IPCSourceInfo)):
+            raise NotImplementedError(f"PyRunner has not implemented scan: {source_info.scan_type()}")
+        # Hive partition columns are not in the files, and are added to each table from the path of its file
+        hive_columns = set(source_info.hive_partition_columns)
+        hive_schema = read_schema.keep([name for name in read_schema.names if name in hive_columns])
+        file_column_names = [name for name in scan._schema.names if name not in hive_columns]
+        file_read_column_names = [name for name in read_schema.names if name not in hive_columns]
+        if len(file_read_column_names) == 0:
+            # Some column has to be read from the files to know their number of rows
+            file_read_column_names = file_column_names[:1]
+        file_read_schema = scan._schema.keep(file_read_column_names)
+
+        for split in source_info.get_splits(partition_id):
+            tables: Iterator[pa.Table]
+            if isinstance(source_info, CSVSourceInfo):
+                tables = scan_operators.iter_csv(
+                    split,
+                    read_schema=file_read_schema,
+                    column_names=file_column_names,
+                    delimiter=source_info.delimiter,
+                    has_headers=source_info.has_headers,
+                    batch_size=batch_size,
+                )
+            elif isinstance(source_info, JSONSourceInfo):
+                tables = scan_operators.iter_json(split, read_schema=file_read_schema, batch_size=batch_size)
+            elif isinstance(source_info, IPCSourceInfo):
+                tables = scan_operators.iter_ipc(split, columns=file_read_column_names, schema=scan._schema)
+            else:
+                tables = scan_operators.iter_parquet(
+                    split,
+                    columns=file_read_column_names,
+                    predicate=scan._predicate,
+                    schema=scan._schema,
+                    batch_size=batch_size,
+                )
+            for table in tables:
+                if len(hive_schema) > 0:
+                    table = scan_operators.add_hive_partition_columns(table, split, hive_schema)
+                yield table.select(read_schema.names)
 
     def _handle_projection(self, inputs: Dict[int, vPartition], proj: Projection, partition_id: int) -> vPartition:
         child_id = proj._children()[0].id()
@@ -145,17 +320,39 @@ class LogicalPartitionOpRunner:
         prev_partition = inputs[child_id]
         return prev_partition.agg(agg._agg, group_by=agg._group_by)
 
+    def _handle_file_write(self, inputs: Dict[int, vPartition], write: FileWrite, partition_id: int) -> vPartition:
+        child = write._children()[0]
+        prev_partition = inputs[child.id()]
+        written_files = write_operators.write_table(
+            prev_partition.to_arrow(schema=child.schema()),
+            root_dir=write._root_dir,
+            storage_type=write._storage_type,
+            partition_cols=write._partition_cols,
+            target_file_size=write._target_file_size,
+            partition_id=partition_id,
+        )
+        data = {
+            "path": pa.array([file.path for file in written_files], type=pa.string()),
+            "num_rows": pa.array([file.num_rows for file in written_files], type=pa.int64()),
+            "size_bytes": pa.array([file.size_bytes for file in written_files], type=pa.int64()),
+            "column_stats": [file.column_stats for file in written_files],
+        }
+        return vPartition.from_pydict(data, schema=write.schema(), partition_id=partition_id)
+
     def _handle_join(self, inputs: Dict[int, vPartition], join: Join, partition_id: int) -> vPartition:
         left_id = join._children()[0].id()
         right_id = join._children()[1].id()
-        left_partition = inputs[left_id]
-        right_partition = inputs[right_id]
+        # A broadcast side, or the overlapping partitions of a sort merge Join, are read by many partitions of the
+        # Join, so they take on their IDs
+        left_partition = inputs[left_id].with_partition_id(partition_id)
+        right_partition = inputs[right_id].with_partition_id(partition_id)
         return left_partition.join(
             right_partition,
             left_on=join._left_on,
             right_on=join._right_on,
             output_schema=join.schema(),
             how=join._how.value,
+            sorted_desc=join.sorted_desc(),
         )
 
 
@@ -214,6 +214,66 @@ _CountLogicalTM = frozenset(
     }.items()
 )
 
+_UnaryComparableTM = frozenset(
+    {
+        (_TYPE_REGISTRY["integer"],): _TYPE_REGISTRY["integer"],
+        (_TYPE_REGISTRY["float"],): _TYPE_REGISTRY["float"],
+        (_TYPE_REGISTRY["logical"],): _TYPE_REGISTRY["logical"],
+        (_TYPE_REGISTRY["string"],): _TYPE_REGISTRY["string"],
+        (_TYPE_REGISTRY["date"],): _TYPE_REGISTRY["date"],
+        (_TYPE_REGISTRY["bytes"],): _TYPE_REGISTRY["bytes"],
+    }.items()
+)
+
+# Partial states of distinct values are lists, which are typed as Python objects
+_DistinctTM = frozenset({(arg_types, _TYPE_REGISTRY["pyobj"]) for arg_types, _ in _UnaryComparableTM})
+
+_CountDistinctTM = frozenset(
+    {
+        **dict(_CountLogicalTM),
+        (_TYPE_REGISTRY["pyobj"],): _TYPE_REGISTRY["integer"],
+    }.items()
+)
+
+_UnaryFloatTM = frozenset(
+    {
+        (_TYPE_REGISTRY["integer"],): _TYPE_REGISTRY["float"],
+        (_TYPE_REGISTRY["float"],): _TYPE_REGISTRY["float"],
+    }.items()
+)
+
+# Partial states of approximate reductions are sketches, which are serialized as bytes
+_HllSketchTM = frozenset({(arg_types, _TYPE_REGISTRY["bytes"]) for arg_types, _ in _UnaryComparableTM})
+
+_TDigestSketchTM = frozenset({(arg_types, _TYPE_REGISTRY["bytes"]) for arg_types, _ in _UnaryFloatTM})
+
+# Moments of values are a count, a mean and a sum of squared deviations from the mean, serialized as bytes
+_MomentsTM = frozenset({(arg_types, _TYPE_REGISTRY["bytes"]) for arg_types, _ in _UnaryFloatTM})
+
+_MomentsVarianceTM = frozenset(
+    {
+        (_TYPE_REGISTRY["bytes"],): _TYPE_REGISTRY["float"],
+    }.items()
+)
+
+_StateMergeTM = frozenset(
+    {
+        (_TYPE_REGISTRY["bytes"],): _TYPE_REGISTRY["bytes"],
+    }.items()
+)
+
+_HllCardinalityTM = frozenset(
+    {
+        (_TYPE_REGISTRY["bytes"],): _TYPE_REGISTRY["integer"],
+    }.items()
+)
+
+_TDigestQuantileTM = frozenset(
+    {
+        (_TYPE_REGISTRY["bytes"], _TYPE_REGISTRY["float"]): _TYPE_REGISTRY["float"],
+    }.items()
+)
+
 _AllLogicalTM = frozenset(
     {
         (_TYPE_REGISTRY["integer"],): _TYPE_REGISTRY["logical"],
@@ -288,10 +348,25 @@ class OperatorEnum(Enum):
     # Reductions
     SUM = _NUop(name="sum", symbol="sum")
     MEAN = _NUop(name="mean", symbol="mean")
-    MIN = _NUop(name="min", symbol="min")
-    MAX = _NUop(name="max", symbol="max")
+    MIN = _UOp(name="min", symbol="min", type_matrix=_UnaryComparableTM)
+    MAX = _UOp(name="max", symbol="max", type_matrix=_UnaryComparableTM)
+    FIRST = _UOp(name="first", symbol="first", type_matrix=_UnaryComparableTM)
 
     COUNT = _UOp(name="count", symbol="count", type_matrix=_CountLogicalTM)
+    COUNT_DISTINCT = _UOp(name="count_distinct", symbol="count_distinct", type_matrix=_CountDistinctTM)
+
+    # Partial states of reductions
+    DISTINCT = _UOp(name="distinct", symbol="distinct", type_matrix=_DistinctTM)
+    MOMENTS = _UOp(name="moments", symbol="moments", type_matrix=_MomentsTM)
+    MOMENTS_MERGE = _UOp(name="moments_merge", symbol="moments_merge", type_matrix=_StateMergeTM)
+    HLL_SKETCH = _UOp(name="hll_sketch", symbol="hll_sketch", type_matrix=_HllSketchTM)
+    HLL_MERGE = _UOp(name="hll_merge", symbol="hll_merge", type_matrix=_StateMergeTM)
+    TDIGEST_SKETCH = _UOp(name="tdigest_sketch", symbol="tdigest_sketch", type_matrix=_TDigestSketchTM)
+    TDIGEST_MERGE = _UOp(name="tdigest_merge", symbol="tdigest_merge", type_matrix=_StateMergeTM)
+
+    # Results of reductions from their partial states
+    MOMENTS_VARIANCE = _UOp(name="moments_variance", symbol="moments_variance", type_matrix=_MomentsVarianceTM)
+    HLL_CARDINALITY = _UOp(name="hll_cardinality", symbol="hll_cardinality", type_matrix=_HllCardinalityTM)
 
     # Logical
     INVERT = _UOp(name="invert", symbol="~", type_matrix=_UnaryLogicalTM)
@@ -333,6 +408,9 @@ class OperatorEnum(Enum):
     GT = _CBop(name="greater_than", symbol=">")
     GE = _CBop(name="greater_than_equal", symbol=">=")
 
+    # Sketches
+    TDIGEST_QUANTILE = _BOp(name="tdigest_quantile", symbol="tdigest_quantile", type_matrix=_TDigestQuantileTM)
+
     # TernaryOps
 
     IF_ELSE = ExpressionOperator(nargs=3, name="if_else", type_matrix=_IfElseTM)
@@ -355,7 +433,18 @@ class OperatorEvaluator(Protocol[ValueType]):
     MEAN: UnaryFunction
     MIN: UnaryFunction
     MAX: UnaryFunction
+    FIRST: UnaryFunction
     COUNT: UnaryFunction
+    COUNT_DISTINCT: UnaryFunction
+    DISTINCT: UnaryFunction
+    MOMENTS: UnaryFunction
+    MOMENTS_MERGE: UnaryFunction
+    MOMENTS_VARIANCE: UnaryFunction
+    HLL_SKETCH: UnaryFunction
+    HLL_MERGE: UnaryFunction
+    HLL_CARDINALITY: UnaryFunction
+    TDIGEST_SKETCH: UnaryFunction
+    TDIGEST_MERGE: UnaryFunction
     INVERT: UnaryFunction
 
     ADD: BinaryFunction
@@ -373,6 +462,7 @@ class OperatorEvaluator(Protocol[ValueType]):
     NEQ: BinaryFunction
     GT: BinaryFunction
     GE: BinaryFunction
+    TDIGEST_QUANTILE: BinaryFunction
 
     STR_CONTAINS: BinaryFunction
     STR_ENDSWITH: BinaryFunction
@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import pyarrow as pa
+from pyarrow import csv, json, parquet
+
+from daft.datasources import (
+    CSVSourceInfo,
+    FileSplit,
+    InMemorySourceInfo,
+    IPCSourceInfo,
+    JSONSourceInfo,
+    ParquetSourceInfo,
+    SourceInfo,
+    get_hive_partition_table,
+)
+from daft.execution.operators import (
+    EXPRESSION_TYPE_TO_PYARROW_TYPE,
+    ExpressionType,
+    OperatorEnum,
+)
+from daft.expressions import (
+    CallExpression,
+    ColumnExpression,
+    Expression,
+    ExpressionExecutor,
+    LiteralExpression,
+)
+from daft.filesystem import (
+    get_parquet_metadata,
+    get_protocol_from_path,
+    open_file,
+    strip_protocol,
+)
+from daft.logical.schema import ExpressionList
+from daft.runners.blocks import DataBlock
+
+# Upper bound on the number of rows in a batch read from a Parquet file
+_MAX_BATCH_NUM_ROWS = 1024 * 1024
+
+# Operators that can be checked against column statistics, and their mirror when the literal is on the left
+_COMPARISON_OPERATORS: Dict[OperatorEnum, OperatorEnum] = {
+    OperatorEnum.LT: OperatorEnum.GT,
+    OperatorEnum.LE: OperatorEnum.GE,
+    OperatorEnum.EQ: OperatorEnum.EQ,
+    OperatorEnum.GT: OperatorEnum.LT,
+    OperatorEnum.GE: OperatorEnum.LE,
+}
+
+# Given the min and max of a column and a literal, whether any value in [min, max] can satisfy the comparison
+_RANGE_MAY_MATCH: Dict[OperatorEnum, Callable[[Any, Any, Any], Any]] = {
+    OperatorEnum.LT: lambda min_value, max_value, value: min_value < value,
+    OperatorEnum.LE: lambda min_value, max_value, value: min_value <= value,
+    OperatorEnum.EQ: lambda min_value, max_value, value: min_value <= value <= max_value,
+    OperatorEnum.GT: lambda min_value, max_value, value: max_value > value,
+    OperatorEnum.GE: lambda min_value, max_value, value: max_value >= value,
+}
+
+
+class ColumnComparison(NamedTuple):
+    """A `column <op> literal` comparison that can be evaluated against column statistics"""
+
+    column_name: str
+    op: OperatorEnum
+    value: Any
+
+
+def _split_conjunction(expr: Expression) -> List[Expression]:
+    if isinstance(expr, CallExpression) and expr._operator == OperatorEnum.AND:
+        return [split for arg in expr._args for split in _split_conjunction(arg)]
+    return [expr]
+
+
+def _to_column_comparison(expr: Expression, schema: ExpressionList) -> Optional[ColumnComparison]:
+    if not isinstance(expr, CallExpression) or expr._operator not in _COMPARISON_OPERATORS:
+        return None
+    left, right = expr._args
+    op = expr._operator
+    if isinstance(left, LiteralExpression) and isinstance(right, ColumnExpression):
+        left, right = right, left
+        op = _COMPARISON_OPERATORS[op]
+    if not isinstance(left, ColumnExpression) or not isinstance(right, LiteralExpression) or right._value is None:
+        return None
+    # Names in the predicate may be aliases of the scanned columns, so columns are matched by id
+    column_id = left.get_id()
+    if column_id is None:
+        return None
+    scan_column = schema.get_expression_by_id(column_id)
+    if scan_column is None:
+        return None
+    return ColumnComparison(column_name=scan_column.name(), op=op, value=right._value)
+
+
+def extract_column_comparisons(predicate: ExpressionList, schema: ExpressionList) -> List[ColumnComparison]:
+    """Extracts the `column <op> literal` comparisons that are AND-ed together in a predicate. Other parts of the
+    predicate are ignored, which means that the comparisons are necessary but not sufficient conditions for a row
+    to pass the predicate.
+
+    Args:
+        predicate (ExpressionList): predicate expressions which are AND-ed together
+        schema (ExpressionList): schema of the Scan that the predicate was pushed into
+
+    Returns:
+        List[ColumnComparison]: comparisons that every row passing the predicate has to satisfy
+    """
+    comparisons = []
+    for expr in predicate:
+        for split in _split_conjunction(expr):
+            comparison = _to_column_comparison(split, schema)
+            if comparison is not None:
+                comparisons.append(comparison)
+    return comparisons
+
+
+def _row_group_may_match(
+    row_group: parquet.RowGroupMetaData, column_indices: Dict[str, int], comparisons: List[ColumnComparison]
+) -> bool:
+    for comparison in comparisons:
+        if comparison.column_name not in column_indices:
+            continue
+        stats = row_group.column(column_indices[comparison.column_name]).statistics
+        if stats is None:
+            continue
+        # Comparisons are never true for nulls, so row groups that only contain nulls can be skipped
+        if stats.has_null_count and stats.null_count == row_group.num_rows:
+            return False
+        if not stats.has_min_max:
+            continue
+        try:
+            if not _RANGE_MAY_MATCH[comparison.op](stats.min, stats.max, comparison.value):
+                return False
+        except TypeError:
+            # Statistics that cannot be compared with the literal are not used for pruning
+            continue
+    return True
+
+
+def prune_row_groups(
+    metadata: parquet.FileMetaData, comparisons: List[ColumnComparison], row_groups: Optional[Sequence[int]] = None
+) -> List[int]:
+    """Returns the indices of the row groups in a Parquet file that may contain rows satisfying all comparisons,
+    using the min/max/null-count statistics in the file footer. Only `row_groups` are considered if provided.
+    """
+    if row_groups is None:
+        row_groups = range(metadata.num_row_groups)
+    if metadata.num_row_groups == 0:
+        return []
+    first_row_group = metadata.row_group(0)
+    column_indices = {first_row_group.column(i).path_in_schema: i for i in range(first_row_group.num_columns)}
+    return [i for i in row_groups if _row_group_may_match(metadata.row_group(i), column_indices, comparisons)]
+
+
+def _to_arrow_schema(schema: ExpressionList) -> pa.Schema:
+    return pa.schema([(col.name(), EXPRESSION_TYPE_TO_PYARROW_TYPE[col.resolved_type()]) for col in schema])
+
+
+def prune_hive_partitions(source_info: SourceInfo, predicate: ExpressionList, schema: ExpressionList) -> SourceInfo:
+    """Drops the files of a Scan whose Hive partition values cannot satisfy the predicate, by evaluating the parts
+    of the predicate that only refer to partition columns against the values parsed from the path of each file.
+    No files are opened, and partitions of the Scan that are left without any files are kept as empty partitions,
+    since operators above the Scan were planned with its number of partitions.
+
+    Args:
+        source_info (SourceInfo): source of the Scan
+        predicate (ExpressionList): predicate of the Scan
+        schema (ExpressionList): schema of the Scan
+
+    Returns:
+        SourceInfo: source with only the files that may contain rows satisfying the predicate
+    """
+    if not isinstance(source_info, (CSVSourceInfo, JSONSourceInfo, ParquetSourceInfo, IPCSourceInfo)):
+        return source_info
+    hive_schema = schema.keep(list(source_info.hive_partition_columns))
+    hive_ids = hive_schema.to_id_set()
+    conjuncts = [
+        split
+        for expr in predicate
+        for split in _split_conjunction(expr)
+        if len(split.required_columns()) > 0 and {col.get_id() for col in split.required_columns()} <= hive_ids
+    ]
+    if len(conjuncts) == 0:
+        return source_info
+
+    partitions = [source_info.get_splits(i) for i in range(source_info.get_num_partitions())]
+    paths = sorted({split.path for partition in partitions for split in partition})
+    values = get_hive_partition_table(paths, _to_arrow_schema(hive_schema))
+    blocks_by_id = {col.get_id(): DataBlock.make_block(values[col.name()]) for col in hive_schema}
+    may_match = [True] * len(paths)
+    for conjunct in conjuncts:
+        # Names in the predicate may be aliases of the scanned columns, so columns are matched by id
+        operands = {}
+        for col in conjunct.required_columns():
+            name = col.name()
+            assert name is not None
+            operands[name] = blocks_by_id[col.get_id()]
+        # Nulls are treated as false, as they are when the predicate is applied to the rows that are read
+        results = ExpressionExecutor().eval(conjunct, operands).iter_py()
+        may_match = [match and bool(result) for match, result in zip(may_match, results)]
+    kept_paths = {path for path, match in zip(paths, may_match) if match}
+
+    return dataclasses.replace(
+        source_info,
+        filepaths=[path for path in source_info.filepaths if path in kept_paths],
+        partitions=[[split for split in partition if split.path in kept_paths] for partition in partitions],
+    )
+
+
+def count_rows_from_metadata(
+    source_info: SourceInfo, predicate: ExpressionList, schema: ExpressionList
+) -> Optional[int]:
+    """Counts the rows of a Scan without reading its data, from the footers of Parquet files or the length of an
+    in-memory table. This is only possible if every part of the predicate refers only to Hive partition columns, so
+    that it holds for all the rows of the files whose partition values satisfy it.
+
+    Args:
+        source_info (SourceInfo): source of the Scan
+        predicate (ExpressionList): predicate of the Scan
+        schema (ExpressionList): schema of the Scan
+
+    Returns:
+        Optional[int]: number of rows of the Scan that satisfy the predicate, or None if it cannot be counted
+    """
+    if isinstance(source_info, InMemorySourceInfo):
+        return source_info.num_rows() if len(predicate) == 0 else None
+    elif not isinstance(source_info, ParquetSourceInfo):
+        return None
+    hive_ids = schema.keep(list(source_info.hive_partition_columns)).to_id_set()
+    for expr in predicate:
+        for conjunct in _split_conjunction(expr):
+            if not {col.get_id() for col in conjunct.required_columns()} <= hive_ids:
+                return None
+    pruned = prune_hive_partitions(source_info, predicate, schema)
+    assert isinstance(pruned, ParquetSourceInfo)
+    num_rows = 0
+    for partition_id in range(pruned.get_num_partitions()):
+        for split in pruned.get_splits(partition_id):
+            metadata = get_parquet_metadata(split.path)
+            if split.row_groups is None:
+                num_rows += metadata.num_rows
+            else:
+                num_rows += sum(metadata.row_group(i).num_rows for i in split.row_groups)
+    return num_rows
+
+
+def add_hive_partition_columns(table: pa.Table, split: FileSplit, hive_schema: ExpressionList) -> pa.Table:
+    """Appends the values of the Hive partitions in the path of a split as columns of a table read from it"""
+    values = get_hive_partition_table([split.path], _to_arrow_schema(hive_schema))
+    for i, field in enumerate(values.schema):
+        table = table.append_column(field, pa.repeat(values[i][0], table.num_rows).cast(field.type))
+    return table
+
+
+def _get_batch_num_rows(metadata: parquet.FileMetaData, batch_size: int) -> int:
+    total_byte_size: int = sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+    if metadata.num_rows == 0 or total_byte_size == 0:
+        return _MAX_BATCH_NUM_ROWS
+    num_rows: int = metadata.num_rows
+    return min(max(batch_size * num_rows // total_byte_size, 1), _MAX_BATCH_NUM_ROWS)
+
+
+def iter_parquet(
+    split: FileSplit, columns: List[str], predicate: ExpressionList, schema: ExpressionList, batch_size: int
+) -> Iterator[pa.Table]:
+    """Reads columns from a split of a Parquet file in batches of roughly `batch_size` uncompressed bytes, skipping
+    the row groups that cannot satisfy the predicate according to their statistics. The predicate still has to be
+    applied to the returned batches.
+
+    Args:
+        split (FileSplit): split of the Parquet file to read
+        columns (List[str]): names of columns to read
+        predicate (ExpressionList): predicate of the Scan
+        schema (ExpressionList): schema of the Scan
+        batch_size (int): target number of uncompressed bytes per batch
+
+    Returns:
+        Iterator[pa.Table]: batches with the requested columns in the order they were requested
+    """
+    comparisons = extract_column_comparisons(predicate, schema)
+    metadata = get_parquet_metadata(split.path)
+    row_groups = prune_row_groups(metadata, comparisons, row_groups=split.row_groups)
+    if len(row_groups) == 0:
+        yield _cast_to_schema(metadata.schema.to_arrow_schema().empty_table().select(columns), schema)
+        return
+    with open_file(split.path) as f:
+        # The cached footer is passed in, so that it is not read and parsed again
+        parquet_file = parquet.ParquetFile(f, metadata=metadata)
+        for batch in parquet_file.iter_batches(
+            batch_size=_get_batch_num_rows(metadata, batch_size), row_groups=row_groups, columns=columns
+        ):
+            yield _cast_to_schema(pa.Table.from_batches([batch]).select(columns), schema)
+
+
+def _cast_to_schema(table: pa.Table, schema: ExpressionList) -> pa.Table:
+    """Casts columns that were read with a different type than the one in the schema, which happens when the
+    schema was unified from files with different numeric types
+    """
+    for i, field in enumerate(table.schema):
+        column = schema.get_expression_by_name(field.name)
+        assert column is not None
+        expected_type = column.resolved_type()
+        if (
+            expected_type != ExpressionType.from_arrow_type(field.type)
+            and expected_type in EXPRESSION_TYPE_TO_PYARROW_TYPE
+        ):
+            table = table.set_column(i, field.name, table[i].cast(EXPRESSION_TYPE_TO_PYARROW_TYPE[expected_type]))
+    return table
+
+
+def iter_text_split(split: FileSplit, block_size: int) -> Iterator[bytes]:
+    """Reads a split of a line-delimited text file in blocks of whole lines of roughly `block_size` bytes.
+    A split that covers a byte range contains every line that starts in that range, so a line that crosses the end
+    of the range is read to its end, and a line that crosses the start of the range is left to the previous split.
+
+    Args:
+        split (FileSplit): split of the text file to read
+        block_size (int): number of bytes to read at a time
+
+    Returns:
+        Iterator[bytes]: blocks of lines, where each block ends at the end of a line
+    """
+    with open_file(split.path, compression="infer" if split.end is None else None) as f:
+        if split.start > 0:
+            f.seek(split.start - 1)
+            f.readline()
+        remainder = b""
+        while True:
+            read_size = block_size if split.end is None else min(block_size, split.end - f.tell())
+            block = f.read(read_size) if read_size > 0 else b""
+            if not block:
+                break
+            block = remainder + block
+            end_of_lines = block.rfind(b"\n") + 1
+            if end_of_lines > 0:
+                yield block[:end_of_lines]
+            remainder = block[end_of_lines:]
+        if remainder and split.end is not None:
+            remainder += f.readline()
+        if remainder:
+            yield remainder
+
+
+def empty_table(schema: ExpressionList) -> pa.Table:
+    """Creates a table without any rows for the columns in the schema"""
+    return pa.table(
+        {
+            col.name(): pa.array([], type=EXPRESSION_TYPE_TO_PYARROW_TYPE.get(col.resolved_type(), pa.null()))
+            for col in schema
+        }
+    )
+
+
+def iter_csv(
+    split: FileSplit,
+    read_schema: ExpressionList,
+    column_names: List[str],
+    delimiter: str,
+    has_headers: bool,
+    batch_size: int,
+) -> Iterator[pa.Table]:
+    """Reads columns from a split of a CSV file in batches of roughly `batch_size` bytes
+
+    Args:
+        split (FileSplit): split of the CSV file to read
+        read_schema (ExpressionList): columns to read
+        column_names (List[str]): names of all columns in the file, even those that are not read
+        delimiter (str): delimiter of the CSV file
+        has_headers (bool): whether the first line of the CSV file is a header
+        batch_size (int): number of bytes to parse at a time
+
+    Returns:
+        Iterator[pa.Table]: batches with the columns in `read_schema`
+    """
+    column_types = {col.name(): EXPRESSION_TYPE_TO_PYARROW_TYPE.get(col.resolved_type()) for col in read_schema}
+    convert_options = csv.ConvertOptions(
+        include_columns=read_schema.names,
+        # Parse columns with the types of the schema, since the batches of a file are parsed separately
+        column_types={name: t for name, t in column_types.items() if t is not None},
+    )
+    # Only the first batch of the first split of a file contains the header
+    skip_header = has_headers and split.start == 0
+    for block in iter_text_split(split, batch_size):
+        # Blank lines are skipped by the parser, but a block of only blank lines cannot be parsed
+        if not block.strip():
+            continue
+        yield csv.read_csv(
+            pa.BufferReader(block),
+            parse_options=csv.ParseOptions(
+                delimiter=delimiter,
+            ),
+            read_options=csv.ReadOptions(
+                column_names=column_names,
+                skip_rows_after_names=1 if skip_header else 0,
+            ),
+            convert_options=convert_options,
+        )
+        skip_header = False
+
+
+def iter_json(split: FileSplit, read_schema: ExpressionList, batch_size: int) -> Iterator[pa.Table]:
+    """Reads columns from a split of a line-delimited JSON file in batches of roughly `batch_size` bytes
+
+    Args:
+        split (FileSplit): split of the JSON file to read
+        read_schema (ExpressionList): columns to read
+        batch_size (int): number of bytes to parse at a time
+
+    Returns:
+        Iterator[pa.Table]: batches with the columns in `read_schema`
+    """
+    arrow_types = [EXPRESSION_TYPE_TO_PYARROW_TYPE.get(col.resolved_type()) for col in read_schema]
+    parse_options = None
+    if all(arrow_type is not None for arrow_type in arrow_types):
+        # Only parse the fields that are read, skipping all other fields in each JSON object
+        parse_options = json.ParseOptions(
+            explicit_schema=pa.schema(list(zip(read_schema.names, arrow_types))),
+            unexpected_field_behavior="ignore",
+        )
+    for block in iter_text_split(split, batch_size):
+        if not block.strip():
+            continue
+        yield json.read_json(pa.BufferReader(block), parse_options=parse_options).select(read_schema.names)
+
+
+def open_ipc_file(path: str) -> pa.ipc.RecordBatchFileReader:
+    """Opens an Arrow IPC file for reading. Local files are memory-mapped, so that the batches read from them
+    reference the pages of the file instead of copies of its data, and only the pages that are accessed are read.
+    """
+    if get_protocol_from_path(path) == "file":
+        # The reader reads batches from the mapping lazily, and unmaps the file when it is garbage collected
+        return pa.ipc.open_file(pa.memory_map(strip_protocol(path), "r"))
+    with open_file(path) as f:
+        return pa.ipc.open_file(pa.BufferReader(f.read()))
+
+
+def iter_ipc(split: FileSplit, columns: List[str], schema: ExpressionList) -> Iterator[pa.Table]:
+    """Reads columns from an Arrow IPC file one record batch at a time, without copying them
+
+    Args:
+        split (FileSplit): split of the IPC file to read
+        columns (List[str]): names of columns to read
+        schema (ExpressionList): schema of the Scan
+
+    Returns:
+        Iterator[pa.Table]: batches with the requested columns in the order they were requested
+    """
+    reader = open_ipc_file(split.path)
+    if reader.num_record_batches == 0:
+        yield _cast_to_schema(reader.schema.empty_table().select(columns), schema)
+        return
+    for i in range(reader.num_record_batches):
+        yield _cast_to_schema(pa.Table.from_batches([reader.get_batch(i)]).select(columns), schema)
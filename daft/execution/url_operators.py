@@ -1,14 +1,133 @@
 import pathlib
-from typing import Dict, List
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 import pyarrow as pa
+from fsspec import AbstractFileSystem
 from loguru import logger
 
 from daft import filesystem
+from daft.config import DaftSettings
 from daft.runners.blocks import ArrowDataBlock, DataBlock
 
+_DOWNLOAD_CACHE: Optional[filesystem.DiskLRUCache] = None
+_DOWNLOAD_CACHE_LOCK = threading.Lock()
+
+# Errors that are not transient, so that retrying the download would fail again
+_NON_RETRYABLE_ERRORS = (FileNotFoundError, IsADirectoryError, PermissionError, ValueError)
+
+
+class _ByteBudget:
+    """Limits the number of bytes that are downloaded at once. Each download reserves the size of its URL if it is
+    already known, and otherwise the mean size of the downloads that have completed so far but at least `min_bytes`,
+    so that the first downloads are limited before any sizes are known. The estimate is corrected by the size of each
+    download once it completes. One download is always allowed to proceed so that a URL that is larger than the
+    budget is still downloaded.
+    """
+
+    def __init__(self, max_bytes: int, min_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._min_bytes = min_bytes
+        self._reserved = 0
+        self._num_downloads = 0
+        self._num_downloaded = 0
+        self._num_bytes_downloaded = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size: Optional[int]) -> int:
+        with self._cond:
+            if size is not None:
+                num_bytes = size
+            elif self._num_downloaded > 0:
+                num_bytes = max(self._num_bytes_downloaded // self._num_downloaded, self._min_bytes)
+            else:
+                num_bytes = self._min_bytes
+            while self._num_downloads > 0 and self._reserved + num_bytes > self._max_bytes:
+                self._cond.wait()
+            self._reserved += num_bytes
+            self._num_downloads += 1
+            return num_bytes
+
+    def release(self, reserved: int, downloaded: Optional[int]) -> None:
+        with self._cond:
+            self._reserved -= reserved
+            self._num_downloads -= 1
+            if downloaded is not None:
+                self._num_downloaded += 1
+                self._num_bytes_downloaded += downloaded
+            self._cond.notify_all()
+
+
+def _download_with_retries(
+    fs: AbstractFileSystem, path: str, size: Optional[int], budget: _ByteBudget
+) -> Optional[bytes]:
+    for attempt in range(DaftSettings.DAFT_DOWNLOAD_NUM_RETRIES + 1):
+        reserved = budget.acquire(size)
+        data: Optional[bytes] = None
+        try:
+            data = fs.cat_file(path)
+            return data
+        except Exception as e:
+            if isinstance(e, _NON_RETRYABLE_ERRORS) or attempt == DaftSettings.DAFT_DOWNLOAD_NUM_RETRIES:
+                logger.error(f"Encountered error during download from URL {path}: {str(e)}")
+                return None
+            logger.warning(f"Retrying download from URL {path} after error: {str(e)}")
+        finally:
+            budget.release(reserved, len(data) if data is not None else None)
+        # Exponential backoff with full jitter, so that retries of URLs that failed together are spread out
+        time.sleep(random.uniform(0, DaftSettings.DAFT_DOWNLOAD_RETRY_BACKOFF_SECONDS * 2**attempt))
+    return None
+
+
+def get_download_cache() -> Optional[filesystem.DiskLRUCache]:
+    """Returns the process-wide cache of downloaded URLs as configured by DAFT_DOWNLOAD_CACHE_DIR and
+    DAFT_DOWNLOAD_CACHE_SIZE_BYTES, or None if the cache is disabled. Its `cache_info()` reports the number of
+    downloads that were served from the cache and from the network in this process.
+    """
+    global _DOWNLOAD_CACHE
+    if DaftSettings.DAFT_DOWNLOAD_CACHE_DIR is None:
+        return None
+    config = (DaftSettings.DAFT_DOWNLOAD_CACHE_DIR, DaftSettings.DAFT_DOWNLOAD_CACHE_SIZE_BYTES)
+    with _DOWNLOAD_CACHE_LOCK:
+        if _DOWNLOAD_CACHE is None or (_DOWNLOAD_CACHE.cache_dir, _DOWNLOAD_CACHE.max_bytes) != config:
+            _DOWNLOAD_CACHE = filesystem.DiskLRUCache(*config)
+        return _DOWNLOAD_CACHE
+
+
+def _download(path: str, budget: _ByteBudget, cache: Optional[filesystem.DiskLRUCache]) -> Optional[bytes]:
+    fs = filesystem.get_filesystem_from_path(path)
+    if cache is None:
+        # URLs are not stat-ed only to size their downloads, which would double the requests to remote filesystems
+        return _download_with_retries(fs, path, None, budget)
+    if DaftSettings.DAFT_DOWNLOAD_CACHE_REVALIDATE:
+        try:
+            file_info = filesystem.get_file_info(path)
+        except Exception as e:
+            logger.error(f"Encountered error during download from URL {path}: {str(e)}")
+            return None
+        key = cache.make_key(path, file_info.version, file_info.size)
+        size = file_info.size
+    else:
+        key = cache.make_key(path)
+        size = None
+    data = cache.get(key)
+    if data is None:
+        data = _download_with_retries(fs, path, size, budget)
+        if data is not None:
+            cache.put(key, data)
+    return data
+
 
 def download(url_block: ArrowDataBlock) -> DataBlock:
+    """Downloads the bytes of each URL in a block of strings. URLs are downloaded concurrently, up to
+    DAFT_DOWNLOAD_MAX_CONNECTIONS at a time and roughly DAFT_DOWNLOAD_MAX_INFLIGHT_BYTES at a time, and failed
+    downloads are retried with exponential backoff. URLs that appear more than once in the block are downloaded once,
+    and downloads are cached on local disk if DAFT_DOWNLOAD_CACHE_DIR is set. URLs that are None or that could not be
+    downloaded have None as their bytes.
+    """
     assert isinstance(
         url_block, ArrowDataBlock
     ), f"Can only download from columns containing strings, found non-arrow block"
@@ -16,32 +135,31 @@ def download(url_block: ArrowDataBlock) -> DataBlock:
         url_block.data.type
     ), f"Can only download from columns containing strings, found {url_block.data.type}"
 
-    results = [None for _ in range(len(url_block))]
+    results: List[Optional[bytes]] = [None for _ in range(len(url_block))]
 
-    path_to_result_idx = {}
-    to_download: Dict[str, List[str]] = {}
+    # Indices of the rows of each distinct URL
+    path_to_result_indices: Dict[str, List[int]] = {}
     for i, path in enumerate(url_block.iter_py()):
         if path is None:
             continue
-        protocol = filesystem.get_protocol_from_path(path)
-
-        # fsspec returns data keyed by absolute paths, so we do a conversion here to match up later
-        if protocol == "file":
+        if filesystem.get_protocol_from_path(path) == "file":
             path = str(pathlib.Path(path).resolve())
+        path_to_result_indices.setdefault(path, []).append(i)
 
-        if protocol not in to_download:
-            to_download[protocol] = []
-        to_download[protocol].append(path)
-        path_to_result_idx[path] = i
-
-    for protocol in to_download:
-        fs = filesystem.get_filesystem(protocol)
-        data = fs.cat(to_download[protocol], on_error="return")
-        for path in data:
-            if isinstance(data[path], bytes):
-                results[path_to_result_idx[path]] = data[path]
-            else:
-                logger.error(f"Encountered error during download from URL {path}: {str(data[path])}")
-                results[path_to_result_idx[path]] = None
+    if len(path_to_result_indices) == 0:
+        return DataBlock.make_block(results)
+
+    paths = list(path_to_result_indices.keys())
+    num_workers = min(DaftSettings.DAFT_DOWNLOAD_MAX_CONNECTIONS, len(paths))
+    budget = _ByteBudget(
+        DaftSettings.DAFT_DOWNLOAD_MAX_INFLIGHT_BYTES,
+        max(DaftSettings.DAFT_DOWNLOAD_MAX_INFLIGHT_BYTES // DaftSettings.DAFT_DOWNLOAD_MAX_CONNECTIONS, 1),
+    )
+    cache = get_download_cache()
+    with ThreadPoolExecutor(max_workers=num_workers) as pool:
+        downloads = pool.map(lambda path: _download(path, budget, cache), paths)
+        for path, data in zip(paths, downloads):
+            for i in path_to_result_indices[path]:
+                results[i] = data
 
     return DataBlock.make_block(results)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import math
+import uuid
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv, parquet
+
+from daft.datasources import HIVE_DEFAULT_PARTITION, ScanType
+from daft.filesystem import get_filesystem_from_path
+
+_FILE_EXTENSIONS = {
+    ScanType.CSV: "csv",
+    ScanType.PARQUET: "parquet",
+    ScanType.IPC: "arrow",
+}
+
+
+class WrittenFile(NamedTuple):
+    """A file written by a FileWrite, and statistics about its contents"""
+
+    path: str
+    num_rows: int
+    size_bytes: int
+    # Min, max and null count of each column in the file, where min and max are None if they cannot be computed
+    column_stats: Dict[str, Dict[str, Any]]
+
+
+def _hive_partition_dir(partition_cols: List[str], values: Tuple[Any, ...]) -> str:
+    return "/".join(
+        f"{quote(name, safe='')}={HIVE_DEFAULT_PARTITION if value is None else quote(str(value), safe='')}"
+        for name, value in zip(partition_cols, values)
+    )
+
+
+def _dictionary_codes(column: pa.ChunkedArray) -> np.ndarray:
+    if pa.types.is_dictionary(column.type):
+        column = column.cast(column.type.value_type)
+    encoded = pc.dictionary_encode(column, null_encoding="encode")
+    codes: np.ndarray = np.concatenate([chunk.indices.to_numpy() for chunk in encoded.chunks]).astype(np.int64)
+    return codes
+
+
+def _group_by_partition_values(table: pa.Table, partition_cols: List[str]) -> List[Tuple[str, pa.Table]]:
+    """Splits a table into a table per distinct combination of values of the partition columns, which are dropped
+    from the tables, and returns each table with the relative directory that it is written to
+    """
+    if len(partition_cols) == 0:
+        return [("", table)]
+    # Rows are grouped by the dictionary codes of their partition values, where nulls have a code of their own
+    codes = np.stack([_dictionary_codes(table[name]) for name in partition_cols], axis=1)
+    _, first_rows, group_ids = np.unique(codes, axis=0, return_index=True, return_inverse=True)
+    # Groups are numbered in the order of their first rows, so that they are written in the order that they appear
+    order = np.argsort(first_rows)
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+    group_ids = ranks[group_ids.reshape(-1)]
+    first_rows = first_rows[order]
+
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(group_ids, minlength=len(order)))])
+    data_table = table.drop(partition_cols).take(pa.array(np.argsort(group_ids, kind="stable")))
+    group_values = zip(*[table[name].take(pa.array(first_rows)).to_pylist() for name in partition_cols])
+    return [
+        (_hive_partition_dir(partition_cols, values), data_table.slice(start, end - start))
+        for values, start, end in zip(group_values, offsets[:-1], offsets[1:])
+    ]
+
+
+def _compute_column_stats(table: pa.Table) -> Dict[str, Dict[str, Any]]:
+    stats = {}
+    for name in table.column_names:
+        column = table[name]
+        min_value: Optional[Any] = None
+        max_value: Optional[Any] = None
+        try:
+            min_max = pc.min_max(column)
+            min_value, max_value = min_max["min"].as_py(), min_max["max"].as_py()
+        except (pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            # Not every type can be ordered, such as nested types
+            pass
+        stats[name] = {"min": min_value, "max": max_value, "null_count": column.null_count}
+    return stats
+
+
+def _write_file(table: pa.Table, path: str, storage_type: ScanType) -> int:
+    fs = get_filesystem_from_path(path)
+    with fs.open(path, "wb") as f:
+        if storage_type == ScanType.PARQUET:
+            parquet.write_table(table, f)
+        elif storage_type == ScanType.CSV:
+            csv.write_csv(table, f)
+        elif storage_type == ScanType.IPC:
+            with pa.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            raise NotImplementedError(f"Writing {storage_type} files is not implemented")
+        size: int = f.tell()
+    return size
+
+
+def write_table(
+    table: pa.Table,
+    root_dir: str,
+    storage_type: ScanType,
+    partition_cols: List[str],
+    target_file_size: int,
+    partition_id: int,
+) -> List[WrittenFile]:
+    """Writes the rows of a partition to files under a root directory. Rows are written to Hive-style
+    `key=value` directories by the values of their partition columns, and the rows in each directory are split
+    into files of roughly `target_file_size` bytes, as measured by their size in memory.
+
+    Args:
+        table (pa.Table): rows of the partition
+        root_dir (str): directory to write the files under
+        storage_type (ScanType): format of the files
+        partition_cols (List[str]): columns to partition the files by, which are not written to the files
+        target_file_size (int): target number of bytes per file
+        partition_id (int): ID of the partition, which is part of the name of each file
+
+    Returns:
+        List[WrittenFile]: the files that were written, which is empty if the partition has no rows
+    """
+    if table.num_rows == 0:
+        return []
+    fs = get_filesystem_from_path(root_dir)
+    written_files = []
+    for partition_dir, data_table in _group_by_partition_values(table, partition_cols):
+        dir_path = f"{root_dir.rstrip('/')}/{partition_dir}" if partition_dir else root_dir.rstrip("/")
+        fs.makedirs(dir_path, exist_ok=True)
+        num_files = max(math.ceil(data_table.nbytes / target_file_size), 1)
+        boundaries = [data_table.num_rows * i // num_files for i in range(num_files + 1)]
+        for start, end in zip(boundaries[:-1], boundaries[1:]):
+            if start == end:
+                continue
+            file_table = data_table.slice(start, end - start)
+            path = f"{dir_path}/part-{partition_id:05}-{uuid.uuid4().hex}.{_FILE_EXTENSIONS[storage_type]}"
+            size_bytes = _write_file(file_table, path, storage_type)
+            written_files.append(
+                WrittenFile(
+                    path=path,
+                    num_rows=file_table.num_rows,
+                    size_bytes=size_bytes,
+                    column_stats=_compute_column_stats(file_table),
+                )
+            )
+    return written_files
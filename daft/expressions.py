@@ -244,6 +244,17 @@ class Expression(TreeNode["Expression"]):
     _mean = partialmethod(_unary_op, OperatorEnum.MEAN)
     _min = partialmethod(_unary_op, OperatorEnum.MIN)
     _max = partialmethod(_unary_op, OperatorEnum.MAX)
+    _first = partialmethod(_unary_op, OperatorEnum.FIRST)
+    _count_distinct = partialmethod(_unary_op, OperatorEnum.COUNT_DISTINCT)
+    _distinct = partialmethod(_unary_op, OperatorEnum.DISTINCT)
+    _moments = partialmethod(_unary_op, OperatorEnum.MOMENTS)
+    _moments_merge = partialmethod(_unary_op, OperatorEnum.MOMENTS_MERGE)
+    _moments_variance = partialmethod(_unary_op, OperatorEnum.MOMENTS_VARIANCE)
+    _hll_sketch = partialmethod(_unary_op, OperatorEnum.HLL_SKETCH)
+    _hll_merge = partialmethod(_unary_op, OperatorEnum.HLL_MERGE)
+    _hll_cardinality = partialmethod(_unary_op, OperatorEnum.HLL_CARDINALITY)
+    _tdigest_sketch = partialmethod(_unary_op, OperatorEnum.TDIGEST_SKETCH)
+    _tdigest_merge = partialmethod(_unary_op, OperatorEnum.TDIGEST_MERGE)
     # Logical
     __invert__ = partialmethod(_unary_op, OperatorEnum.INVERT)
 
@@ -285,6 +296,9 @@ class Expression(TreeNode["Expression"]):
     __gt__ = partialmethod(_binary_op, OperatorEnum.GT)
     __ge__ = partialmethod(_binary_op, OperatorEnum.GE)
 
+    # Sketches
+    _tdigest_quantile = partialmethod(_binary_op, OperatorEnum.TDIGEST_QUANTILE)
+
     # Reverse Logical
     __rand__ = partialmethod(_reverse_binary_op, OperatorEnum.AND)
     __ror__ = partialmethod(_reverse_binary_op, OperatorEnum.OR)
@@ -756,7 +770,12 @@ class BaseMethodAccessor:
 
 class UrlMethodAccessor(BaseMethodAccessor):
     def download(self) -> UdfExpression:
-        """Treats each string as a URL, and downloads the bytes contents as a bytes column"""
+        """Treats each string as a URL, and downloads the bytes contents as a bytes column
+
+        Downloads are cached on local disk when DAFT_DOWNLOAD_CACHE_DIR is set, so that repeated downloads of a URL
+        are served without contacting its filesystem. The hits and misses of the cache in a process are reported by
+        ``daft.execution.url_operators.get_download_cache().cache_info()``.
+        """
         return UdfExpression(
             url_operators.download,
             ExpressionType.from_py_type(bytes),
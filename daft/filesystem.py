@@ -1,9 +1,59 @@
+import collections
+import functools
+import hashlib
+import io
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from typing import IO, Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
 from fsspec import AbstractFileSystem, get_filesystem_class
+from fsspec.compression import compr
+from fsspec.utils import infer_compression, tokenize
+from pyarrow import parquet
+
+from daft.config import DaftSettings
+
+# Keys of fsspec file info that identify a version of a file, in order of preference
+_FILE_VERSION_KEYS = ("mtime", "LastModified", "updated", "ETag")
+
+# Cached results of list_files, keyed by the listed path and holding the time of listing
+_LISTING_CACHE: Dict[str, Tuple[float, List["FileInfo"]]] = {}
+_LISTING_CACHE_LOCK = threading.Lock()
+
+# Filesystems that have been created in this process, keyed by their protocol and a token of their options
+_FILESYSTEMS: Dict[Tuple[str, str], AbstractFileSystem] = {}
+_FILESYSTEMS_LOCK = threading.Lock()
+
+_BLOCK_CACHE: Optional["BlockCache"] = None
+_BLOCK_CACHE_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    """A file and its metadata, as returned by a listing"""
+
+    path: str
+    size: int
+    # Identifies the version of the file, such as its modification time, if the filesystem provides one
+    version: Optional[Hashable] = None
 
 
 def get_filesystem(protocol: str, **kwargs) -> AbstractFileSystem:
-    klass = get_filesystem_class(protocol)
-    fs = klass(**kwargs)
+    """Returns the filesystem for a protocol and options from a process-wide pool, so that its connection pools
+    and credentials are reused across reads instead of being set up again for every partition
+    """
+    key = (protocol, tokenize(kwargs))
+    with _FILESYSTEMS_LOCK:
+        fs = _FILESYSTEMS.get(key)
+        if fs is None:
+            klass = get_filesystem_class(protocol)
+            fs = klass(**kwargs)
+            _FILESYSTEMS[key] = fs
     return fs
 
 
@@ -17,3 +67,367 @@ def get_protocol_from_path(path: str, **kwargs) -> str:
 def get_filesystem_from_path(path: str, **kwargs) -> AbstractFileSystem:
     protocol = get_protocol_from_path(path)
     return get_filesystem(protocol, **kwargs)
+
+
+def strip_protocol(path: str) -> str:
+    """Returns a path in the form that the filesystem lists it, without its protocol"""
+    stripped: str = get_filesystem_from_path(path)._strip_protocol(path)
+    return stripped
+
+
+def _get_file_version(info: Dict[str, Any]) -> Optional[Hashable]:
+    versions = [info[key] for key in _FILE_VERSION_KEYS if info.get(key) is not None]
+    return versions[0] if versions else None
+
+
+def _to_file_info(info: Dict[str, Any], protocol: str) -> FileInfo:
+    # fsspec strips the protocol from listed paths, which is needed to read them later
+    path = info["name"] if protocol == "file" else f"{protocol}://{info['name']}"
+    return FileInfo(path=path, size=info["size"], version=_get_file_version(info))
+
+
+def get_file_info(path: str) -> FileInfo:
+    info = get_filesystem_from_path(path).info(path)
+    return FileInfo(path=path, size=info["size"], version=_get_file_version(info))
+
+
+def _has_magic(component: str) -> bool:
+    return any(c in component for c in "*?[")
+
+
+def _is_hidden(name: str) -> bool:
+    # Files such as _SUCCESS markers and .crc checksums are written next to data files by many tools
+    basename = name.rstrip("/").rsplit("/", 1)[-1]
+    return basename.startswith("_") or basename.startswith(".")
+
+
+def _ls(fs: AbstractFileSystem, path: str) -> List[Dict[str, Any]]:
+    try:
+        listing: List[Dict[str, Any]] = fs.ls(path, detail=True)
+        return listing
+    except FileNotFoundError:
+        return []
+
+
+def _info(fs: AbstractFileSystem, path: str) -> Optional[Dict[str, Any]]:
+    try:
+        info: Dict[str, Any] = fs.info(path)
+        return info
+    except FileNotFoundError:
+        return None
+
+
+def _walk_in_parallel(fs: AbstractFileSystem, dirs: List[str], pool: ThreadPoolExecutor) -> List[Dict[str, Any]]:
+    """Lists all files under the directories, listing every level of the tree concurrently"""
+    files = []
+    while dirs:
+        listings = pool.map(functools.partial(_ls, fs), dirs)
+        dirs = []
+        for info in (info for listing in listings for info in listing):
+            if _is_hidden(info["name"]):
+                continue
+            elif info["type"] == "directory":
+                dirs.append(info["name"])
+            elif info["type"] == "file":
+                files.append(info)
+    return files
+
+
+def _glob_in_parallel(fs: AbstractFileSystem, pattern: str, pool: ThreadPoolExecutor) -> List[Dict[str, Any]]:
+    """Matches a glob pattern one path component at a time, listing all prefixes that match so far concurrently"""
+    components = fs._strip_protocol(pattern).split("/")
+    num_literal_components = next(i for i, component in enumerate(components) if _has_magic(component))
+    infos = [{"name": "/".join(components[:num_literal_components]), "type": "directory"}]
+    for component in components[num_literal_components:]:
+        dirs = [info["name"] for info in infos if info["type"] == "directory"]
+        if _has_magic(component):
+            listings = pool.map(functools.partial(_ls, fs), dirs)
+            # As with shell globs, wildcards only match hidden files if the pattern starts with the same character
+            match_hidden = component.startswith(".") or component.startswith("_")
+            infos = [
+                info
+                for listing in listings
+                for info in listing
+                if fnmatch(info["name"].rstrip("/").rsplit("/", 1)[-1], component)
+                and (match_hidden or not _is_hidden(info["name"]))
+            ]
+        else:
+            infos = [
+                info for info in pool.map(functools.partial(_info, fs), [f"{d}/{component}" for d in dirs]) if info
+            ]
+    return [info for info in infos if info["type"] == "file"]
+
+
+def get_listing_root(path: str) -> str:
+    """Returns the longest prefix of a path that does not contain wildcards, which is the directory (or file)
+    that all files listed at the path are under
+    """
+    components = path.split("/")
+    for i, component in enumerate(components):
+        if _has_magic(component):
+            return "/".join(components[:i])
+    return path
+
+
+def _list_files(path: str) -> List[FileInfo]:
+    protocol = get_protocol_from_path(path)
+    fs = get_filesystem_from_path(path)
+    with ThreadPoolExecutor(max_workers=DaftSettings.DAFT_IO_NUM_THREADS) as pool:
+        if "**" in path:
+            infos = [info for info in fs.glob(path, detail=True).values() if info["type"] == "file"]
+        elif _has_magic(path):
+            infos = _glob_in_parallel(fs, path, pool)
+        else:
+            info = _info(fs, path)
+            if info is None:
+                return []
+            elif info["type"] != "directory":
+                return [FileInfo(path=path, size=info["size"], version=_get_file_version(info))]
+            infos = _walk_in_parallel(fs, [info["name"]], pool)
+    return sorted((_to_file_info(info, protocol) for info in infos), key=lambda file_info: file_info.path)
+
+
+def list_files(path: str) -> List[FileInfo]:
+    """Lists the files at a path, which may be a file, a directory whose files are listed recursively, or a glob.
+    Directories are listed concurrently, and listings are cached for DAFT_LISTING_CACHE_TTL_SECONDS if it is set.
+
+    Args:
+        path (str): path to list
+
+    Returns:
+        List[FileInfo]: files at the path, sorted by path
+    """
+    now = time.monotonic()
+    with _LISTING_CACHE_LOCK:
+        if path in _LISTING_CACHE:
+            listed_at, files = _LISTING_CACHE[path]
+            if now - listed_at < DaftSettings.DAFT_LISTING_CACHE_TTL_SECONDS:
+                return files
+    files = _list_files(path)
+    if DaftSettings.DAFT_LISTING_CACHE_TTL_SECONDS > 0:
+        with _LISTING_CACHE_LOCK:
+            _LISTING_CACHE[path] = (now, files)
+    return files
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a DiskLRUCache in this process"""
+
+    hits: int
+    misses: int
+    num_bytes: int
+    max_bytes: int
+
+
+class DiskLRUCache:
+    """Cache of byte strings in files in a local directory, which evicts the least recently used entries when it holds
+    more than `max_bytes`. Entries that are already in the directory when the cache is created are kept, oldest
+    first, so that processes on the same machine share them.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Sizes of the cached entries by key, from least to most recently used
+        self._entries: "collections.OrderedDict[str, int]" = collections.OrderedDict()
+        self._num_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        existing = [entry for entry in os.scandir(cache_dir) if entry.is_file() and not entry.name.startswith(".")]
+        for entry in sorted(existing, key=lambda entry: entry.stat().st_mtime):
+            self._add(entry.name, entry.stat().st_size)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        return hashlib.sha256("\0".join(str(part) for part in parts).encode()).hexdigest()
+
+    def _add(self, key: str, size: int) -> None:
+        if key in self._entries:
+            self._num_bytes -= self._entries.pop(key)
+        self._entries[key] = size
+        self._num_bytes += size
+        while self._num_bytes > self.max_bytes and len(self._entries) > 1:
+            evicted_key, evicted_size = self._entries.popitem(last=False)
+            self._num_bytes -= evicted_size
+            try:
+                os.remove(os.path.join(self.cache_dir, evicted_key))
+            except FileNotFoundError:
+                # Another process that shares the directory evicted it first
+                pass
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached bytes of a key, or None if the key is not cached"""
+        with self._lock:
+            is_cached = key in self._entries
+            if is_cached:
+                self._entries.move_to_end(key)
+        if is_cached:
+            try:
+                with open(os.path.join(self.cache_dir, key), "rb") as f:
+                    data = f.read()
+                with self._lock:
+                    self.hits += 1
+                return data
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Caches the bytes of a key, evicting the least recently used entries if the cache is full"""
+        # Entries are written to a temporary file and renamed, so that readers never see a partially written entry
+        tmp_path = os.path.join(self.cache_dir, f".{key}.{uuid.uuid4().hex}")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(self.cache_dir, key))
+        with self._lock:
+            self._add(key, len(data))
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(hits=self.hits, misses=self.misses, num_bytes=self._num_bytes, max_bytes=self.max_bytes)
+
+
+class BlockCache(DiskLRUCache):
+    """Read-through cache of fixed-size blocks of remote files in a local directory. Blocks are keyed by the path,
+    version and size of their file, so that a file that is overwritten is read again.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, block_size: int) -> None:
+        super().__init__(cache_dir, max_bytes)
+        self.block_size = block_size
+
+    def get_block(self, fs: AbstractFileSystem, file_info: FileInfo, index: int) -> bytes:
+        """Returns a block of a file, reading it from the filesystem and caching it if it is not cached
+
+        Args:
+            fs (AbstractFileSystem): filesystem of the file
+            file_info (FileInfo): the file
+            index (int): index of the block in the file
+
+        Returns:
+            bytes: the bytes of the block, which is shorter than the block size if it is the last block
+        """
+        key = self.make_key(file_info.path, file_info.version, file_info.size, self.block_size, index)
+        data = self.get(key)
+        if data is None:
+            start = index * self.block_size
+            data = fs.cat_file(file_info.path, start=start, end=min(start + self.block_size, file_info.size))
+            self.put(key, data)
+        return data
+
+
+class _BlockCachedFile(io.RawIOBase):
+    """Read-only file that reads a remote file through a BlockCache"""
+
+    def __init__(self, fs: AbstractFileSystem, file_info: FileInfo, cache: BlockCache) -> None:
+        super().__init__()
+        self._fs = fs
+        self._file_info = file_info
+        self._cache = cache
+        self._pos = 0
+        # The last block that was read, which is kept to serve small sequential reads without going to the cache
+        self._block_index = -1
+        self._block = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self._file_info.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        return self._pos
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast("B")
+        num_read = 0
+        while num_read < len(view) and self._pos < self._file_info.size:
+            index, offset = divmod(self._pos, self._cache.block_size)
+            if index != self._block_index:
+                self._block = self._cache.get_block(self._fs, self._file_info, index)
+                self._block_index = index
+            chunk = self._block[offset : offset + len(view) - num_read]
+            view[num_read : num_read + len(chunk)] = chunk
+            num_read += len(chunk)
+            self._pos += len(chunk)
+        return num_read
+
+
+def get_block_cache() -> Optional[BlockCache]:
+    """Returns the process-wide BlockCache as configured by DAFT_BLOCK_CACHE_DIR, DAFT_BLOCK_CACHE_SIZE_BYTES and
+    DAFT_BLOCK_CACHE_BLOCK_SIZE_BYTES, or None if the cache is disabled
+    """
+    global _BLOCK_CACHE
+    if DaftSettings.DAFT_BLOCK_CACHE_DIR is None:
+        return None
+    config = (
+        DaftSettings.DAFT_BLOCK_CACHE_DIR,
+        DaftSettings.DAFT_BLOCK_CACHE_SIZE_BYTES,
+        DaftSettings.DAFT_BLOCK_CACHE_BLOCK_SIZE_BYTES,
+    )
+    with _BLOCK_CACHE_LOCK:
+        if _BLOCK_CACHE is None or (_BLOCK_CACHE.cache_dir, _BLOCK_CACHE.max_bytes, _BLOCK_CACHE.block_size) != config:
+            _BLOCK_CACHE = BlockCache(*config)
+        return _BLOCK_CACHE
+
+
+def open_file(path: str, compression: Optional[str] = None, file_info: Optional[FileInfo] = None) -> IO[bytes]:
+    """Opens a file for reading. Remote files are read through the block cache if it is enabled by
+    DAFT_BLOCK_CACHE_DIR, so that files that are read repeatedly are served from local disk.
+
+    Args:
+        path (str): path to the file
+        compression (Optional[str]): compression of the file, or "infer" to infer it from its extension
+        file_info (Optional[FileInfo]): listed metadata of the file, which is looked up if needed and not provided
+
+    Returns:
+        IO[bytes]: the opened file
+    """
+    fs = get_filesystem_from_path(path)
+    cache = get_block_cache()
+    if cache is None or get_protocol_from_path(path) == "file":
+        f: IO[bytes] = fs.open(path, "rb", compression=compression)
+        return f
+    if file_info is None:
+        file_info = get_file_info(path)
+    f = io.BufferedReader(_BlockCachedFile(fs, file_info, cache), buffer_size=min(cache.block_size, 1024 * 1024))
+    if compression == "infer":
+        compression = infer_compression(path)
+    if compression is not None:
+        f = compr[compression](f, mode="rb")
+    return f
+
+
+@functools.lru_cache(maxsize=DaftSettings.DAFT_PARQUET_METADATA_CACHE_SIZE)
+def _read_parquet_metadata(file_info: FileInfo) -> parquet.FileMetaData:
+    with open_file(file_info.path, file_info=file_info) as f:
+        return parquet.ParquetFile(f).metadata
+
+
+def get_parquet_metadata(path: str) -> parquet.FileMetaData:
+    """Returns the footer of a Parquet file, from a process-wide LRU cache keyed by the path, size and
+    modification time of the file so that a file that is overwritten has its footer read again. The file is stat-ed
+    on every call rather than trusting a listing of it, which may be cached.
+
+    Args:
+        path (str): path to the Parquet file
+
+    Returns:
+        parquet.FileMetaData: footer of the Parquet file
+    """
+    return _read_parquet_metadata(get_file_info(path))
@@ -0,0 +1,14 @@
+from typing import Union
+
+import pyarrow as pa
+
+
+def combine_chunks(column: Union[pa.Array, pa.ChunkedArray]) -> pa.Array:
+    """Returns a column as a single Arrow Array. ChunkedArrays without any chunks, such as the columns of empty
+    partitions, are combined into an empty Array of their type rather than raising as `combine_chunks()` does.
+    """
+    if not isinstance(column, pa.ChunkedArray):
+        return column
+    if column.num_chunks == 0:
+        return pa.array([], type=column.type)
+    return column.combine_chunks()
@@ -0,0 +1,129 @@
+# distutils: language=c++
+
+from libc cimport stdint
+from pyarrow.lib cimport (
+    AllocateBuffer,
+    CArray,
+    CArrayData,
+    CBuffer,
+    GetPrimitiveType,
+    GetResultValue,
+    MakeArray,
+    Type,
+    pyarrow_unwrap_array,
+    pyarrow_wrap_array,
+    shared_ptr,
+    to_shared,
+    vector,
+)
+
+import cython
+import numpy as np
+import pyarrow as pa
+
+from daft.internal.arrow_utils import combine_chunks
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef bint _histogram(
+    const stdint.int64_t* targets,
+    stdint.int64_t num_rows,
+    stdint.int64_t num_partitions,
+    stdint.int64_t[::1] offsets,
+    bint* is_grouped,
+) nogil:
+    """Counts the rows of each partition into `offsets` and turns the counts into the offset of each partition,
+    returning False if a target is out of range
+    """
+    cdef stdint.int64_t i, target, previous = 0
+    is_grouped[0] = True
+    for i in range(num_rows):
+        target = targets[i]
+        if target < 0 or target >= num_partitions:
+            return False
+        if target < previous:
+            is_grouped[0] = False
+        previous = target
+        offsets[target + 1] += 1
+    for i in range(num_partitions):
+        offsets[i + 1] += offsets[i]
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _scatter(
+    const stdint.int64_t* targets,
+    stdint.int64_t num_rows,
+    stdint.int64_t[::1] offsets,
+    stdint.int64_t* permutation,
+) nogil:
+    """Writes the index of each row to the next free slot of its partition, keeping the order of rows within a partition"""
+    cdef stdint.int64_t i, target
+    cdef vector[stdint.int64_t] positions
+    positions.assign(&offsets[0], &offsets[0] + offsets.shape[0] - 1)
+    for i in range(num_rows):
+        target = targets[i]
+        permutation[positions[target]] = i
+        positions[target] += 1
+
+
+def counting_sort_partition(targets, num_partitions):
+    """Groups rows by their target partition with a stable counting sort: one histogram pass over the targets and one
+    pass that scatters the index of every row to its partition's slot.
+
+    Args:
+        targets: target partition of each row, as an integer Arrow Array or ChunkedArray without nulls
+        num_partitions (int): number of partitions, which all targets must be smaller than
+
+    Returns:
+        Tuple[Optional[pa.Int64Array], np.ndarray]: the permutation that gathers the rows of each partition together,
+            which is None if the rows already are, and the `num_partitions + 1` offsets of the partitions in the
+            permuted rows
+    """
+    targets = combine_chunks(targets)
+    if targets.null_count > 0:
+        raise ValueError("target partitions cannot be null")
+    if targets.type != pa.int64():
+        targets = targets.cast(pa.int64())
+
+    cdef stdint.int64_t num_rows = len(targets)
+    cdef stdint.int64_t num_parts = num_partitions
+    offsets = np.zeros(num_parts + 1, dtype=np.int64)
+    if num_rows == 0:
+        return None, offsets
+
+    cdef shared_ptr[CArray] arr = pyarrow_unwrap_array(targets)
+    cdef CArrayData* array_data = arr.get().data().get()
+    cdef const stdint.int64_t* target_data = (
+        <const stdint.int64_t*> array_data.buffers.at(1).get().data()
+    ) + array_data.offset
+    cdef stdint.int64_t[::1] offsets_view = offsets
+    cdef bint is_grouped
+    cdef bint is_valid
+    with nogil:
+        is_valid = _histogram(target_data, num_rows, num_parts, offsets_view, &is_grouped)
+    if not is_valid:
+        raise ValueError(f"target partitions must be in the range [0, {num_partitions})")
+    if is_grouped:
+        return None, offsets
+
+    cdef shared_ptr[CBuffer] permutation_buffer = to_shared(
+        GetResultValue(AllocateBuffer(num_rows * cython.sizeof(stdint.int64_t), NULL))
+    )
+    cdef stdint.int64_t* permutation_data = <stdint.int64_t*> permutation_buffer.get().mutable_data()
+    with nogil:
+        _scatter(target_data, num_rows, offsets_view, permutation_data)
+
+    cdef vector[shared_ptr[CBuffer]] permutation_buffer_vector
+    permutation_buffer_vector.push_back(shared_ptr[CBuffer]())
+    permutation_buffer_vector.push_back(permutation_buffer)
+    cdef shared_ptr[CArrayData] permutation_array_data = CArrayData.Make(
+        GetPrimitiveType(Type._Type_INT64),
+        num_rows,
+        permutation_buffer_vector,
+        0,
+        0,
+    )
+    return pyarrow_wrap_array(MakeArray(permutation_array_data)), offsets
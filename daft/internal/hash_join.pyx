@@ -0,0 +1,313 @@
+# distutils: language=c++
+# distutils: sources = daft/internal/xxhash.cc
+
+from libc cimport stdint
+from libc.string cimport memcmp, memcpy
+from pyarrow.lib cimport (
+    AllocateBuffer,
+    CArray,
+    CArrayData,
+    CBuffer,
+    GetPrimitiveType,
+    GetResultValue,
+    MakeArray,
+    Type,
+    pyarrow_unwrap_array,
+    pyarrow_wrap_array,
+    shared_ptr,
+    to_shared,
+    vector,
+)
+
+import cython
+import pyarrow as pa
+import pyarrow.compute as pac
+
+from daft.internal.arrow_utils import combine_chunks
+
+
+cdef extern from "xxhash.h":
+    stdint.uint64_t XXH3_64bits(const void* input, size_t length) nogil
+
+
+# Byte widths that mark variable-width key columns with 32 and 64 bit offsets
+DEF BINARY_WIDTH = 0
+DEF LARGE_BINARY_WIDTH = -1
+
+
+cdef struct KeyColumn:
+    const stdint.uint8_t* valid_bits
+    const stdint.uint8_t* data
+    const stdint.int32_t* offsets
+    const stdint.int64_t* large_offsets
+    stdint.int64_t offset
+    stdint.int64_t byte_width
+
+
+def _unify_key_types(left: pa.Array, right: pa.Array):
+    """Casts a pair of key columns to a common type, so that equal keys have equal bytes"""
+    if pa.types.is_dictionary(left.type):
+        left = left.dictionary_decode()
+    if pa.types.is_dictionary(right.type):
+        right = right.dictionary_decode()
+    if left.type == right.type:
+        return left, right
+    if pa.types.is_null(left.type):
+        return left.cast(right.type), right
+    if pa.types.is_null(right.type):
+        return left, right.cast(left.type)
+    if pa.types.is_integer(left.type) and pa.types.is_integer(right.type):
+        return left.cast(pa.int64()), right.cast(pa.int64())
+    if (pa.types.is_integer(left.type) or pa.types.is_floating(left.type)) and (
+        pa.types.is_integer(right.type) or pa.types.is_floating(right.type)
+    ):
+        return left.cast(pa.float64()), right.cast(pa.float64())
+    if (pa.types.is_string(left.type) or pa.types.is_large_string(left.type)) and (
+        pa.types.is_string(right.type) or pa.types.is_large_string(right.type)
+    ):
+        return left.cast(pa.large_string()), right.cast(pa.large_string())
+    if (pa.types.is_binary(left.type) or pa.types.is_large_binary(left.type)) and (
+        pa.types.is_binary(right.type) or pa.types.is_large_binary(right.type)
+    ):
+        return left.cast(pa.large_binary()), right.cast(pa.large_binary())
+    return left, right.cast(left.type)
+
+
+def _key_byte_width(key_type: pa.DataType) -> int:
+    if pa.types.is_string(key_type) or pa.types.is_binary(key_type):
+        return BINARY_WIDTH
+    if pa.types.is_large_string(key_type) or pa.types.is_large_binary(key_type):
+        return LARGE_BINARY_WIDTH
+    if (
+        pa.types.is_integer(key_type)
+        or pa.types.is_floating(key_type)
+        or pa.types.is_temporal(key_type)
+        or pa.types.is_decimal(key_type)
+        or pa.types.is_fixed_size_binary(key_type)
+    ):
+        return key_type.bit_width // 8
+    raise TypeError(f"cannot join on keys of type {key_type}")
+
+
+def _normalize_key(key: pa.Array) -> pa.Array:
+    """Rewrites keys whose equal values can have different bytes"""
+    if pa.types.is_boolean(key.type):
+        # Booleans are bit-packed, so they are joined as bytes instead
+        return key.cast(pa.uint8())
+    if pa.types.is_floating(key.type) and not pa.types.is_float16(key.type):
+        # Adding zero turns -0.0 into 0.0
+        return pac.add(key, pa.scalar(0, type=key.type))
+    return key
+
+
+cdef KeyColumn _make_key_column(key: pa.Array, stdint.int64_t byte_width) except *:
+    cdef shared_ptr[CArray] arr = pyarrow_unwrap_array(key)
+    cdef CArrayData* array_data = arr.get().data().get()
+    cdef vector[shared_ptr[CBuffer]] buffers = array_data.buffers
+    cdef KeyColumn column
+    column.valid_bits = NULL
+    column.data = NULL
+    column.offsets = NULL
+    column.large_offsets = NULL
+    column.offset = array_data.offset
+    column.byte_width = byte_width
+    if key.null_count > 0:
+        column.valid_bits = buffers.at(0).get().data()
+    if byte_width > 0:
+        column.data = buffers.at(1).get().data()
+    else:
+        if byte_width == BINARY_WIDTH:
+            column.offsets = <const stdint.int32_t*> buffers.at(1).get().data()
+        else:
+            column.large_offsets = <const stdint.int64_t*> buffers.at(1).get().data()
+        # The data buffer is absent if every value is empty
+        if buffers.at(2).get() != NULL:
+            column.data = buffers.at(2).get().data()
+    return column
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline bint _is_valid(const KeyColumn* column, stdint.int64_t i) nogil:
+    if column.valid_bits == NULL:
+        return True
+    cdef stdint.int64_t idx = i + column.offset
+    return (column.valid_bits[idx >> 3] >> (idx & 7)) & 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline const stdint.uint8_t* _value(const KeyColumn* column, stdint.int64_t i, stdint.int64_t* length) nogil:
+    cdef stdint.int64_t idx = i + column.offset
+    cdef stdint.int64_t start
+    if column.byte_width > 0:
+        length[0] = column.byte_width
+        return column.data + idx * column.byte_width
+    if column.byte_width == BINARY_WIDTH:
+        start = column.offsets[idx]
+        length[0] = column.offsets[idx + 1] - start
+    else:
+        start = column.large_offsets[idx]
+        length[0] = column.large_offsets[idx + 1] - start
+    return column.data + start
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _hash_rows(
+    const vector[KeyColumn]& columns,
+    stdint.int64_t num_rows,
+    vector[stdint.uint64_t]& hashes,
+    vector[stdint.uint8_t]& valid,
+) nogil:
+    """Hashes the key of each row over all key columns, where rows with a null in any key column are invalid"""
+    cdef stdint.int64_t i, length
+    cdef size_t c
+    cdef stdint.uint64_t h, value_hash
+    cdef const stdint.uint8_t* value
+    hashes.resize(num_rows)
+    valid.resize(num_rows)
+    for i in range(num_rows):
+        h = 0
+        valid[i] = 1
+        for c in range(columns.size()):
+            if not _is_valid(&columns[c], i):
+                valid[i] = 0
+                break
+            value = _value(&columns[c], i, &length)
+            value_hash = XXH3_64bits(value, length)
+            h ^= value_hash + <stdint.uint64_t> 0x9E3779B97F4A7C15 + (h << 6) + (h >> 2)
+        hashes[i] = h
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline bint _keys_equal(
+    const vector[KeyColumn]& build_columns,
+    stdint.int64_t build_row,
+    const vector[KeyColumn]& probe_columns,
+    stdint.int64_t probe_row,
+) nogil:
+    cdef size_t c
+    cdef stdint.int64_t build_length, probe_length
+    cdef const stdint.uint8_t* build_value
+    cdef const stdint.uint8_t* probe_value
+    for c in range(build_columns.size()):
+        build_value = _value(&build_columns[c], build_row, &build_length)
+        probe_value = _value(&probe_columns[c], probe_row, &probe_length)
+        if build_length != probe_length:
+            return False
+        if build_length > 0 and memcmp(build_value, probe_value, build_length) != 0:
+            return False
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _hash_join(
+    const vector[KeyColumn]& build_columns,
+    stdint.int64_t num_build_rows,
+    const vector[KeyColumn]& probe_columns,
+    stdint.int64_t num_probe_rows,
+    vector[stdint.int64_t]& build_indices,
+    vector[stdint.int64_t]& probe_indices,
+) nogil:
+    cdef vector[stdint.uint64_t] build_hashes, probe_hashes
+    cdef vector[stdint.uint8_t] build_valid, probe_valid
+    _hash_rows(build_columns, num_build_rows, build_hashes, build_valid)
+
+    # Chained hash table, where each bucket holds the first row of its chain and `next_row` links the rows of a chain
+    cdef stdint.uint64_t num_buckets = 1
+    while num_buckets < <stdint.uint64_t> (2 * num_build_rows):
+        num_buckets <<= 1
+    cdef stdint.uint64_t mask = num_buckets - 1
+    cdef vector[stdint.int64_t] buckets
+    buckets.assign(num_buckets, -1)
+    cdef vector[stdint.int64_t] next_row
+    next_row.assign(num_build_rows, -1)
+
+    cdef stdint.int64_t i, row
+    cdef stdint.uint64_t bucket
+    # Inserting in reverse keeps each chain in ascending row order
+    for i in range(num_build_rows - 1, -1, -1):
+        if not build_valid[i]:
+            continue
+        bucket = build_hashes[i] & mask
+        next_row[i] = buckets[bucket]
+        buckets[bucket] = i
+
+    _hash_rows(probe_columns, num_probe_rows, probe_hashes, probe_valid)
+    for i in range(num_probe_rows):
+        if not probe_valid[i]:
+            continue
+        row = buckets[probe_hashes[i] & mask]
+        while row != -1:
+            if build_hashes[row] == probe_hashes[i] and _keys_equal(build_columns, row, probe_columns, i):
+                build_indices.push_back(row)
+                probe_indices.push_back(i)
+            row = next_row[row]
+
+
+cdef object _to_index_array(const vector[stdint.int64_t]& indices):
+    cdef stdint.int64_t length = indices.size()
+    cdef shared_ptr[CBuffer] result_buffer = to_shared(
+        GetResultValue(AllocateBuffer(length * cython.sizeof(stdint.int64_t), NULL))
+    )
+    if length > 0:
+        memcpy(result_buffer.get().mutable_data(), indices.data(), length * cython.sizeof(stdint.int64_t))
+
+    cdef vector[shared_ptr[CBuffer]] result_buffer_vector
+    result_buffer_vector.push_back(shared_ptr[CBuffer]())
+    result_buffer_vector.push_back(result_buffer)
+    cdef shared_ptr[CArrayData] result_array_data = CArrayData.Make(
+        GetPrimitiveType(Type._Type_INT64),
+        length,
+        result_buffer_vector,
+        0,
+        0,
+    )
+    return pyarrow_wrap_array(MakeArray(result_array_data))
+
+
+def hash_join_indices(left_keys, right_keys):
+    """Computes the rows of an inner equi-join between two sets of key columns, by building a hash table on the
+    side with fewer rows and probing it with the other side. Keys containing a null never match.
+
+    Args:
+        left_keys: key columns of the left side, as Arrow Arrays or ChunkedArrays of equal length
+        right_keys: key columns of the right side, in the same order as `left_keys`
+
+    Returns:
+        Tuple[pa.Int64Array, pa.Int64Array]: indices of the left and right rows of each pair of matching rows
+    """
+    if len(left_keys) != len(right_keys) or len(left_keys) == 0:
+        raise ValueError(f"expected the same number of left and right keys, got {len(left_keys)} and {len(right_keys)}")
+
+    # Keep references to the normalized arrays, as the KeyColumns point into their buffers
+    left_arrays = []
+    right_arrays = []
+    cdef vector[KeyColumn] left_columns, right_columns
+    cdef stdint.int64_t byte_width
+    for left, right in zip(left_keys, right_keys):
+        left, right = combine_chunks(left), combine_chunks(right)
+        left, right = _unify_key_types(left, right)
+        left, right = _normalize_key(left), _normalize_key(right)
+        if pa.types.is_null(left.type):
+            # Keys that are all null never match
+            return pa.array([], type=pa.int64()), pa.array([], type=pa.int64())
+        byte_width = _key_byte_width(left.type)
+        left_arrays.append(left)
+        right_arrays.append(right)
+        left_columns.push_back(_make_key_column(left, byte_width))
+        right_columns.push_back(_make_key_column(right, byte_width))
+
+    cdef stdint.int64_t num_left_rows = len(left_arrays[0])
+    cdef stdint.int64_t num_right_rows = len(right_arrays[0])
+    cdef vector[stdint.int64_t] left_indices, right_indices
+    if num_left_rows <= num_right_rows:
+        with nogil:
+            _hash_join(left_columns, num_left_rows, right_columns, num_right_rows, left_indices, right_indices)
+    else:
+        with nogil:
+            _hash_join(right_columns, num_right_rows, left_columns, num_left_rows, right_indices, left_indices)
+    return _to_index_array(left_indices), _to_index_array(right_indices)
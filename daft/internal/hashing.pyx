@@ -1,17 +1,15 @@
 # distutils: language=c++
 # distutils: sources = daft/internal/xxhash.cc
 
-from libc cimport math, stdint
-from libc.string cimport memset
+from libc cimport stdint
+from libc.math cimport NAN
+from libc.string cimport memcpy
 from pyarrow.lib cimport (
     AllocateBuffer,
     CArray,
     CArrayData,
     CBuffer,
     CChunkedArray,
-    CDataType,
-    CResult,
-    CScalarFunction,
     GetPrimitiveType,
     GetResultValue,
     MakeArray,
@@ -19,166 +17,261 @@ from pyarrow.lib cimport (
     make_shared,
     pyarrow_unwrap_array,
     pyarrow_unwrap_chunked_array,
+    pyarrow_wrap_array,
     pyarrow_wrap_chunked_array,
     shared_ptr,
     to_shared,
-    unique_ptr,
     vector,
 )
 
 import cython
+import pyarrow as pa
 
+from daft.internal.arrow_utils import combine_chunks
 
-cdef extern from "xxhash.h":
-    stdint.uint64_t XXH3_64bits(const void* input, size_t length);
-
-
-
-cdef shared_ptr[CBuffer] _shift_valid_bits(
-    const shared_ptr[CBuffer] valid_bits,
-    const stdint.int64_t num_values,
-    const stdint.int64_t offset):
-    if valid_bits.get() == NULL:
-        return valid_bits
-    cdef const stdint.uint8_t* valid_bits_data_ptr = valid_bits.get().data()
-    cdef stdint.int64_t result_valid_bits_buffer_size = <stdint.uint64_t> math.ceil(num_values / 8.)
-    cdef shared_ptr[CBuffer] result_valid_bits_buffer = to_shared(GetResultValue(AllocateBuffer(result_valid_bits_buffer_size, NULL)))
-    cdef stdint.uint8_t* result_valid_bits_data_ptr = <stdint.uint8_t*> result_valid_bits_buffer.get().mutable_data()
-    memset(result_valid_bits_data_ptr, 0, result_valid_bits_buffer_size )
-    cdef stdint.int64_t byte_offset = offset // 8
-    cdef stdint.uint8_t bit_offset = offset % 8
-    cdef stdint.int64_t i, idx
-    cdef stdint.uint8_t mask
-    for i in range(num_values):
-        idx = i + offset
-        is_valid = (valid_bits_data_ptr[idx // 8] & (1 << (idx & 0b111))) != 0
-        result_valid_bits_data_ptr[i // 8] |= (is_valid << (i & 0b111))
-
-    return result_valid_bits_buffer
-
-
-cdef shared_ptr[CArray] _hash_integer_array(shared_ptr[CArray] arr):
-    type_id = arr.get().type_id()
-
-    if not ((Type._Type_UINT8 <= type_id) and (type_id <= Type._Type_INT64)):
-        raise TypeError('expected integer array')
-
-    cdef shared_ptr[CArrayData] array_data = arr.get().data()
-    cdef stdint.int64_t length = array_data.get().length
-    cdef stdint.int64_t offset = array_data.get().offset
-    cdef stdint.int64_t null_count = array_data.get().null_count
-    cdef vector[shared_ptr[CBuffer]] buffers = array_data.get().buffers
 
-    cdef shared_ptr[CBuffer] valid_bits = buffers.at(0)
-    cdef shared_ptr[CBuffer] data = buffers.at(1)
-    cdef const stdint.uint8_t* data_ptr = data.get().data()
+cdef extern from "xxhash.h":
+    stdint.uint64_t XXH3_64bits(const void* input, size_t length) nogil;
 
 
+# Hash of every null slot, so that rows with null keys are all sent to the same partition
+NULL_HASH = 0x9E3779B97F4A7C15
+cdef stdint.uint64_t C_NULL_HASH = NULL_HASH
 
-    cdef stdint.uint64_t result_buffer_size = length * cython.sizeof(stdint.uint64_t)
-    cdef shared_ptr[CBuffer] result_buffer = to_shared(GetResultValue(AllocateBuffer(result_buffer_size, NULL)))
-    cdef stdint.uint64_t* buffer_data_ptr = <stdint.uint64_t*> result_buffer.get().mutable_data()
+# Layouts of the arrays that are hashed
+DEF FIXED_WIDTH = 0
+DEF FLOAT32 = 1
+DEF FLOAT64 = 2
+DEF BOOLEAN = 3
+DEF BINARY = 4
+DEF LARGE_BINARY = 5
+DEF ALL_NULL = 6
 
 
-    cdef stdint.int64_t byte_width =  (data.get().size() // (length + offset)) if length > 0 else 0
+cdef struct HashColumn:
+    int layout
+    const stdint.uint8_t* valid_bits
+    const stdint.uint8_t* data
+    const void* offsets
+    stdint.int64_t byte_width
+    stdint.int64_t offset
 
-    cdef stdint.int64_t i, idx
-    cdef stdint.uint64_t h_value = 0
-    for i in range(length):
-        # TODO Skip nulls
-        idx = (i + offset)
-        h_value = XXH3_64bits(data_ptr + idx*byte_width, byte_width)
-        buffer_data_ptr[i] = h_value
-
-    cdef vector[shared_ptr[CBuffer]] result_buffer_vector
-    result_buffer_vector.push_back(_shift_valid_bits(valid_bits, length, offset))
-    result_buffer_vector.push_back(result_buffer)
-
-    cdef shared_ptr[CArrayData] result_array_data = CArrayData.Make(
-        GetPrimitiveType(Type._Type_UINT64),
-        length,
-        result_buffer_vector,
-        null_count,
-        0,
-    )
-    return MakeArray(result_array_data)
 
-cdef shared_ptr[CArray] _hash_string_array(shared_ptr[CArray] arr):
+cdef HashColumn _make_hash_column(shared_ptr[CArray] arr, int layout, stdint.int64_t byte_width):
     "https://arrow.apache.org/docs/format/Columnar.html#buffer-listing-for-each-layout"
-    type_id = arr.get().type_id()
-
-    if not (type_id == Type._Type_STRING):
-        raise TypeError('expected string array')
-
-    cdef shared_ptr[CArrayData] array_data = arr.get().data()
-    cdef stdint.int64_t length = array_data.get().length
-    cdef stdint.int64_t offset = array_data.get().offset
-    cdef stdint.int64_t null_count = array_data.get().null_count
-
-    cdef vector[shared_ptr[CBuffer]] buffers = array_data.get().buffers
-
-    cdef shared_ptr[CBuffer] valid_bits = buffers.at(0)
-    cdef shared_ptr[CBuffer] offsets = buffers.at(1)
-    cdef shared_ptr[CBuffer] data = buffers.at(2)
-
-    cdef const stdint.uint8_t* data_ptr = data.get().data()
-    cdef const stdint.uint32_t* offsets_ptr = <const stdint.uint32_t*> offsets.get().data()
-
-
-    cdef stdint.uint64_t result_buffer_size = length * cython.sizeof(stdint.uint64_t)
-    cdef shared_ptr[CBuffer] result_buffer = to_shared(GetResultValue(AllocateBuffer(result_buffer_size, NULL)))
-    cdef stdint.uint64_t* buffer_data_ptr = <stdint.uint64_t*> result_buffer.get().mutable_data()
-
-    cdef stdint.int64_t i, idx, word_size
-    cdef stdint.uint64_t h_value
-
+    cdef CArrayData* array_data = arr.get().data().get()
+    cdef vector[shared_ptr[CBuffer]] buffers = array_data.buffers
+    cdef HashColumn column
+    column.layout = layout
+    column.valid_bits = NULL
+    column.data = NULL
+    column.offsets = NULL
+    column.byte_width = byte_width
+    column.offset = array_data.offset
+    if layout == ALL_NULL:
+        return column
+    if array_data.null_count != 0 and buffers.at(0).get() != NULL:
+        column.valid_bits = buffers.at(0).get().data()
+    if layout == BINARY or layout == LARGE_BINARY:
+        column.offsets = buffers.at(1).get().data()
+        # The data buffer is absent if every value is empty
+        if buffers.at(2).get() != NULL:
+            column.data = buffers.at(2).get().data()
+    else:
+        column.data = buffers.at(1).get().data()
+    return column
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline stdint.uint64_t _hash_value(const HashColumn* column, stdint.int64_t i) nogil:
+    cdef stdint.int64_t idx = i + column.offset
+    cdef stdint.int64_t start, end
+    cdef float float_value
+    cdef double double_value
+    cdef stdint.uint8_t bool_value
+    if column.layout == ALL_NULL or (
+        column.valid_bits != NULL and (column.valid_bits[idx >> 3] & (1 << (idx & 0b111))) == 0
+    ):
+        return C_NULL_HASH
+    if column.layout == FIXED_WIDTH:
+        return XXH3_64bits(column.data + idx * column.byte_width, column.byte_width)
+    if column.layout == FLOAT32:
+        # Values that compare equal hash the same: -0.0 as 0.0 and every NaN as the canonical NaN
+        memcpy(&float_value, column.data + idx * 4, 4)
+        if float_value == 0:
+            float_value = 0
+        elif float_value != float_value:
+            float_value = <float> NAN
+        return XXH3_64bits(&float_value, 4)
+    if column.layout == FLOAT64:
+        memcpy(&double_value, column.data + idx * 8, 8)
+        if double_value == 0:
+            double_value = 0
+        elif double_value != double_value:
+            double_value = NAN
+        return XXH3_64bits(&double_value, 8)
+    if column.layout == BOOLEAN:
+        bool_value = (column.data[idx >> 3] >> (idx & 0b111)) & 1
+        return XXH3_64bits(&bool_value, 1)
+    if column.layout == BINARY:
+        start = (<const stdint.int32_t*> column.offsets)[idx]
+        end = (<const stdint.int32_t*> column.offsets)[idx + 1]
+    else:
+        start = (<const stdint.int64_t*> column.offsets)[idx]
+        end = (<const stdint.int64_t*> column.offsets)[idx + 1]
+    return XXH3_64bits(column.data + start, end - start)
+
+
+cdef inline stdint.uint64_t _combine_hashes(stdint.uint64_t seed, stdint.uint64_t value) nogil:
+    return seed ^ (value + 0x9E3779B9U + (seed << 6) + (seed >> 2))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _hash_partition(
+    const vector[HashColumn]& columns,
+    stdint.int64_t length,
+    stdint.uint64_t num_partitions,
+    stdint.uint64_t* hashes,
+    stdint.int64_t* targets,
+) nogil:
+    cdef stdint.int64_t i
+    cdef size_t k
+    cdef stdint.uint64_t h
     for i in range(length):
-        idx = i + offset
-        # TODO Skip nulls
-        word_size = offsets_ptr[idx+1] - offsets_ptr[idx]
-        h_value = XXH3_64bits(data_ptr + offsets_ptr[idx], word_size)
-        buffer_data_ptr[i] = h_value
-
-    cdef vector[shared_ptr[CBuffer]] result_buffer_vector
-    result_buffer_vector.push_back(_shift_valid_bits(valid_bits, length, offset))
-    result_buffer_vector.push_back(result_buffer)
-
-    cdef shared_ptr[CArrayData] result_array_data = CArrayData.Make(
-        GetPrimitiveType(Type._Type_UINT64),
-        length,
-        result_buffer_vector,
-        null_count,
-        0,
-    )
-    return MakeArray(result_array_data)
+        h = _hash_value(&columns[0], i)
+        for k in range(1, columns.size()):
+            h = _combine_hashes(h, _hash_value(&columns[k], i))
+        hashes[i] = h
+        targets[i] = h % num_partitions
+
+
+cdef shared_ptr[CArray] _make_array(Type type_id, shared_ptr[CBuffer] data, stdint.int64_t length):
+    cdef vector[shared_ptr[CBuffer]] buffer_vector
+    buffer_vector.push_back(shared_ptr[CBuffer]())
+    buffer_vector.push_back(data)
+    cdef shared_ptr[CArrayData] array_data = CArrayData.Make(GetPrimitiveType(type_id), length, buffer_vector, 0, 0)
+    return MakeArray(array_data)
+
+
+cdef shared_ptr[CBuffer] _allocate_buffer(stdint.int64_t length):
+    return to_shared(GetResultValue(AllocateBuffer(length * cython.sizeof(stdint.uint64_t), NULL)))
+
+
+cdef shared_ptr[CArray] _hash_array(shared_ptr[CArray] arr, int layout, stdint.int64_t byte_width):
+    cdef HashColumn column = _make_hash_column(arr, layout, byte_width)
+    cdef stdint.int64_t length = arr.get().length()
+    cdef shared_ptr[CBuffer] result_buffer = _allocate_buffer(length)
+    cdef stdint.uint64_t* result_ptr = <stdint.uint64_t*> result_buffer.get().mutable_data()
+    cdef stdint.int64_t i
+    with nogil:
+        for i in range(length):
+            result_ptr[i] = _hash_value(&column, i)
+    # Nulls are hashed to NULL_HASH, so the result has no validity bitmap
+    return _make_array(Type._Type_UINT64, result_buffer, length)
+
+
+def _layout_of(pa_type: pa.DataType):
+    """Returns the layout that values of the type are hashed as, and their width in bytes for fixed-width types"""
+    if pa.types.is_null(pa_type):
+        return ALL_NULL, 0
+    if pa.types.is_boolean(pa_type):
+        return BOOLEAN, 0
+    if pa_type == pa.float32():
+        return FLOAT32, 4
+    if pa_type == pa.float64():
+        return FLOAT64, 8
+    if pa.types.is_string(pa_type) or pa.types.is_binary(pa_type):
+        return BINARY, 0
+    if pa.types.is_large_string(pa_type) or pa.types.is_large_binary(pa_type):
+        return LARGE_BINARY, 0
+    if not (pa.types.is_nested(pa_type) or pa.types.is_dictionary(pa_type)):
+        try:
+            # The data buffer can be larger than the array, such as for a slice of a larger array, so the width is
+            # taken from the type rather than the buffer
+            bit_width = pa_type.bit_width
+        except ValueError:
+            bit_width = 0
+        if bit_width > 0 and bit_width % 8 == 0:
+            return FIXED_WIDTH, bit_width // 8
+    raise TypeError(f"cannot hash {pa_type}")
 
 
 def hash_chunked_array(obj):
+    """Hashes every value of a ChunkedArray with XXH3 from the bytes of its Arrow buffers. Fixed-width values such as
+    integers, floats, decimals, dates and timestamps are hashed from their bytes, booleans as a single byte and
+    strings and binaries from their contents. Floats that compare equal hash the same, and nulls hash to NULL_HASH.
+
+    Args:
+        obj (pa.ChunkedArray): values to hash
+
+    Returns:
+        pa.ChunkedArray: uint64 hashes of the values, without nulls
+    """
     cdef shared_ptr[CChunkedArray] carr = pyarrow_unwrap_chunked_array(obj)
     if carr.get() == NULL:
         raise TypeError("not a chunked array")
-    num_chunks: cython.int = carr.get().num_chunks()
-    cdef shared_ptr[CDataType] ctype = carr.get().type()
-    cdef Type type_id = ctype.get().id()
-    is_integer: cython.bool = False
-    is_string: cython.bool = False
-
-    if (Type._Type_UINT8 <= type_id) and (type_id <= Type._Type_INT64):
-        is_integer = True
-    elif type_id == Type._Type_STRING:
-        is_string = True
-    else:
-        raise TypeError('excepted integer or string got neither')
+    if pa.types.is_dictionary(obj.type):
+        obj = pa.chunked_array([chunk.dictionary_decode() for chunk in obj.chunks], type=obj.type.value_type)
+        carr = pyarrow_unwrap_chunked_array(obj)
+    layout, byte_width = _layout_of(obj.type)
 
+    num_chunks: cython.int = carr.get().num_chunks()
     cdef shared_ptr[CArray] arr
     cdef vector[shared_ptr[CArray]] hash_results
     for i in range(num_chunks):
         arr = carr.get().chunk(i)
-        if is_integer:
-            hash_results.push_back(_hash_integer_array(arr))
-        elif is_string:
-            hash_results.push_back(_hash_string_array(arr))
-
+        hash_results.push_back(_hash_array(arr, layout, byte_width))
 
     cdef shared_ptr[CChunkedArray] result = make_shared[CChunkedArray](hash_results, GetPrimitiveType(Type._Type_UINT64))
     return pyarrow_wrap_chunked_array(result)
+
+
+def hash_partition(columns, num_partitions):
+    """Hashes the rows of one or more columns and assigns each row to a partition by its hash, in a single pass over
+    the rows. Each column is hashed as in `hash_chunked_array`, and the hashes of a row are combined from left to right.
+
+    Args:
+        columns (List[pa.ChunkedArray]): columns to hash, which all have the same length
+        num_partitions (int): number of partitions to assign rows to
+
+    Returns:
+        Tuple[pa.UInt64Array, pa.Int64Array]: combined hash of each row, and its target partition in
+            [0, num_partitions)
+    """
+    if len(columns) == 0:
+        raise ValueError("expected at least one column to hash")
+    if num_partitions <= 0:
+        raise ValueError(f"expected a positive number of partitions, got {num_partitions}")
+    arrays = []
+    for column in columns:
+        arr = combine_chunks(column)
+        if pa.types.is_dictionary(arr.type):
+            arr = arr.dictionary_decode()
+        arrays.append(arr)
+    cdef stdint.int64_t length = len(arrays[0])
+    if any(len(arr) != length for arr in arrays):
+        raise ValueError("expected columns of the same length")
+
+    # The arrays are kept alive by `arrays` while the kernel reads their buffers
+    cdef vector[HashColumn] hash_columns
+    for arr in arrays:
+        layout, byte_width = _layout_of(arr.type)
+        hash_columns.push_back(_make_hash_column(pyarrow_unwrap_array(arr), layout, byte_width))
+
+    cdef stdint.uint64_t num_parts = num_partitions
+    cdef shared_ptr[CBuffer] hashes_buffer = _allocate_buffer(length)
+    cdef shared_ptr[CBuffer] targets_buffer = _allocate_buffer(length)
+    with nogil:
+        _hash_partition(
+            hash_columns,
+            length,
+            num_parts,
+            <stdint.uint64_t*> hashes_buffer.get().mutable_data(),
+            <stdint.int64_t*> targets_buffer.get().mutable_data(),
+        )
+    return (
+        pyarrow_wrap_array(_make_array(Type._Type_UINT64, hashes_buffer, length)),
+        pyarrow_wrap_array(_make_array(Type._Type_INT64, targets_buffer, length)),
+    )
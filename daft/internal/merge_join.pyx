@@ -0,0 +1,243 @@
+# distutils: language=c++
+
+from libc cimport stdint
+from libc.string cimport memcmp, memcpy
+from pyarrow.lib cimport (
+    AllocateBuffer,
+    CArray,
+    CArrayData,
+    CBuffer,
+    GetPrimitiveType,
+    GetResultValue,
+    MakeArray,
+    Type,
+    pyarrow_unwrap_array,
+    pyarrow_wrap_array,
+    shared_ptr,
+    to_shared,
+    vector,
+)
+
+import cython
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pac
+
+from daft.internal.arrow_utils import combine_chunks
+
+# Physical types that sorted keys are compared as
+DEF INT64_KEY = 0
+DEF UINT64_KEY = 1
+DEF DOUBLE_KEY = 2
+DEF BINARY_KEY = 3
+
+
+cdef struct SortedKey:
+    const stdint.uint8_t* data
+    const stdint.int64_t* offsets
+    stdint.int64_t offset
+    int kind
+
+
+def _merge_key_type(left_type: pa.DataType, right_type: pa.DataType):
+    """Returns the type that a pair of sorted key columns of the given types are compared as, which sorts in the same
+    order as they do, or None if there is no such type
+    """
+    if pa.types.is_dictionary(left_type):
+        left_type = left_type.value_type
+    if pa.types.is_dictionary(right_type):
+        right_type = right_type.value_type
+    key_types = (left_type, right_type)
+    if all(pa.types.is_string(t) or pa.types.is_large_string(t) for t in key_types):
+        return pa.large_string()
+    if all(pa.types.is_binary(t) or pa.types.is_large_binary(t) for t in key_types):
+        return pa.large_binary()
+    if all(pa.types.is_unsigned_integer(t) for t in key_types):
+        return pa.uint64()
+    if all(pa.types.is_integer(t) or pa.types.is_boolean(t) for t in key_types):
+        return pa.int64()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in key_types):
+        return pa.float64()
+    if left_type == right_type and pa.types.is_temporal(left_type) and left_type.bit_width in (32, 64):
+        return pa.int64()
+    return None
+
+
+def can_merge_join(left_type: pa.DataType, right_type: pa.DataType) -> bool:
+    """Returns whether sorted key columns of the given types can be merge joined by `merge_join_indices`"""
+    if pa.types.is_null(left_type) or pa.types.is_null(right_type):
+        return True
+    return _merge_key_type(left_type, right_type) is not None
+
+
+def _unify_key_types(left: pa.Array, right: pa.Array):
+    """Casts a pair of sorted key columns to a common type that is compared in the same order as their sort"""
+    key_type = _merge_key_type(left.type, right.type)
+    if key_type is None:
+        raise TypeError(f"cannot merge join on keys of type {left.type} and {right.type}")
+    if pa.types.is_dictionary(left.type):
+        left = left.dictionary_decode()
+    if pa.types.is_dictionary(right.type):
+        right = right.dictionary_decode()
+    if pa.types.is_temporal(left.type):
+        # Temporal values are compared as the integers they are stored as
+        physical_type = pa.int64() if left.type.bit_width == 64 else pa.int32()
+        return left.view(physical_type).cast(key_type), right.view(physical_type).cast(key_type)
+    return left.cast(key_type), right.cast(key_type)
+
+
+def _drop_invalid(key: pa.Array):
+    """Drops the nulls and NaNs of a sorted key column, which never match, and returns the remaining keys with the
+    indices of their rows, which are None if no rows are dropped
+    """
+    valid = pac.is_valid(key)
+    if pa.types.is_floating(key.type):
+        valid = pac.and_kleene(valid, pac.invert(pac.is_nan(key)))
+    if pac.all(valid).as_py() is not False:
+        return key, None
+    indices = np.flatnonzero(valid.to_numpy(zero_copy_only=False))
+    return key.filter(valid), indices
+
+
+cdef SortedKey _make_sorted_key(key: pa.Array) except *:
+    cdef shared_ptr[CArray] arr = pyarrow_unwrap_array(key)
+    cdef CArrayData* array_data = arr.get().data().get()
+    cdef vector[shared_ptr[CBuffer]] buffers = array_data.buffers
+    cdef SortedKey sorted_key
+    sorted_key.data = NULL
+    sorted_key.offsets = NULL
+    sorted_key.offset = array_data.offset
+    if pa.types.is_large_string(key.type) or pa.types.is_large_binary(key.type):
+        sorted_key.kind = BINARY_KEY
+        sorted_key.offsets = <const stdint.int64_t*> buffers.at(1).get().data()
+        # The data buffer is absent if every value is empty
+        if buffers.at(2).get() != NULL:
+            sorted_key.data = buffers.at(2).get().data()
+    else:
+        sorted_key.kind = UINT64_KEY if key.type == pa.uint64() else DOUBLE_KEY if key.type == pa.float64() else INT64_KEY
+        sorted_key.data = buffers.at(1).get().data()
+    return sorted_key
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline int _compare(const SortedKey* left, stdint.int64_t i, const SortedKey* right, stdint.int64_t j) nogil:
+    """Compares the keys of two rows, returning a negative number, zero or a positive number as in memcmp"""
+    cdef stdint.int64_t left_idx = i + left.offset
+    cdef stdint.int64_t right_idx = j + right.offset
+    cdef stdint.int64_t left_start, left_length, right_start, right_length
+    cdef int result
+    if left.kind == INT64_KEY:
+        return ((<const stdint.int64_t*> left.data)[left_idx] > (<const stdint.int64_t*> right.data)[right_idx]) - (
+            (<const stdint.int64_t*> left.data)[left_idx] < (<const stdint.int64_t*> right.data)[right_idx]
+        )
+    if left.kind == UINT64_KEY:
+        return ((<const stdint.uint64_t*> left.data)[left_idx] > (<const stdint.uint64_t*> right.data)[right_idx]) - (
+            (<const stdint.uint64_t*> left.data)[left_idx] < (<const stdint.uint64_t*> right.data)[right_idx]
+        )
+    if left.kind == DOUBLE_KEY:
+        return ((<const double*> left.data)[left_idx] > (<const double*> right.data)[right_idx]) - (
+            (<const double*> left.data)[left_idx] < (<const double*> right.data)[right_idx]
+        )
+    left_start = left.offsets[left_idx]
+    left_length = left.offsets[left_idx + 1] - left_start
+    right_start = right.offsets[right_idx]
+    right_length = right.offsets[right_idx + 1] - right_start
+    if left_length > 0 and right_length > 0:
+        result = memcmp(left.data + left_start, right.data + right_start, min(left_length, right_length))
+        if result != 0:
+            return result
+    return (left_length > right_length) - (left_length < right_length)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _merge_join(
+    const SortedKey* left,
+    stdint.int64_t num_left_rows,
+    const SortedKey* right,
+    stdint.int64_t num_right_rows,
+    bint desc,
+    vector[stdint.int64_t]& left_indices,
+    vector[stdint.int64_t]& right_indices,
+) nogil:
+    cdef stdint.int64_t i = 0, j = 0, run_end, k
+    cdef int order = -1 if desc else 1
+    cdef int result
+    while i < num_left_rows and j < num_right_rows:
+        result = order * _compare(left, i, right, j)
+        if result < 0:
+            i += 1
+        elif result > 0:
+            j += 1
+        else:
+            # Every left row with the key matches the run of right rows with the key
+            run_end = j + 1
+            while run_end < num_right_rows and _compare(left, i, right, run_end) == 0:
+                run_end += 1
+            while i < num_left_rows and _compare(left, i, right, j) == 0:
+                for k in range(j, run_end):
+                    left_indices.push_back(i)
+                    right_indices.push_back(k)
+                i += 1
+            j = run_end
+
+
+cdef object _to_index_array(const vector[stdint.int64_t]& indices):
+    cdef stdint.int64_t length = indices.size()
+    cdef shared_ptr[CBuffer] result_buffer = to_shared(
+        GetResultValue(AllocateBuffer(length * cython.sizeof(stdint.int64_t), NULL))
+    )
+    if length > 0:
+        memcpy(result_buffer.get().mutable_data(), indices.data(), length * cython.sizeof(stdint.int64_t))
+
+    cdef vector[shared_ptr[CBuffer]] result_buffer_vector
+    result_buffer_vector.push_back(shared_ptr[CBuffer]())
+    result_buffer_vector.push_back(result_buffer)
+    cdef shared_ptr[CArrayData] result_array_data = CArrayData.Make(
+        GetPrimitiveType(Type._Type_INT64),
+        length,
+        result_buffer_vector,
+        0,
+        0,
+    )
+    return pyarrow_wrap_array(MakeArray(result_array_data))
+
+
+def merge_join_indices(left_key, right_key, desc=False):
+    """Computes the rows of an inner equi-join between two key columns that are both sorted in the same direction,
+    by scanning them in lockstep without building a hash table. Keys that are null or NaN never match.
+
+    Args:
+        left_key: sorted key column of the left side, as an Arrow Array or ChunkedArray
+        right_key: sorted key column of the right side
+        desc (bool): whether the keys are sorted in descending order. Defaults to False.
+
+    Returns:
+        Tuple[pa.Int64Array, pa.Int64Array]: indices of the left and right rows of each pair of matching rows, in the
+            order of the left rows
+    """
+    left_key, right_key = combine_chunks(left_key), combine_chunks(right_key)
+    if pa.types.is_null(left_key.type) or pa.types.is_null(right_key.type):
+        # Keys that are all null never match
+        return pa.array([], type=pa.int64()), pa.array([], type=pa.int64())
+    left_key, right_key = _unify_key_types(left_key, right_key)
+    left_key, left_rows = _drop_invalid(left_key)
+    right_key, right_rows = _drop_invalid(right_key)
+
+    cdef SortedKey left = _make_sorted_key(left_key)
+    cdef SortedKey right = _make_sorted_key(right_key)
+    cdef stdint.int64_t num_left_rows = len(left_key)
+    cdef stdint.int64_t num_right_rows = len(right_key)
+    cdef bint is_desc = desc
+    cdef vector[stdint.int64_t] left_indices, right_indices
+    with nogil:
+        _merge_join(&left, num_left_rows, &right, num_right_rows, is_desc, left_indices, right_indices)
+
+    left_index, right_index = _to_index_array(left_indices), _to_index_array(right_indices)
+    # Map the indices of the remaining keys back to the rows of the original keys
+    if left_rows is not None:
+        left_index = pa.array(left_rows[left_index.to_numpy()], type=pa.int64())
+    if right_rows is not None:
+        right_index = pa.array(right_rows[right_index.to_numpy()], type=pa.int64())
+    return left_index, right_index
@@ -0,0 +1,432 @@
+# distutils: language=c++
+
+from libc cimport math, stdint
+from libcpp.vector cimport vector
+
+import cython
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pac
+
+from daft.internal.arrow_utils import combine_chunks
+from daft.internal.hashing import hash_chunked_array
+
+# Number of bits of a hash that select a HyperLogLog register, which gives 4096 one-byte registers per sketch and a
+# standard error of about 1.6%
+DEF HLL_PRECISION = 12
+DEF HLL_NUM_REGISTERS = 1 << HLL_PRECISION
+
+# Compression of t-digests, which bounds a digest to about a hundred centroids, or less than 2KB
+DEF TDIGEST_COMPRESSION = 200.0
+
+# Sketches of both kinds are stored as Arrow binary values
+SKETCH_TYPE = pa.binary()
+
+
+def _group_ids(group_ids, length, num_groups):
+    """Returns the group of each of `length` rows as a NumPy array, putting every row in the same group if `group_ids`
+    is None
+    """
+    if group_ids is None:
+        return np.zeros(length, dtype=np.int64)
+    group_ids = np.ascontiguousarray(group_ids, dtype=np.int64)
+    if len(group_ids) != length:
+        raise ValueError("expected a group for each row")
+    if length > 0 and (group_ids.min() < 0 or group_ids.max() >= num_groups):
+        raise ValueError(f"groups must be in the range [0, {num_groups})")
+    return group_ids
+
+
+def _values_by_group(values, group_ids, num_groups):
+    """Drops the nulls of `values`, and the NaNs of floating point values, returning the remaining values with their
+    groups
+    """
+    values = combine_chunks(values)
+    group_ids = _group_ids(group_ids, len(values), num_groups)
+    if pa.types.is_floating(values.type):
+        valid = pac.invert(pac.is_nan(values)).fill_null(False)
+    else:
+        valid = pac.is_valid(values)
+    if pac.all(valid).as_py() is False:
+        values = values.filter(valid)
+        group_ids = np.ascontiguousarray(group_ids[valid.to_numpy(zero_copy_only=False)])
+    return values, group_ids
+
+
+def _binary_values(binary_array):
+    """Returns the offsets and data buffers of an array of sketches as NumPy arrays"""
+    binary_array = combine_chunks(binary_array)
+    if pa.types.is_large_binary(binary_array.type):
+        binary_array = binary_array.cast(SKETCH_TYPE)
+    if binary_array.type != SKETCH_TYPE:
+        raise TypeError(f"expected sketches of type {SKETCH_TYPE}, got {binary_array.type}")
+    if binary_array.null_count > 0:
+        raise ValueError("sketches cannot be null")
+    if len(binary_array) == 0:
+        return binary_array, np.zeros(1, dtype=np.int32), np.zeros(0, dtype=np.uint8)
+    offsets = np.frombuffer(binary_array.buffers()[1], dtype=np.int32)[
+        binary_array.offset : binary_array.offset + len(binary_array) + 1
+    ]
+    data_buffer = binary_array.buffers()[2]
+    data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None else np.zeros(0, dtype=np.uint8)
+    return binary_array, offsets, data
+
+
+# HyperLogLog
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _hll_add(
+    const stdint.uint64_t[::1] hashes,
+    const stdint.int64_t[::1] group_ids,
+    stdint.uint8_t[:, ::1] registers,
+) nogil:
+    cdef stdint.int64_t i
+    cdef stdint.uint64_t h, rest
+    cdef stdint.uint8_t rank
+    cdef int register
+    for i in range(hashes.shape[0]):
+        h = hashes[i]
+        register = h >> (64 - HLL_PRECISION)
+        # The rank is the position of the first set bit of the remaining bits
+        rest = h << HLL_PRECISION
+        rank = 1
+        while rank <= 64 - HLL_PRECISION and (rest & (<stdint.uint64_t> 1 << 63)) == 0:
+            rank += 1
+            rest <<= 1
+        if rank > registers[group_ids[i], register]:
+            registers[group_ids[i], register] = rank
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _hll_merge(
+    const stdint.uint8_t[:, ::1] sketches,
+    const stdint.int64_t[::1] group_ids,
+    stdint.uint8_t[:, ::1] registers,
+) nogil:
+    cdef stdint.int64_t i
+    cdef int j
+    for i in range(sketches.shape[0]):
+        for j in range(HLL_NUM_REGISTERS):
+            if sketches[i, j] > registers[group_ids[i], j]:
+                registers[group_ids[i], j] = sketches[i, j]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _hll_cardinality(const stdint.uint8_t[:, ::1] sketches, stdint.int64_t[::1] cardinalities) nogil:
+    cdef double m = HLL_NUM_REGISTERS
+    cdef double alpha = 0.7213 / (1.0 + 1.079 / m)
+    cdef double inverse_sum, estimate
+    cdef stdint.int64_t i, num_zeros
+    cdef int j
+    for i in range(sketches.shape[0]):
+        inverse_sum = 0.0
+        num_zeros = 0
+        for j in range(HLL_NUM_REGISTERS):
+            inverse_sum += math.ldexp(1.0, -sketches[i, j])
+            if sketches[i, j] == 0:
+                num_zeros += 1
+        estimate = alpha * m * m / inverse_sum
+        # Small cardinalities are estimated more accurately by counting the empty registers
+        if estimate <= 2.5 * m and num_zeros > 0:
+            estimate = m * math.log(m / num_zeros)
+        cardinalities[i] = <stdint.int64_t> math.llround(estimate)
+
+
+def _hll_sketch_array(registers):
+    offsets = np.arange(len(registers) + 1, dtype=np.int32) * HLL_NUM_REGISTERS
+    return pa.BinaryArray.from_buffers(
+        SKETCH_TYPE, len(registers), [None, pa.py_buffer(offsets), pa.py_buffer(registers)]
+    )
+
+
+def _hll_registers(sketches):
+    sketches, offsets, data = _binary_values(sketches)
+    if np.any(np.diff(offsets) != HLL_NUM_REGISTERS):
+        raise ValueError(f"expected HyperLogLog sketches of {HLL_NUM_REGISTERS} bytes")
+    return np.ascontiguousarray(data[offsets[0] : offsets[-1]]).reshape(len(sketches), HLL_NUM_REGISTERS)
+
+
+def hll_sketch(values, group_ids, num_groups):
+    """Builds a HyperLogLog sketch of the distinct values of each group. Values are hashed as in
+    `hash_chunked_array`, and nulls are not counted.
+
+    Args:
+        values: values to sketch, as an Arrow Array or ChunkedArray
+        group_ids (Optional[np.ndarray]): group of each value, in [0, num_groups), or None if all values are in the
+            same group
+        num_groups (int): number of groups
+
+    Returns:
+        pa.BinaryArray: registers of the sketch of each group
+    """
+    values, group_ids = _values_by_group(values, group_ids, num_groups)
+    hashes = hash_chunked_array(pa.chunked_array([values])).combine_chunks().to_numpy()
+    registers = np.zeros((num_groups, HLL_NUM_REGISTERS), dtype=np.uint8)
+    cdef const stdint.uint64_t[::1] hashes_view = hashes
+    cdef const stdint.int64_t[::1] group_ids_view = group_ids
+    cdef stdint.uint8_t[:, ::1] registers_view = registers
+    with nogil:
+        _hll_add(hashes_view, group_ids_view, registers_view)
+    return _hll_sketch_array(registers)
+
+
+def hll_merge(sketches, group_ids, num_groups):
+    """Merges the HyperLogLog sketches of each group into one sketch, which is the sketch of all of their values.
+
+    Args:
+        sketches: sketches built by `hll_sketch`
+        group_ids (Optional[np.ndarray]): group of each sketch, or None if all sketches are merged into one
+        num_groups (int): number of groups
+
+    Returns:
+        pa.BinaryArray: registers of the merged sketch of each group
+    """
+    sketch_registers = _hll_registers(sketches)
+    group_ids = _group_ids(group_ids, len(sketch_registers), num_groups)
+    registers = np.zeros((num_groups, HLL_NUM_REGISTERS), dtype=np.uint8)
+    cdef const stdint.uint8_t[:, ::1] sketches_view = sketch_registers
+    cdef const stdint.int64_t[::1] group_ids_view = group_ids
+    cdef stdint.uint8_t[:, ::1] registers_view = registers
+    with nogil:
+        _hll_merge(sketches_view, group_ids_view, registers_view)
+    return _hll_sketch_array(registers)
+
+
+def hll_cardinality(sketches):
+    """Estimates the number of distinct values of each HyperLogLog sketch.
+
+    Args:
+        sketches: sketches built by `hll_sketch` or `hll_merge`
+
+    Returns:
+        pa.Int64Array: estimated number of distinct values of each sketch
+    """
+    registers = _hll_registers(sketches)
+    cardinalities = np.zeros(len(registers), dtype=np.int64)
+    cdef const stdint.uint8_t[:, ::1] registers_view = registers
+    cdef stdint.int64_t[::1] cardinalities_view = cardinalities
+    with nogil:
+        _hll_cardinality(registers_view, cardinalities_view)
+    return pa.array(cardinalities)
+
+
+# t-digest
+#
+# A digest is serialized as float64 values: the minimum and maximum values, followed by the mean and weight of each
+# centroid in the order of their means. The digest of a group without values is empty.
+
+
+cdef inline double _k_scale(double q) nogil:
+    return TDIGEST_COMPRESSION / (2 * math.M_PI) * math.asin(2 * q - 1)
+
+
+cdef inline double _q_limit(double q) nogil:
+    """Returns the largest quantile that a centroid starting at quantile `q` can grow to"""
+    cdef double k = _k_scale(q) + 1
+    if k >= TDIGEST_COMPRESSION / 4:
+        return 1.0
+    return (math.sin(k * 2 * math.M_PI / TDIGEST_COMPRESSION) + 1) / 2
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _compress(
+    const double[::1] means,
+    const double[::1] weights,
+    stdint.int64_t start,
+    stdint.int64_t end,
+    double minimum,
+    double maximum,
+    vector[double]& digest,
+) nogil:
+    """Merges the centroids in [start, end), which are sorted by their means, into as few centroids as the scale
+    function allows, and appends the digest of them
+    """
+    cdef double total_weight = 0, weight_so_far = 0, q_limit, mean, weight
+    cdef stdint.int64_t i
+    if start == end:
+        return
+    for i in range(start, end):
+        total_weight += weights[i]
+    digest.push_back(minimum)
+    digest.push_back(maximum)
+    q_limit = _q_limit(0)
+    mean = means[start]
+    weight = weights[start]
+    for i in range(start + 1, end):
+        if (weight_so_far + weight + weights[i]) / total_weight <= q_limit:
+            weight += weights[i]
+            mean += (means[i] - mean) * weights[i] / weight
+        else:
+            digest.push_back(mean)
+            digest.push_back(weight)
+            weight_so_far += weight
+            q_limit = _q_limit(weight_so_far / total_weight)
+            mean = means[i]
+            weight = weights[i]
+    digest.push_back(mean)
+    digest.push_back(weight)
+
+
+def _compress_groups(means, weights, minimums, maximums, group_ids, num_groups):
+    """Builds the digest of each group from centroids, which are sorted by their group and then their mean"""
+    group_offsets = np.zeros(num_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(group_ids, minlength=num_groups), out=group_offsets[1:])
+    cdef const double[::1] means_view = means
+    cdef const double[::1] weights_view = weights
+    cdef const double[::1] minimums_view = minimums
+    cdef const double[::1] maximums_view = maximums
+    cdef const stdint.int64_t[::1] group_offsets_view = group_offsets
+    cdef vector[double] digests
+    offsets = np.zeros(num_groups + 1, dtype=np.int32)
+    cdef stdint.int32_t[::1] offsets_view = offsets
+    cdef stdint.int64_t group, num_groups_c = num_groups
+    with nogil:
+        for group in range(num_groups_c):
+            _compress(
+                means_view,
+                weights_view,
+                group_offsets_view[group],
+                group_offsets_view[group + 1],
+                minimums_view[group],
+                maximums_view[group],
+                digests,
+            )
+            offsets_view[group + 1] = digests.size() * sizeof(double)
+    data = np.asarray(<double[:digests.size()]> digests.data()).copy() if digests.size() > 0 else np.zeros(0)
+    return pa.BinaryArray.from_buffers(
+        SKETCH_TYPE, num_groups, [None, pa.py_buffer(offsets), pa.py_buffer(data)]
+    )
+
+
+def _min_max_by_group(values, group_ids, num_groups):
+    minimums = np.full(num_groups, np.inf)
+    maximums = np.full(num_groups, -np.inf)
+    np.minimum.at(minimums, group_ids, values)
+    np.maximum.at(maximums, group_ids, values)
+    return minimums, maximums
+
+
+def tdigest_sketch(values, group_ids, num_groups):
+    """Builds a t-digest of the numeric values of each group, which estimates their quantiles. Nulls and NaNs are
+    ignored.
+
+    Args:
+        values: numeric values to sketch, as an Arrow Array or ChunkedArray
+        group_ids (Optional[np.ndarray]): group of each value, in [0, num_groups), or None if all values are in the
+            same group
+        num_groups (int): number of groups
+
+    Returns:
+        pa.BinaryArray: serialized digest of each group
+    """
+    values, group_ids = _values_by_group(values, group_ids, num_groups)
+    values = values.cast(pa.float64()).to_numpy(zero_copy_only=False)
+    order = np.lexsort((values, group_ids))
+    means = np.ascontiguousarray(values[order])
+    group_ids = np.ascontiguousarray(group_ids[order])
+    minimums, maximums = _min_max_by_group(means, group_ids, num_groups)
+    return _compress_groups(means, np.ones(len(means)), minimums, maximums, group_ids, num_groups)
+
+
+def tdigest_merge(digests, group_ids, num_groups):
+    """Merges the t-digests of each group into one digest, which is the digest of all of their values.
+
+    Args:
+        digests: digests built by `tdigest_sketch`
+        group_ids (Optional[np.ndarray]): group of each digest, or None if all digests are merged into one
+        num_groups (int): number of groups
+
+    Returns:
+        pa.BinaryArray: serialized merged digest of each group
+    """
+    digests, offsets, data = _binary_values(digests)
+    group_ids = _group_ids(group_ids, len(digests), num_groups)
+    values = np.ascontiguousarray(data[offsets[0] : offsets[-1]]).view(np.float64)
+    sizes = np.diff(offsets) // 8
+    starts = (offsets[:-1] - offsets[0]) // 8
+    non_empty = sizes > 0
+
+    # Each digest starts with its minimum and maximum, followed by pairs of the means and weights of its centroids
+    minimums, _ = _min_max_by_group(values[starts[non_empty]], group_ids[non_empty], num_groups)
+    _, maximums = _min_max_by_group(values[starts[non_empty] + 1], group_ids[non_empty], num_groups)
+    num_centroids = np.where(non_empty, (sizes - 2) // 2, 0)
+    digest_of_centroid = np.repeat(np.arange(len(digests)), num_centroids)
+    centroid_positions = (
+        np.repeat(starts + 2, num_centroids)
+        + 2 * (np.arange(len(digest_of_centroid)) - np.repeat(np.cumsum(num_centroids) - num_centroids, num_centroids))
+    )
+    means = values[centroid_positions]
+    weights = values[centroid_positions + 1]
+    centroid_groups = group_ids[digest_of_centroid]
+    order = np.lexsort((means, centroid_groups))
+    return _compress_groups(
+        np.ascontiguousarray(means[order]),
+        np.ascontiguousarray(weights[order]),
+        minimums,
+        maximums,
+        np.ascontiguousarray(centroid_groups[order]),
+        num_groups,
+    )
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _quantile(const double[::1] digest, stdint.int64_t start, stdint.int64_t end, double q) nogil:
+    """Estimates a quantile of a digest by interpolating between the centers of its centroids"""
+    cdef double minimum = digest[start], maximum = digest[start + 1]
+    cdef stdint.int64_t num_centroids = (end - start - 2) // 2
+    cdef stdint.int64_t i
+    cdef double total_weight = 0, target, center, next_center, mean, weight, next_mean, next_weight
+    for i in range(num_centroids):
+        total_weight += digest[start + 3 + 2 * i]
+    target = q * total_weight
+    mean = digest[start + 2]
+    weight = digest[start + 3]
+    center = weight / 2
+    if num_centroids == 1:
+        return minimum + (maximum - minimum) * q
+    if target <= center:
+        return minimum + (mean - minimum) * target / center
+    for i in range(num_centroids - 1):
+        next_mean = digest[start + 4 + 2 * i]
+        next_weight = digest[start + 5 + 2 * i]
+        next_center = center + weight / 2 + next_weight / 2
+        if target <= next_center:
+            return mean + (next_mean - mean) * (target - center) / (next_center - center)
+        mean, weight, center = next_mean, next_weight, next_center
+    return mean + (maximum - mean) * min((target - center) / (total_weight - center), 1.0)
+
+
+def tdigest_quantile(digests, q):
+    """Estimates the quantile `q` of each t-digest.
+
+    Args:
+        digests: digests built by `tdigest_sketch` or `tdigest_merge`
+        q (float): quantile to estimate, in [0, 1]
+
+    Returns:
+        pa.DoubleArray: estimated quantile of each digest, which is null if the digest has no values
+    """
+    if not 0 <= q <= 1:
+        raise ValueError(f"quantile must be in [0, 1], got {q}")
+    digests, offsets, data = _binary_values(digests)
+    values = np.ascontiguousarray(data[offsets[0] : offsets[-1]]).view(np.float64)
+    starts = (offsets[:-1] - offsets[0]) // 8
+    ends = (offsets[1:] - offsets[0]) // 8
+    quantiles = np.zeros(len(digests), dtype=np.float64)
+    cdef const double[::1] values_view = values
+    cdef double[::1] quantiles_view = quantiles
+    cdef const stdint.int32_t[::1] starts_view = starts.astype(np.int32)
+    cdef const stdint.int32_t[::1] ends_view = ends.astype(np.int32)
+    cdef double q_c = q
+    cdef stdint.int64_t i
+    with nogil:
+        for i in range(quantiles_view.shape[0]):
+            if ends_view[i] > starts_view[i]:
+                quantiles_view[i] = _quantile(values_view, starts_view[i], ends_view[i], q_c)
+    return pa.array(quantiles, mask=ends == starts)
@@ -6,7 +6,16 @@ from dataclasses import dataclass
 from enum import Enum, IntEnum
 from typing import Any, List, Optional, Tuple
 
-from daft.datasources import SourceInfo
+from daft.config import DaftSettings
+from daft.datasources import (
+    CSVSourceInfo,
+    InMemorySourceInfo,
+    IPCSourceInfo,
+    JSONSourceInfo,
+    ParquetSourceInfo,
+    ScanType,
+    SourceInfo,
+)
 from daft.execution.operators import ExpressionType
 from daft.expressions import ColumnExpression, Expression
 from daft.internal.treenode import TreeNode
@@ -87,7 +96,7 @@ class LogicalPlan(TreeNode["LogicalPlan"]):
 
 class UnaryNode(LogicalPlan):
     @abstractmethod
-    def copy_with_new_input(self, new_input: UnaryNode) -> UnaryNode:
+    def copy_with_new_input(self, new_input: LogicalPlan) -> UnaryNode:
         raise NotImplementedError()
 
 
@@ -103,6 +112,7 @@ class Scan(LogicalPlan):
         source_info: SourceInfo,
         predicate: Optional[ExpressionList] = None,
         columns: Optional[List[str]] = None,
+        limit: Optional[int] = None,
     ) -> None:
         schema = schema.resolve()
         pspec = PartitionSpec(scheme=PartitionScheme.UNKNOWN, num_partitions=source_info.get_num_partitions())
@@ -121,12 +131,15 @@ class Scan(LogicalPlan):
         self._column_names = columns
         self._columns = self._schema
         self._source_info = source_info
+        # Maximum number of rows that each partition of the Scan reads, after its predicate is applied
+        self._limit = limit
 
     def schema(self) -> ExpressionList:
         return self._output_schema
 
     def __repr__(self) -> str:
-        return f"Scan\n\toutput={self.schema()}\n\tpredicate={self._predicate}\n\tcolumns={self._columns}\n\t{self._source_info}"
+        limit = f"\n\tlimit={self._limit}" if self._limit is not None else ""
+        return f"Scan\n\toutput={self.schema()}\n\tpredicate={self._predicate}\n\tcolumns={self._columns}{limit}\n\t{self._source_info}"
 
     def resource_request(self) -> ResourceRequest:
         return ResourceRequest.default()
@@ -141,17 +154,89 @@ class Scan(LogicalPlan):
             and self._predicate == other._predicate
             and self._columns == other._columns
             and self._source_info == other._source_info
+            and self._limit == other._limit
         )
 
     def rebuild(self) -> LogicalPlan:
         return Scan(
-            schema=self.schema().unresolve(),
+            schema=self._schema.unresolve(),
             source_info=self._source_info,
             predicate=self._predicate.unresolve() if self._predicate is not None else None,
             columns=self._column_names,
+            limit=self._limit,
         )
 
 
+class FileWrite(UnaryNode):
+    """Writes each partition to files, outputting a row with the path, number of rows, size and column
+    statistics of every file that was written
+    """
+
+    def __init__(
+        self,
+        input: LogicalPlan,
+        storage_type: ScanType,
+        root_dir: str,
+        partition_cols: Optional[List[str]] = None,
+        target_file_size: int = 512 * 1024 * 1024,
+    ) -> None:
+        schema = ExpressionList(
+            [
+                ColumnExpression("path", expr_type=ExpressionType.from_py_type(str)),
+                ColumnExpression("num_rows", expr_type=ExpressionType.from_py_type(int)),
+                ColumnExpression("size_bytes", expr_type=ExpressionType.from_py_type(int)),
+                ColumnExpression("column_stats", expr_type=ExpressionType.from_py_type(dict)),
+            ]
+        ).resolve()
+        super().__init__(schema, partition_spec=input.partition_spec(), op_level=OpLevel.PARTITION)
+        self._register_child(input)
+        if storage_type not in (ScanType.CSV, ScanType.PARQUET, ScanType.IPC):
+            raise NotImplementedError(f"Writing {storage_type} files is not implemented")
+        self._storage_type = storage_type
+        self._root_dir = root_dir
+        self._partition_cols = partition_cols if partition_cols is not None else []
+        for name in self._partition_cols:
+            if name not in input.schema().names:
+                raise ValueError(f"Partition column {name} not found in {input.schema().names}")
+        if len(self._partition_cols) == len(input.schema()):
+            raise ValueError("At least one column has to be written to the files that is not a partition column")
+        self._target_file_size = target_file_size
+
+    def __repr__(self) -> str:
+        return (
+            f"FileWrite\n\toutput={self.schema()}\n\tstorage_type={self._storage_type}\n\troot_dir={self._root_dir}"
+            f"\n\tpartition_cols={self._partition_cols}"
+        )
+
+    def resource_request(self) -> ResourceRequest:
+        return ResourceRequest.default()
+
+    def required_columns(self) -> ExpressionList:
+        return self._children()[0].schema().to_column_expressions()
+
+    def _local_eq(self, other: Any) -> bool:
+        return (
+            isinstance(other, FileWrite)
+            and self.schema() == other.schema()
+            and self._storage_type == other._storage_type
+            and self._root_dir == other._root_dir
+            and self._partition_cols == other._partition_cols
+            and self._target_file_size == other._target_file_size
+        )
+
+    def copy_with_new_input(self, new_input: LogicalPlan) -> FileWrite:
+        return FileWrite(
+            new_input,
+            storage_type=self._storage_type,
+            root_dir=self._root_dir,
+            partition_cols=self._partition_cols,
+            target_file_size=self._target_file_size,
+        )
+
+    def rebuild(self) -> LogicalPlan:
+        return self.copy_with_new_input(self._children()[0].rebuild())
+
+
 class Filter(UnaryNode):
     """Which rows to keep"""
 
@@ -181,7 +266,7 @@ class Filter(UnaryNode):
         return isinstance(other, Filter) and self.schema() == other.schema() and self._predicate == other._predicate
 
     def copy_with_new_input(self, new_input: LogicalPlan) -> Filter:
-        raise NotImplementedError()
+        return Filter(new_input, self._predicate)
 
     def rebuild(self) -> LogicalPlan:
         return Filter(input=self._children()[0].rebuild(), predicate=self._predicate.unresolve())
@@ -219,12 +304,14 @@ class Projection(UnaryNode):
 
 class Sort(UnaryNode):
     def __init__(self, input: LogicalPlan, sort_by: ExpressionList, desc: bool = False) -> None:
-        pspec = PartitionSpec(scheme=PartitionScheme.RANGE, num_partitions=input.num_partitions(), by=sort_by)
-        super().__init__(input.schema().to_column_expressions(), partition_spec=pspec, op_level=OpLevel.GLOBAL)
-        self._register_child(input)
         assert len(sort_by.exprs) == 1, "we can only sort with 1 expression"
         self._sort_by = sort_by.resolve(input_schema=input.schema())
         self._desc = desc
+        pspec = PartitionSpec(
+            scheme=PartitionScheme.RANGE, num_partitions=input.num_partitions(), by=self._sort_by, desc=desc
+        )
+        super().__init__(input.schema().to_column_expressions(), partition_spec=pspec, op_level=OpLevel.GLOBAL)
+        self._register_child(input)
 
     def __repr__(self) -> str:
         return f"Sort\n\toutput={self.schema()}\n\tsort_by={self._sort_by}\n\tdesc={self._desc}"
@@ -263,10 +350,10 @@ class LocalLimit(UnaryNode):
         return ResourceRequest.default()
 
     def copy_with_new_input(self, new_input: LogicalPlan) -> LocalLimit:
-        raise NotImplementedError()
+        return LocalLimit(new_input, num=self._num)
 
     def required_columns(self) -> ExpressionList:
-        raise NotImplementedError()
+        return ExpressionList([])
 
     def _local_eq(self, other: Any) -> bool:
         return isinstance(other, LocalLimit) and self.schema() == other.schema() and self._num == self._num
@@ -288,10 +375,10 @@ class GlobalLimit(UnaryNode):
         return ResourceRequest.default()
 
     def copy_with_new_input(self, new_input: LogicalPlan) -> GlobalLimit:
-        raise NotImplementedError()
+        return GlobalLimit(new_input, num=self._num)
 
     def required_columns(self) -> ExpressionList:
-        raise NotImplementedError()
+        return ExpressionList([])
 
     def _local_eq(self, other: Any) -> bool:
         return isinstance(other, GlobalLimit) and self.schema() == other.schema() and self._num == self._num
@@ -312,6 +399,8 @@ class PartitionSpec:
     scheme: PartitionScheme
     num_partitions: int
     by: Optional[ExpressionList] = None
+    # Whether the ranges of a RANGE partitioning are in descending order, where each partition is sorted in that order
+    desc: bool = False
 
 
 class Repartition(UnaryNode):
@@ -346,7 +435,7 @@ class Repartition(UnaryNode):
         )
 
     def required_columns(self) -> ExpressionList:
-        raise NotImplementedError()
+        return self._partition_by.required_columns()
 
     def _local_eq(self, other: Any) -> bool:
         return (
@@ -391,7 +480,7 @@ class Coalesce(UnaryNode):
         )
 
     def required_columns(self) -> ExpressionList:
-        raise NotImplementedError()
+        return ExpressionList([])
 
     def _local_eq(self, other: Any) -> bool:
         return (
@@ -438,10 +527,13 @@ class LocalAggregate(UnaryNode):
         return req
 
     def copy_with_new_input(self, new_input: LogicalPlan) -> LocalAggregate:
-        raise NotImplementedError()
+        return LocalAggregate(new_input, agg=self._agg, group_by=self._group_by)
 
     def required_columns(self) -> ExpressionList:
-        raise NotImplementedError()
+        required = ExpressionList([e for e, _ in self._agg]).required_columns()
+        if self._group_by is not None:
+            required = self._group_by.required_columns().union(required)
+        return required
 
     def _local_eq(self, other: Any) -> bool:
         return (
@@ -519,12 +611,74 @@ class HTTPResponse(UnaryNode):
         )
 
 
+def estimate_size_bytes(plan: LogicalPlan) -> Optional[int]:
+    """Estimates the size of the output of a plan without executing it, which is possible for a Scan of in-memory data
+    or of files of a known size, followed by nodes that do not add rows. The estimate is an upper bound, scaled by
+    the fraction of the Scan's columns that are in the output.
+
+    Args:
+        plan (LogicalPlan): plan to estimate the size of
+
+    Returns:
+        Optional[int]: estimated size of the plan's output in bytes, or None if it cannot be estimated
+    """
+    num_columns = len(plan.schema())
+    while not isinstance(plan, Scan):
+        if not isinstance(plan, (Filter, Projection, LocalLimit, GlobalLimit, Sort, Repartition, Coalesce)):
+            return None
+        plan = plan._children()[0]
+    source_info = plan._source_info
+    size_bytes: Optional[int] = None
+    if isinstance(source_info, InMemorySourceInfo):
+        # The size of columns of Python objects is unknown
+        size_bytes = source_info.table.nbytes if len(source_info.py_columns) == 0 else None
+    elif isinstance(source_info, (CSVSourceInfo, JSONSourceInfo, ParquetSourceInfo, IPCSourceInfo)):
+        size_bytes = source_info.size_bytes
+    if size_bytes is None or len(plan._schema) == 0:
+        return size_bytes
+    return size_bytes * min(num_columns, len(plan._schema)) // len(plan._schema)
+
+
 class JoinType(Enum):
     INNER = "inner"
     LEFT = "left"
     RIGHT = "right"
 
 
+class JoinStrategy(Enum):
+    # Both sides are repartitioned by the hash of their keys, and each pair of partitions is joined
+    HASH = "hash"
+    # One side is gathered into a single partition that is joined with every partition of the other side
+    BROADCAST = "broadcast"
+    # Both sides are RANGE partitioned and sorted by their keys, and each partition of the left side is merge joined
+    # with the partitions of the right side whose keys overlap with it
+    SORT_MERGE = "sort_merge"
+
+
+def _is_sorted_within_partitions(plan: LogicalPlan) -> bool:
+    """Returns whether the rows of each partition of a plan are sorted, which is only known if the plan is a Sort or
+    keeps the order of the rows of a Sort below it
+    """
+    while not isinstance(plan, Sort):
+        if isinstance(plan, (Filter, Projection, LocalLimit)):
+            plan = plan._children()[0]
+        elif isinstance(plan, Join) and plan._strategy == JoinStrategy.SORT_MERGE:
+            # Sort merge Joins keep the order of their left side
+            plan = plan._children()[0]
+        else:
+            return False
+    return True
+
+
+def _broadcast_partition_spec(spec: PartitionSpec) -> PartitionSpec:
+    """Returns the PartitionSpec of a broadcast Join, which keeps the rows of each partition of the side that is not
+    broadcast in the same partition but not in the same order
+    """
+    if spec.scheme == PartitionScheme.RANGE:
+        return PartitionSpec(scheme=PartitionScheme.UNKNOWN, num_partitions=spec.num_partitions)
+    return spec
+
+
 class Join(BinaryNode):
     def __init__(
         self,
@@ -533,7 +687,12 @@ class Join(BinaryNode):
         left_on: ExpressionList,
         right_on: ExpressionList,
         how: JoinType = JoinType.INNER,
+        strategy: Optional[JoinStrategy] = None,
     ) -> None:
+        """Joins two plans on their keys. If no strategy is given, both sides are merge joined if they are RANGE
+        partitioned and sorted by their keys, and otherwise the side that is estimated to be smaller is broadcast if its estimated
+        size is under DAFT_BROADCAST_JOIN_THRESHOLD_BYTES, and otherwise both sides are hash repartitioned.
+        """
         assert len(left_on) == len(right_on), "left_on and right_on must match size"
 
         if not left.is_disjoint(right):
@@ -556,14 +715,51 @@ class Join(BinaryNode):
             filtered_right = [e for e in right.schema() if e.get_id() not in right_id_set]
             schema = left.schema().union(ExpressionList(filtered_right), strict=False, rename_dup="right.")
 
-        left = Repartition(left, partition_by=self._left_on, num_partitions=num_partitions, scheme=PartitionScheme.HASH)
-        right = Repartition(
-            right, partition_by=self._right_on, num_partitions=num_partitions, scheme=PartitionScheme.HASH
-        )
+        left_size, right_size = estimate_size_bytes(left), estimate_size_bytes(right)
+        # Index of the child that is broadcast, which is the right side unless the left side is known to be smaller
+        self._broadcast_side: Optional[int] = None
+        is_range_partitioned = self._is_range_partitioned_by_keys(left, right)
+        if strategy is None:
+            threshold = DaftSettings.DAFT_BROADCAST_JOIN_THRESHOLD_BYTES
+            strategy = JoinStrategy.HASH
+            if is_range_partitioned:
+                strategy = JoinStrategy.SORT_MERGE
+            elif (left_size is not None and left_size <= threshold) or (
+                right_size is not None and right_size <= threshold
+            ):
+                strategy = JoinStrategy.BROADCAST
+        elif strategy == JoinStrategy.SORT_MERGE and not is_range_partitioned:
+            raise ValueError("sort merge joins require both sides to be sorted by their join keys in the same order")
+        self._strategy = strategy
+        if strategy == JoinStrategy.BROADCAST:
+            self._broadcast_side = 0 if left_size is not None and (right_size is None or left_size < right_size) else 1
+
+        exchanges: List[LogicalPlan]
+        if self._broadcast_side == 0:
+            left = Coalesce(left, num_partitions=1)
+            partition_spec = _broadcast_partition_spec(right.partition_spec())
+            exchanges = [left]
+        elif self._broadcast_side == 1:
+            right = Coalesce(right, num_partitions=1)
+            partition_spec = _broadcast_partition_spec(left.partition_spec())
+            exchanges = [right]
+        elif strategy == JoinStrategy.SORT_MERGE:
+            # The output is in the order of the left side
+            partition_spec = left.partition_spec()
+            exchanges = []
+        else:
+            left = Repartition(
+                left, partition_by=self._left_on, num_partitions=num_partitions, scheme=PartitionScheme.HASH
+            )
+            right = Repartition(
+                right, partition_by=self._right_on, num_partitions=num_partitions, scheme=PartitionScheme.HASH
+            )
+            partition_spec = left.partition_spec()
+            exchanges = [left, right]
+        # IDs of the Repartitions and Coalesces that the Join added above its inputs, as opposed to ones in its inputs
+        self._exchange_ids = {exchange.id() for exchange in exchanges}
 
-        super().__init__(
-            schema.to_column_expressions(), partition_spec=left.partition_spec(), op_level=OpLevel.PARTITION
-        )
+        super().__init__(schema.to_column_expressions(), partition_spec=partition_spec, op_level=OpLevel.PARTITION)
         self._register_child(left)
         self._register_child(right)
 
@@ -573,6 +769,7 @@ class Join(BinaryNode):
             f"\n\tnum_partitions={self.num_partitions()}"
             f"\n\tleft_on={self._left_on}"
             f"\n\tright_on={self._right_on}"
+            f"\n\tstrategy={self._strategy}"
         )
 
     def resource_request(self) -> ResourceRequest:
@@ -587,20 +784,56 @@ class Join(BinaryNode):
     def required_columns(self) -> ExpressionList:
         raise NotImplementedError()
 
+    def _is_range_partitioned_by_keys(self, left: LogicalPlan, right: LogicalPlan) -> bool:
+        """Returns whether both sides are RANGE partitioned by their single key in the same order, with the rows of
+        each partition sorted by it
+        """
+        if len(self._left_on) != 1:
+            return False
+        left_spec, right_spec = left.partition_spec(), right.partition_spec()
+        return (
+            _is_sorted_within_partitions(left)
+            and _is_sorted_within_partitions(right)
+            and left_spec.scheme == PartitionScheme.RANGE
+            and right_spec.scheme == PartitionScheme.RANGE
+            and left_spec.by is not None
+            and right_spec.by is not None
+            and left_spec.by.to_id_set() == self._left_on.to_id_set()
+            and right_spec.by.to_id_set() == self._right_on.to_id_set()
+            and left_spec.desc == right_spec.desc
+        )
+
+    def sorted_desc(self) -> Optional[bool]:
+        """Returns whether the keys of a sort merge Join are sorted in descending order, or None for other Joins"""
+        if self._strategy != JoinStrategy.SORT_MERGE:
+            return None
+        return self._children()[0].partition_spec().desc
+
+    def broadcast_child(self) -> Optional[LogicalPlan]:
+        """Returns the child that is joined with every partition of the other child, if the Join broadcasts one"""
+        return self._children()[self._broadcast_side] if self._broadcast_side is not None else None
+
     def _local_eq(self, other: Any) -> bool:
         return (
             isinstance(other, Join)
             and self.schema() == other.schema()
             and self._left_on == other._left_on
             and self._right_on == other._right_on
+            and self._strategy == other._strategy
+            and self._broadcast_side == other._broadcast_side
             and self.num_partitions() == other.num_partitions()
         )
 
     def rebuild(self) -> LogicalPlan:
+        # Repartitions and Coalesces that the Join added are dropped, since the rebuilt Join adds them again
+        left, right = [
+            child._children()[0] if child.id() in self._exchange_ids else child for child in self._children()
+        ]
         return Join(
-            left=self._children()[0].rebuild(),
-            right=self._children()[1].rebuild(),
+            left=left.rebuild(),
+            right=right.rebuild(),
             left_on=self._left_on.unresolve(),
             right_on=self._right_on.unresolve(),
             how=self._how,
+            strategy=self._strategy,
         )
@@ -2,11 +2,17 @@ from typing import Optional, Set, Type
 
 from loguru import logger
 
+from daft.execution.scan_operators import (
+    count_rows_from_metadata,
+    prune_hive_partitions,
+)
+from daft.expressions import ColID, ColumnExpression
 from daft.internal.rule import Rule
 from daft.logical.logical_plan import (
     Coalesce,
     Filter,
     GlobalLimit,
+    LocalAggregate,
     LocalLimit,
     LogicalPlan,
     PartitionScheme,
@@ -108,33 +114,110 @@ class PushDownClausesIntoScan(Rule[LogicalPlan]):
         self.register_fn(Filter, Scan, self._push_down_predicates_into_scan)
         self.register_fn(Projection, Scan, self._push_down_projections_into_scan)
 
-    def _push_down_predicates_into_scan(self, parent: Filter, child: Scan) -> Scan:
+    def _push_down_predicates_into_scan(self, parent: Filter, child: Scan) -> Optional[Scan]:
+        if child._limit is not None:
+            # The predicate of a Scan is applied before its limit, so the Filter has to stay after the Scan
+            return None
         new_predicate = parent._predicate.union(child._predicate, strict=False)
         child_schema = child.schema()
         assert new_predicate.required_columns().to_id_set().issubset(child_schema.to_id_set())
+        # Files in Hive partitions that cannot satisfy the predicate are dropped before the Scan is executed
+        source_info = prune_hive_partitions(child._source_info, new_predicate, child._schema)
         return Scan(
-            schema=child._schema, predicate=new_predicate, columns=child_schema.names, source_info=child._source_info
+            schema=child._schema,
+            predicate=new_predicate,
+            columns=child_schema.names,
+            source_info=source_info,
+            limit=child._limit,
         )
 
     def _push_down_projections_into_scan(self, parent: Projection, child: Scan) -> Optional[LogicalPlan]:
-        required_columns = parent.schema().required_columns()
+        required_ids = parent.schema().required_columns().to_id_set()
         scan_columns = child.schema()
-        if required_columns.to_id_set() == scan_columns.to_id_set():
+        if required_ids == scan_columns.to_id_set():
             return None
 
+        # Columns are matched by id since names in the Projection may refer to aliases of scan columns
+        scan_names_by_id = {e.get_id(): e.name() for e in scan_columns}
+        projected_names = [
+            e.name() for e in parent._projection if isinstance(e, ColumnExpression) and e.get_id() in scan_names_by_id
+        ]
+        # The Projection can only be dropped if it selects plain scan columns under their original names
+        projection_required = len(projected_names) != len(parent._projection) or any(
+            scan_names_by_id[e.get_id()] != e.name() for e in parent._projection
+        )
+        if projection_required:
+            columns = [name for id, name in scan_names_by_id.items() if id in required_ids]
+        else:
+            columns = projected_names
+
         new_scan = Scan(
             schema=child._schema,
             predicate=child._predicate,
-            columns=required_columns.names,
+            columns=columns,
             source_info=child._source_info,
+            limit=child._limit,
         )
-        projection_required = any(e.has_call() for e in parent._projection)
         if projection_required:
             return Projection(new_scan, parent._projection)
         else:
             return new_scan
 
 
+class PruneColumns(Rule[LogicalPlan]):
+    """Narrows the columns flowing through the plan to the ones that are actually required by the nodes above,
+    inserting Projections where needed so that PushDownClausesIntoScan can fold them into the Scan
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.register_fn(Projection, Projection, self._prune_projection)
+        self.register_fn(LocalAggregate, LogicalPlan, self._prune_local_aggregate)
+        for op in self._supported_unary_nodes:
+            self.register_fn(Projection, op, self._prune_through_unary_node)
+
+    def _narrow(self, plan: LogicalPlan, required_ids: Set[ColID]) -> Optional[LogicalPlan]:
+        if plan.schema().to_id_set().issubset(required_ids):
+            return None
+        if isinstance(plan, Projection):
+            to_keep = [e for e in plan._projection if e.get_id() in required_ids]
+            if len(to_keep) == 0:
+                return None
+            return Projection(plan._children()[0], ExpressionList(to_keep))
+        to_keep = [e for e in plan.schema().to_column_expressions() if e.get_id() in required_ids]
+        if len(to_keep) == 0:
+            return None
+        return Projection(plan, ExpressionList(to_keep))
+
+    def _prune_projection(self, parent: Projection, child: Projection) -> Optional[LogicalPlan]:
+        new_child = self._narrow(child, parent.required_columns().to_id_set())
+        if new_child is None:
+            return None
+        logger.debug(f"Pruning columns of {child} to those required by {parent}")
+        return parent.copy_with_new_input(new_child)
+
+    def _prune_local_aggregate(self, parent: LocalAggregate, child: LogicalPlan) -> Optional[LogicalPlan]:
+        new_child = self._narrow(child, parent.required_columns().to_id_set())
+        if new_child is None:
+            return None
+        logger.debug(f"Pruning columns of {child} to those required by {parent}")
+        return parent.copy_with_new_input(new_child)
+
+    def _prune_through_unary_node(self, parent: Projection, child: UnaryNode) -> Optional[LogicalPlan]:
+        assert type(child) in self._supported_unary_nodes
+        required_ids = parent.required_columns().to_id_set() | child.required_columns().to_id_set()
+        grandchild = child._children()[0]
+        new_grandchild = self._narrow(grandchild, required_ids)
+        if new_grandchild is None:
+            return None
+        logger.debug(f"Pruning columns of {grandchild} through {child}")
+        return parent.copy_with_new_input(child.copy_with_new_input(new_grandchild))
+
+    @property
+    def _supported_unary_nodes(self) -> Set[Type[UnaryNode]]:
+        return {Filter, Sort, Repartition, Coalesce, LocalLimit, GlobalLimit}
+
+
 class FoldProjections(Rule[LogicalPlan]):
     def __init__(self) -> None:
         super().__init__()
@@ -161,6 +244,7 @@ class PushDownLimit(Rule[LogicalPlan]):
         for op in self._supported_unary_nodes:
             self.register_fn(LocalLimit, op, self._push_down_local_limit_into_unary_node)
             self.register_fn(GlobalLimit, op, self._push_down_global_limit_into_unary_node)
+        self.register_fn(LocalLimit, Scan, self._push_down_local_limit_into_scan)
 
     def _push_down_local_limit_into_unary_node(self, parent: LocalLimit, child: UnaryNode) -> Optional[UnaryNode]:
         logger.debug(f"pushing {parent} into {child}")
@@ -172,6 +256,45 @@ class PushDownLimit(Rule[LogicalPlan]):
         grandchild = child._children()[0]
         return child.copy_with_new_input(GlobalLimit(grandchild, num=parent._num))
 
+    def _push_down_local_limit_into_scan(self, parent: LocalLimit, child: Scan) -> Scan:
+        logger.debug(f"pushing {parent} into {child}")
+        # The Scan stops reading each partition once it has read the rows that the LocalLimit keeps
+        limit = parent._num if child._limit is None else min(parent._num, child._limit)
+        return Scan(
+            schema=child._schema,
+            predicate=child._predicate,
+            columns=child.schema().names,
+            source_info=child._source_info,
+            limit=limit,
+        )
+
     @property
     def _supported_unary_nodes(self) -> Set[Type[UnaryNode]]:
         return {Repartition, Coalesce, Projection}
+
+
+def get_num_rows_from_metadata(plan: LogicalPlan) -> Optional[int]:
+    """Returns the number of rows of a plan if it can be found without executing the plan, which is the case for a
+    Scan of Parquet files or in-memory data, optionally followed by Filters on Hive partition columns and nodes that
+    do not change the number of rows
+
+    Args:
+        plan (LogicalPlan): plan to count the rows of
+
+    Returns:
+        Optional[int]: number of rows of the plan, or None if the plan has to be executed to count them
+    """
+    filters = []
+    while not isinstance(plan, Scan):
+        if isinstance(plan, Filter):
+            filters.append(plan)
+        elif not isinstance(plan, (Projection, Sort, Repartition, Coalesce)):
+            return None
+        plan = plan._children()[0]
+    if plan._limit is not None:
+        return None
+    # Filters refer to the columns of the Scan by id, so they can be evaluated against the Scan's schema
+    predicate = plan._predicate
+    for filter in filters:
+        predicate = filter._predicate.union(predicate, strict=False)
+    return count_rows_from_metadata(plan._source_info, predicate, plan._schema)
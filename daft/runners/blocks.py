@@ -9,6 +9,7 @@ from typing import (
     Any,
     Callable,
     ClassVar,
+    Dict,
     Generic,
     Iterator,
     List,
@@ -24,10 +25,21 @@ import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.compute as pac
-from pandas.core.reshape.merge import get_join_indexers
 
 from daft.execution.operators import OperatorEnum, OperatorEvaluator
+from daft.internal.counting_sort import counting_sort_partition
+from daft.internal.hash_join import hash_join_indices
 from daft.internal.hashing import hash_chunked_array
+from daft.internal.merge_join import can_merge_join, merge_join_indices
+from daft.internal.sketches import (
+    SKETCH_TYPE,
+    hll_cardinality,
+    hll_merge,
+    hll_sketch,
+    tdigest_merge,
+    tdigest_quantile,
+    tdigest_sketch,
+)
 
 ArrType = TypeVar("ArrType", bound=collections.abc.Sequence)
 UnaryFuncType = Callable[[ArrType], ArrType]
@@ -190,29 +202,16 @@ class DataBlock(Generic[ArrType]):
 
     def partition(self, num: int, targets: DataBlock[ArrowArrType]) -> List[DataBlock[ArrType]]:
         assert not self.is_scalar(), "Cannot partition scalar DataBlock"
+        permutation, offsets = counting_sort_partition(targets.data, num)
+        return self.scatter(permutation, offsets)
 
-        # We first argsort the targets to group the same partitions together
-        argsort_indices = targets.argsort()
-
-        # We now perform a gather to make items targeting the same partition together
-        reordered = self.take(argsort_indices)
-        sorted_targets = targets.take(argsort_indices)
-
-        sorted_targets_np = sorted_targets.data.to_numpy()
-        pivots = np.where(np.diff(sorted_targets_np, prepend=np.nan))[0]
-
-        # We now split in the num partitions
-        unmatched_partitions = reordered._split(pivots)
-        target_partitions = sorted_targets_np[pivots]
-
-        target_partition_idx_to_match_idx = {target_idx: idx for idx, target_idx in enumerate(target_partitions)}
-
-        return [
-            DataBlock.make_block(unmatched_partitions[target_partition_idx_to_match_idx[i]])
-            if i in target_partition_idx_to_match_idx
-            else self._make_empty()
-            for i in range(num)
-        ]
+    def scatter(self, permutation: Optional[pa.Int64Array], offsets: np.ndarray) -> List[DataBlock[ArrType]]:
+        """Gathers the rows in the order of `permutation`, as computed by `counting_sort_partition`, and slices them
+        into one block per partition at `offsets`. Partitions are sliced without copying if `permutation` is None.
+        """
+        assert not self.is_scalar(), "Cannot scatter scalar DataBlock"
+        reordered = self if permutation is None else self.take(DataBlock.make_block(permutation))
+        return [reordered._slice(int(offsets[i]), int(offsets[i + 1])) for i in range(len(offsets) - 1)]
 
     def head(self, num: int) -> DataBlock[ArrType]:
         assert not self.is_scalar(), "Cannot get head of scalar DataBlock"
@@ -229,8 +228,8 @@ class DataBlock(Generic[ArrType]):
         return self._take(indices)
 
     @abstractmethod
-    def _split(self, pivots: np.ndarray) -> Sequence[ArrType]:
-        """Splits the data at the given pivots. First element of the pivot should be a NaN"""
+    def _slice(self, start: int, end: int) -> DataBlock[ArrType]:
+        """Slices the rows in [start, end) of the DataBlock"""
         raise NotImplementedError()
 
     @abstractmethod
@@ -312,7 +311,9 @@ class DataBlock(Generic[ArrType]):
     @staticmethod
     @abstractmethod
     def _join_keys(
-        left_keys: List[DataBlock[ArrType]], right_keys: List[DataBlock[ArrType]]
+        left_keys: List[DataBlock[ArrType]],
+        right_keys: List[DataBlock[ArrType]],
+        sorted_desc: Optional[bool] = None,
     ) -> Tuple[DataBlock[ArrType], DataBlock[ArrType]]:
         raise NotImplementedError()
 
@@ -323,7 +324,12 @@ class DataBlock(Generic[ArrType]):
         right_keys: List[DataBlock],
         left_columns: List[DataBlock],
         right_columns: List[DataBlock],
+        sorted_desc: Optional[bool] = None,
     ) -> List[DataBlock]:
+        """Inner joins the rows of two sets of columns on their keys. If `sorted_desc` is given, both sides have a
+        single key that is sorted in descending order if it is True and ascending order otherwise, and the keys are
+        merge joined instead of hash joined.
+        """
         assert len(left_keys) > 0
         assert len(left_keys) == len(right_keys)
         last_type = None
@@ -333,7 +339,9 @@ class DataBlock(Generic[ArrType]):
                 assert type(l) == last_type
             last_type = type(l)
         first_type = type(left_keys[0])
-        left_indices, right_indices = first_type._join_keys(left_keys=left_keys, right_keys=right_keys)
+        left_indices, right_indices = first_type._join_keys(
+            left_keys=left_keys, right_keys=right_keys, sorted_desc=sorted_desc
+        )
         to_rtn = []
         for blockset in (left_keys, left_columns):
             for b in blockset:
@@ -383,8 +391,8 @@ class PyListDataBlock(DataBlock[List[T]]):
     def _make_empty(self) -> DataBlock[List[T]]:
         return PyListDataBlock(data=[])
 
-    def _split(self, pivots: np.ndarray) -> Sequence[List[T]]:
-        return [list(chunk) for chunk in np.split(self.data, pivots)[1:]]
+    def _slice(self, start: int, end: int) -> DataBlock[List[T]]:
+        return PyListDataBlock(data=self.data[start:end])
 
     @staticmethod
     def _merge_blocks(blocks: List[DataBlock[List[T]]]) -> DataBlock[List[T]]:
@@ -415,7 +423,9 @@ class PyListDataBlock(DataBlock[List[T]]):
 
     @staticmethod
     def _join_keys(
-        left_keys: List[DataBlock[List[T]]], right_keys: List[DataBlock[List[T]]]
+        left_keys: List[DataBlock[List[T]]],
+        right_keys: List[DataBlock[List[T]]],
+        sorted_desc: Optional[bool] = None,
     ) -> Tuple[DataBlock[List[T]], DataBlock[List[T]]]:
         raise NotImplementedError()
 
@@ -423,10 +433,128 @@ class PyListDataBlock(DataBlock[List[T]]):
 ArrowArrType = Union[pa.ChunkedArray, pa.Scalar]
 
 
+def _agg_result_type(data_type: pa.DataType, op: str) -> pa.DataType:
+    """Returns the type of the result of aggregating values of `data_type` with `op`"""
+    if op in ("count", "count_distinct"):
+        return pa.int64()
+    elif op == "mean":
+        return pa.float64()
+    elif op == "distinct":
+        return pa.list_(data_type)
+    elif op in _STATE_AGGREGATIONS:
+        return SKETCH_TYPE
+    return data_type
+
+
+def _merge_distinct_counts(distinct_lists: pa.ChunkedArray, group_ids: np.ndarray, num_groups: int) -> pa.Array:
+    """Counts the distinct values of the lists of distinct values of each group, where `group_ids` is the group of
+    each list
+    """
+    distinct_lists = distinct_lists.combine_chunks()
+    values = pac.list_flatten(distinct_lists)
+    value_group_ids = group_ids[pac.list_parent_indices(distinct_lists).to_numpy()]
+    counted = (
+        pa.table({"group": value_group_ids, "value": values}).group_by("group").aggregate([("value", "count_distinct")])
+    )
+    counts = np.zeros(num_groups, dtype=np.int64)
+    counts[counted["group"].to_numpy()] = counted["value_count_distinct"].to_numpy()
+    return pa.array(counts)
+
+
+def _pack_moments(counts: np.ndarray, means: np.ndarray, m2s: np.ndarray) -> pa.Array:
+    """Packs the count, mean and sum of squared deviations from the mean of each group into a binary value of three
+    float64s
+    """
+    moments = np.ascontiguousarray(np.stack([counts, means, m2s], axis=1), dtype=np.float64)
+    offsets = np.arange(len(moments) + 1, dtype=np.int32) * moments.itemsize * 3
+    return pa.BinaryArray.from_buffers(SKETCH_TYPE, len(moments), [None, pa.py_buffer(offsets), pa.py_buffer(moments)])
+
+
+def _unpack_moments(moments: pa.ChunkedArray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the counts, means and sums of squared deviations from the means packed by `_pack_moments`"""
+    moments = pa.concat_arrays(moments.chunks) if moments.num_chunks > 0 else pa.array([], type=SKETCH_TYPE)
+    if pa.types.is_large_binary(moments.type):
+        moments = moments.cast(SKETCH_TYPE)
+    if len(moments) == 0:
+        return np.zeros(0), np.zeros(0), np.zeros(0)
+    offsets = np.frombuffer(moments.buffers()[1], dtype=np.int32)[moments.offset : moments.offset + len(moments) + 1]
+    data = np.frombuffer(moments.buffers()[2], dtype=np.uint8)[offsets[0] : offsets[-1]]
+    counts, means, m2s = np.ascontiguousarray(data).view(np.float64).reshape(len(moments), 3).T
+    return counts, means, m2s
+
+
+def _moments(values: pa.ChunkedArray, group_ids: Optional[np.ndarray], num_groups: int) -> pa.Array:
+    """Computes the count, mean and sum of squared deviations from the mean of the non-null values of each group,
+    where `group_ids` is the group of each value or None if all values are in the same group
+    """
+    is_valid = np.asarray(pac.is_valid(values).to_numpy(), dtype=bool)
+    x = np.asarray(pac.cast(values, pa.float64()).fill_null(0.0).to_numpy(), dtype=np.float64)[is_valid]
+    groups = (np.zeros(len(values), dtype=np.int64) if group_ids is None else group_ids)[is_valid]
+    counts = np.bincount(groups, minlength=num_groups).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(counts > 0, np.bincount(groups, weights=x, minlength=num_groups) / counts, 0.0)
+    # Deviations are taken from the mean rather than computed from sums of squares, which cancel out for values that
+    # are large compared to their spread
+    m2s = np.bincount(groups, weights=(x - means[groups]) ** 2, minlength=num_groups)
+    return _pack_moments(counts, means, m2s)
+
+
+def _merge_moments(moments: pa.ChunkedArray, group_ids: Optional[np.ndarray], num_groups: int) -> pa.Array:
+    """Merges the moments of the parts of each group. The squared deviations of each part are from its own mean, and
+    are corrected by the deviation of its mean from the mean of the group: M2 = sum(m2_i + n_i * (mean_i - mean)^2)
+    """
+    counts, means, m2s = _unpack_moments(moments)
+    groups = np.zeros(len(counts), dtype=np.int64) if group_ids is None else group_ids
+    merged_counts = np.bincount(groups, weights=counts, minlength=num_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        merged_means = np.where(
+            merged_counts > 0,
+            np.bincount(groups, weights=counts * means, minlength=num_groups) / merged_counts,
+            0.0,
+        )
+    deviations = means - merged_means[groups]
+    merged_m2s = np.bincount(groups, weights=m2s + counts * deviations**2, minlength=num_groups)
+    return _pack_moments(merged_counts, merged_means, merged_m2s)
+
+
+def arrow_moments_variance(moments: pa.ChunkedArray) -> pa.Array:
+    """Returns the sample variance of each group from its moments, which is null for groups of less than two values"""
+    counts, _, m2s = _unpack_moments(moments)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variances = m2s / (counts - 1)
+    return pa.array(variances, mask=counts < 2)
+
+
+# Reductions to fixed-size partial states, which build or merge the state of each group given the group of each value
+_STATE_AGGREGATIONS: Dict[str, Callable[[pa.ChunkedArray, Optional[np.ndarray], int], pa.Array]] = {
+    "moments": _moments,
+    "moments_merge": _merge_moments,
+    "hll_sketch": hll_sketch,
+    "hll_merge": hll_merge,
+    "tdigest_sketch": tdigest_sketch,
+    "tdigest_merge": tdigest_merge,
+}
+
+
+def _compact_chunk(chunk: pa.Array) -> pa.Array:
+    """Copies a sliced array into buffers of its own if it shares larger buffers with the array it was sliced from,
+    since pickling a slice writes out the whole buffers of its parent
+    """
+    buffers_size = sum(buf.size for buf in chunk.buffers() if buf is not None)
+    if buffers_size <= chunk.nbytes:
+        return chunk
+    return pa.concat_arrays([chunk])
+
+
 class ArrowDataBlock(DataBlock[ArrowArrType]):
     def __reduce__(self) -> Tuple:
         if len(self.data) == 0:
             return ArrowDataBlock, (self._make_empty().data,)
+        elif isinstance(self.data, pa.ChunkedArray):
+            # Blocks scattered by a shuffle are slices of the whole partition, and are compacted before they are sent
+            return ArrowDataBlock, (pa.chunked_array([_compact_chunk(c) for c in self.data.chunks], self.data.type),)
+        elif isinstance(self.data, pa.Array):
+            return ArrowDataBlock, (_compact_chunk(self.data),)
         else:
             return ArrowDataBlock, (self.data,)
 
@@ -456,9 +584,8 @@ class ArrowDataBlock(DataBlock[ArrowArrType]):
     def _take(self, indices: DataBlock[ArrowArrType]) -> DataBlock[ArrowArrType]:
         return self._binary_op(indices, fn=partial(pac.take, boundscheck=False))
 
-    def _split(self, pivots: np.ndarray) -> Sequence[ArrowArrType]:
-        splitted: Sequence[np.ndarray] = np.split(self.data, pivots)[1:]
-        return splitted
+    def _slice(self, start: int, end: int) -> DataBlock[ArrowArrType]:
+        return ArrowDataBlock(data=self.data.slice(start, end - start))
 
     @staticmethod
     def _merge_blocks(blocks: List[DataBlock[ArrowArrType]]) -> DataBlock[ArrowArrType]:
@@ -495,17 +622,7 @@ class ArrowDataBlock(DataBlock[ArrowArrType]):
         assert isinstance(self.data, pa.ChunkedArray)
         assert seed is None or isinstance(seed.data, pa.ChunkedArray)
 
-        pa_type = self.data.type
-        data_to_hash = self.data
-        if pa.types.is_date32(pa_type):
-            data_to_hash = data_to_hash.cast(pa.int32())
-        elif pa.types.is_date64(pa_type):
-            data_to_hash = data_to_hash.cast(pa.int64())
-        elif pa.types.is_floating(pa_type):
-            data_to_hash = data_to_hash.cast(pa.string())
-        elif not (pa.types.is_integer(pa_type) or pa.types.is_string(pa_type)):
-            raise TypeError(f"cannot hash {pa_type}")
-        hashed = hash_chunked_array(data_to_hash)
+        hashed = hash_chunked_array(self.data)
         if seed is None:
             return ArrowDataBlock(data=hashed)
         else:
@@ -518,22 +635,38 @@ class ArrowDataBlock(DataBlock[ArrowArrType]):
             return ArrowDataBlock(data=pa.chunked_array([seed_arr]))
 
     def agg(self, op: str) -> DataBlock[ArrowArrType]:
+        if len(self) == 0:
+            return ArrowDataBlock(data=pa.chunked_array([[]], type=_agg_result_type(self.data.type, op)))
 
         if op == "sum":
-            if len(self) == 0:
-                return ArrowDataBlock(data=pa.chunked_array([[]], type=self.data.type))
-            return ArrowDataBlock(data=pa.chunked_array([[pac.sum(self.data).as_py()]]))
+            result = pac.sum(self.data)
         elif op == "mean":
-            if len(self) == 0:
-                return ArrowDataBlock(data=pa.chunked_array([[]], type=pa.float64()))
-            return ArrowDataBlock(data=pa.chunked_array([[pac.mean(self.data).as_py()]]))
+            result = pac.mean(self.data)
         elif op == "count":
-            if len(self) == 0:
-                return ArrowDataBlock(data=pa.chunked_array([[]], type=pa.int64()))
-            return ArrowDataBlock(data=pa.chunked_array([[pac.count(self.data).as_py()]]))
-
+            result = pac.count(self.data)
+        elif op == "min":
+            result = pac.min_max(self.data)["min"]
+        elif op == "max":
+            result = pac.min_max(self.data)["max"]
+        elif op == "first":
+            result = self.data[0]
+        elif op == "distinct":
+            distinct = pac.unique(self.data.drop_null())
+            distinct = distinct.combine_chunks() if isinstance(distinct, pa.ChunkedArray) else distinct
+            return ArrowDataBlock(
+                data=pa.chunked_array(
+                    [pa.ListArray.from_arrays(pa.array([0, len(distinct)], type=pa.int32()), distinct)]
+                )
+            )
+        elif op == "count_distinct":
+            # Partial states of distinct values are merged by counting the distinct values of all of their lists
+            values = pac.list_flatten(self.data) if pa.types.is_list(self.data.type) else self.data
+            result = pac.count(pac.unique(values))
+        elif op in _STATE_AGGREGATIONS:
+            return ArrowDataBlock(data=pa.chunked_array([_STATE_AGGREGATIONS[op](self.data, None, 1)]))
         else:
             raise NotImplementedError(op)
+        return ArrowDataBlock(data=pa.chunked_array([pa.array([result.as_py()], type=result.type)]))
 
     @staticmethod
     def _group_by_agg(
@@ -544,21 +677,68 @@ class ArrowDataBlock(DataBlock[ArrowArrType]):
         group_names = [f"g_{i}" for i in range(len(group_by))]
         agg_names = [f"a_{i}" for i in range(len(to_agg))]
         table = pa.table(arrs, names=group_names + agg_names).combine_chunks()
-        agged = table.group_by(group_names).aggregate([(a_name, op) for a_name, op in zip(agg_names, agg_ops)])
+        table = table.append_column("row", pa.array(np.arange(len(table), dtype=np.int64)))
+
+        merges_distinct = [
+            op == "count_distinct" and pa.types.is_list(table[a_name].type) for a_name, op in zip(agg_names, agg_ops)
+        ]
+        needs_group_ids = any(merges_distinct) or any(op in _STATE_AGGREGATIONS for op in agg_ops)
+        aggregations = []
+        for a_name, op, merge_distinct in zip(agg_names, agg_ops, merges_distinct):
+            if op == "first" or merge_distinct or op in _STATE_AGGREGATIONS:
+                continue
+            elif op in ("sum", "mean", "count", "min", "max", "distinct", "count_distinct"):
+                aggregations.append((a_name, op))
+            else:
+                raise NotImplementedError(op)
+        # The first row of each group is kept to take first values, and the rows of each group to merge partial states
+        # and build fixed-size states
+        aggregations.append(("row", "min"))
+        if needs_group_ids:
+            aggregations.append(("row", "list"))
+        agged = table.group_by(group_names).aggregate(aggregations)
+
+        group_ids = None
+        if needs_group_ids:
+            rows_of_groups = agged["row_list"].combine_chunks()
+            group_ids = np.empty(len(table), dtype=np.int64)
+            group_ids[pac.list_flatten(rows_of_groups).to_numpy()] = pac.list_parent_indices(rows_of_groups).to_numpy()
+
         gcols: List[DataBlock] = [ArrowDataBlock(agged[g_name]) for g_name in group_names]
-        acols: List[DataBlock] = [ArrowDataBlock(agged[f"{a_name}_{op}"]) for a_name, op in zip(agg_names, agg_ops)]
+        acols: List[DataBlock] = []
+        for a_name, op, merge_distinct in zip(agg_names, agg_ops, merges_distinct):
+            if op == "first":
+                acol = table[a_name].take(agged["row_min"])
+            elif merge_distinct:
+                assert group_ids is not None
+                acol = pa.chunked_array([_merge_distinct_counts(table[a_name], group_ids, len(agged))])
+            elif op in _STATE_AGGREGATIONS:
+                assert group_ids is not None
+                acol = pa.chunked_array([_STATE_AGGREGATIONS[op](table[a_name], group_ids, len(agged))])
+            else:
+                acol = agged[f"{a_name}_{op}"]
+            acols.append(ArrowDataBlock(acol))
         return gcols, acols
 
     @staticmethod
     def _join_keys(
-        left_keys: List[DataBlock[ArrowArrType]], right_keys: List[DataBlock[ArrowArrType]]
+        left_keys: List[DataBlock[ArrowArrType]],
+        right_keys: List[DataBlock[ArrowArrType]],
+        sorted_desc: Optional[bool] = None,
     ) -> Tuple[DataBlock[ArrowArrType], DataBlock[ArrowArrType]]:
         assert len(left_keys) == len(right_keys)
 
-        pd_left_keys = [k.data.to_pandas() for k in left_keys]
-
-        pd_right_keys = [k.data.to_pandas() for k in right_keys]
-        left_index, right_index = get_join_indexers(pd_left_keys, pd_right_keys, how="inner")
+        if sorted_desc is not None:
+            assert len(left_keys) == 1, "only a single sorted key can be merge joined"
+        if sorted_desc is not None and can_merge_join(left_keys[0].data.type, right_keys[0].data.type):
+            left_index, right_index = merge_join_indices(left_keys[0].data, right_keys[0].data, desc=sorted_desc)
+        else:
+            left_index, right_index = hash_join_indices([k.data for k in left_keys], [k.data for k in right_keys])
+            if sorted_desc is not None:
+                # Keys that the merge kernel cannot compare are hash joined, in the order of the left side as they would
+                # be merge joined
+                order = np.lexsort((right_index.to_numpy(), left_index.to_numpy()))
+                left_index, right_index = left_index.take(order), right_index.take(order)
 
         return DataBlock.make_block(left_index), DataBlock.make_block(right_index)
 
@@ -589,6 +769,10 @@ def arrow_str_startswith(arr: pa.ChunkedArray, pattern: pa.StringScalar):
     return pac.starts_with(arr, pattern=pattern.as_py())
 
 
+def arrow_tdigest_quantile(arr: pa.ChunkedArray, q: pa.DoubleScalar):
+    return tdigest_quantile(arr, q.as_py())
+
+
 def _arr_unary_op(
     fn: Callable[..., pa.ChunkedArray],
 ) -> Callable[[DataBlock[ArrowArrType]], DataBlock[ArrowArrType]]:
@@ -615,7 +799,18 @@ class ArrowEvaluator(OperatorEvaluator["ArrowDataBlock"]):
     MEAN = ArrowDataBlock.identity
     MIN = ArrowDataBlock.identity
     MAX = ArrowDataBlock.identity
+    FIRST = ArrowDataBlock.identity
     COUNT = ArrowDataBlock.identity
+    COUNT_DISTINCT = ArrowDataBlock.identity
+    DISTINCT = ArrowDataBlock.identity
+    MOMENTS = ArrowDataBlock.identity
+    MOMENTS_MERGE = ArrowDataBlock.identity
+    MOMENTS_VARIANCE = _arr_unary_op(arrow_moments_variance)
+    HLL_SKETCH = ArrowDataBlock.identity
+    HLL_MERGE = ArrowDataBlock.identity
+    HLL_CARDINALITY = _arr_unary_op(hll_cardinality)
+    TDIGEST_SKETCH = ArrowDataBlock.identity
+    TDIGEST_MERGE = ArrowDataBlock.identity
     INVERT = _arr_unary_op(pac.invert)
     ADD = _arr_bin_op(pac.add)
     SUB = _arr_bin_op(pac.subtract)
@@ -632,6 +827,7 @@ class ArrowEvaluator(OperatorEvaluator["ArrowDataBlock"]):
     NEQ = _arr_bin_op(pac.not_equal)
     GT = _arr_bin_op(pac.greater)
     GE = _arr_bin_op(pac.greater_equal)
+    TDIGEST_QUANTILE = _arr_bin_op(arrow_tdigest_quantile)
     STR_CONTAINS = _arr_bin_op(arrow_str_contains)
     STR_ENDSWITH = _arr_bin_op(arrow_str_endswith)
     STR_STARTSWITH = _arr_bin_op(arrow_str_startswith)
@@ -690,7 +886,16 @@ class PyListEvaluator(OperatorEvaluator["PyListDataBlock"]):
     MEAN = PyListDataBlock.identity
     MIN = PyListDataBlock.identity
     MAX = PyListDataBlock.identity
+    FIRST = PyListDataBlock.identity
     COUNT = PyListDataBlock.identity
+    COUNT_DISTINCT = PyListDataBlock.identity
+    DISTINCT = PyListDataBlock.identity
+    MOMENTS = PyListDataBlock.identity
+    MOMENTS_MERGE = PyListDataBlock.identity
+    HLL_SKETCH = PyListDataBlock.identity
+    HLL_MERGE = PyListDataBlock.identity
+    TDIGEST_SKETCH = PyListDataBlock.identity
+    TDIGEST_MERGE = PyListDataBlock.identity
     INVERT = make_map_unary(operator.invert)
     ADD = make_map_binary(operator.add)
     SUB = make_map_binary(operator.sub)
@@ -717,6 +922,9 @@ class PyListEvaluator(OperatorEvaluator["PyListDataBlock"]):
     STR_ENDSWITH = assert_invalid_pylist_operation
     STR_STARTSWITH = assert_invalid_pylist_operation
     STR_LENGTH = assert_invalid_pylist_operation
+    MOMENTS_VARIANCE = assert_invalid_pylist_operation
+    HLL_CARDINALITY = assert_invalid_pylist_operation
+    TDIGEST_QUANTILE = assert_invalid_pylist_operation
     DT_DAY = assert_invalid_pylist_operation
     DT_MONTH = assert_invalid_pylist_operation
     DT_YEAR = assert_invalid_pylist_operation
@@ -11,8 +11,10 @@ import pandas as pd
 import pyarrow as pa
 
 from daft.expressions import ColID, Expression, ExpressionExecutor
+from daft.internal.counting_sort import counting_sort_partition
+from daft.internal.hashing import hash_partition
 from daft.logical.schema import ExpressionList
-from daft.runners.blocks import ArrowArrType, DataBlock, PyListDataBlock
+from daft.runners.blocks import ArrowArrType, ArrowDataBlock, DataBlock, PyListDataBlock
 
 from ..execution.operators import OperatorEnum, PythonExpressionType
 
@@ -139,6 +141,7 @@ class vPartition:
             arr = (
                 data[col_name]
                 if isinstance(col_expr.resolved_type(), PythonExpressionType)
+                or isinstance(data[col_name], (pa.Array, pa.ChunkedArray))
                 else pa.array(data[col_expr.name()])
             )
             block: DataBlock = DataBlock.make_block(arr)
@@ -159,9 +162,40 @@ class vPartition:
             }
         )
 
+    def to_arrow(self, schema: Optional[ExpressionList] = None) -> pa.Table:
+        if schema is not None:
+            output_schema = [(expr.name(), expr.get_id()) for expr in schema]
+        else:
+            output_schema = [(tile.column_name, id) for id, tile in self.columns.items()]
+        return pa.table(
+            {
+                name: pa.array(self.columns[id].block.data)
+                if isinstance(self.columns[id].block, PyListDataBlock)
+                else self.columns[id].block.data
+                for name, id in output_schema
+            }
+        )
+
     def for_each_column_block(self, func: Callable[[DataBlock], DataBlock]) -> vPartition:
         return dataclasses.replace(self, columns={col_id: col.apply(func) for col_id, col in self.columns.items()})
 
+    def empty_like(self, partition_id: PartID) -> vPartition:
+        """Returns a partition with the same columns and no rows, with the given partition ID"""
+        columns = {
+            col_id: dataclasses.replace(tile, block=tile.block.head(0), partition_id=partition_id)
+            for col_id, tile in self.columns.items()
+        }
+        return vPartition(columns=columns, partition_id=partition_id)
+
+    def with_partition_id(self, partition_id: PartID) -> vPartition:
+        """Returns a partition with the same columns and rows, with the given partition ID"""
+        if partition_id == self.partition_id:
+            return self
+        columns = {
+            col_id: dataclasses.replace(tile, partition_id=partition_id) for col_id, tile in self.columns.items()
+        }
+        return vPartition(columns=columns, partition_id=partition_id)
+
     def head(self, num: int) -> vPartition:
         # TODO make optimization for when num=0
         return self.for_each_column_block(partial(DataBlock.head, num=num))
@@ -217,24 +251,29 @@ class vPartition:
         values_to_hash = self.eval_expression_list(exprs)
         keys = list(values_to_hash.columns.keys())
         keys.sort()
-        hsf = None
         assert len(keys) > 0
-        for k in keys:
-            block = values_to_hash.columns[k].block
-            hsf = block.array_hash(seed=hsf)
-        assert hsf is not None
-        target_idx = hsf.run_binary_operator(num_partitions, OperatorEnum.MOD)
+        blocks = [values_to_hash.columns[k].block for k in keys]
+        if all(isinstance(block, ArrowDataBlock) and not block.is_scalar() for block in blocks):
+            # All keys are hashed and assigned a partition in a single pass
+            _, targets = hash_partition([block.data for block in blocks], num_partitions)
+            target_idx = DataBlock.make_block(targets)
+        else:
+            hsf = None
+            for block in blocks:
+                hsf = block.array_hash(seed=hsf)
+            assert hsf is not None
+            target_idx = hsf.run_binary_operator(num_partitions, OperatorEnum.MOD)
         return self.split_by_index(num_partitions, target_partition_indices=target_idx)
 
     def split_by_index(self, num_partitions: int, target_partition_indices: DataBlock) -> List[vPartition]:
         assert len(target_partition_indices) == len(self)
+        # The rows of each partition are grouped once and every column is scattered with the same permutation
+        permutation, offsets = counting_sort_partition(target_partition_indices.data, num_partitions)
         new_partition_to_columns: List[Dict[ColID, PyListTile]] = [{} for _ in range(num_partitions)]
         for col_id, tile in self.columns.items():
-            new_tiles = tile.split_by_index(
-                num_partitions=num_partitions, target_partition_indices=target_partition_indices
-            )
-            for part_id, nt in enumerate(new_tiles):
-                new_partition_to_columns[part_id][col_id] = nt
+            new_blocks = tile.block.scatter(permutation, offsets)
+            for part_id, nb in enumerate(new_blocks):
+                new_partition_to_columns[part_id][col_id] = dataclasses.replace(tile, block=nb, partition_id=part_id)
 
         return [vPartition(partition_id=i, columns=columns) for i, columns in enumerate(new_partition_to_columns)]
 
@@ -245,7 +284,11 @@ class vPartition:
         right_on: ExpressionList,
         output_schema: ExpressionList,
         how: str = "inner",
+        sorted_desc: Optional[bool] = None,
     ) -> vPartition:
+        """Joins this partition with another partition on their keys. If `sorted_desc` is given, both partitions are
+        sorted by a single key, in descending order if it is True, and are merge joined instead of hash joined.
+        """
         assert how == "inner"
         left_key_part = self.eval_expression_list(left_on)
         left_key_ids = list(left_key_part.columns.keys())
@@ -260,7 +303,9 @@ class vPartition:
         left_nonjoin_blocks = [self.columns[i].block for i in left_nonjoin_ids]
         right_nonjoin_blocks = [right.columns[i].block for i in right_nonjoin_ids]
 
-        joined_blocks = DataBlock.join(left_key_list, right_key_list, left_nonjoin_blocks, right_nonjoin_blocks)
+        joined_blocks = DataBlock.join(
+            left_key_list, right_key_list, left_nonjoin_blocks, right_nonjoin_blocks, sorted_desc=sorted_desc
+        )
 
         result_keys = left_key_ids + left_nonjoin_ids + right_nonjoin_ids
 
@@ -309,11 +354,23 @@ class vPartition:
 PartitionT = TypeVar("PartitionT")
 
 
+def concat_arrow_tables(tables: List[pa.Table]) -> pa.Table:
+    """Concatenates the tables of partitions without copying their chunks. Empty partitions are skipped, since their
+    columns may not have the same types as the columns of other partitions.
+    """
+    non_empty_tables = [table for table in tables if table.num_rows > 0]
+    return pa.concat_tables(non_empty_tables if len(non_empty_tables) > 0 else tables[:1])
+
+
 class PartitionSet(Generic[PartitionT]):
     @abstractmethod
     def to_pandas(self, schema: Optional[ExpressionList] = None) -> pd.DataFrame:
         raise NotImplementedError()
 
+    @abstractmethod
+    def to_arrow(self, schema: Optional[ExpressionList] = None) -> pa.Table:
+        raise NotImplementedError()
+
     @abstractmethod
     def get_partition(self, idx: PartID) -> PartitionT:
         raise NotImplementedError()
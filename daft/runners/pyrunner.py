@@ -2,28 +2,39 @@ from __future__ import annotations
 
 import multiprocessing
 from dataclasses import dataclass
-from typing import Callable, ClassVar, Dict, List, Optional, Type
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, Type
 
 import pandas as pd
+import pyarrow as pa
 
 from daft.execution.execution_plan import ExecutionPlan
 from daft.execution.logical_op_runners import (
     LogicalGlobalOpRunner,
     LogicalPartitionOpRunner,
     ReduceType,
+    partition_key_range,
 )
+from daft.expressions import Expression
 from daft.internal.gpu import cuda_device_count
 from daft.internal.rule_runner import FixedPointPolicy, Once, RuleBatch, RuleRunner
 from daft.logical.logical_plan import LogicalPlan
 from daft.logical.optimizer import (
     DropRepartition,
     FoldProjections,
+    PruneColumns,
+    PushDownClausesIntoScan,
     PushDownLimit,
     PushDownPredicates,
 )
 from daft.logical.schema import ExpressionList
 from daft.resource_request import ResourceRequest
-from daft.runners.partitioning import PartID, PartitionManager, PartitionSet, vPartition
+from daft.runners.partitioning import (
+    PartID,
+    PartitionManager,
+    PartitionSet,
+    concat_arrow_tables,
+    vPartition,
+)
 from daft.runners.profiler import profiler
 from daft.runners.runner import Runner
 from daft.runners.shuffle_ops import (
@@ -47,6 +58,11 @@ class LocalPartitionSet(PartitionSet[vPartition]):
         part_dfs = [self._partitions[pid].to_pandas(schema=schema) for pid in partition_ids]
         return pd.concat([pdf for pdf in part_dfs if not pdf.empty], ignore_index=True)
 
+    def to_arrow(self, schema: Optional[ExpressionList] = None) -> pa.Table:
+        partition_ids = sorted(list(self._partitions.keys()))
+        part_tables = [self._partitions[pid].to_arrow(schema=schema) for pid in partition_ids]
+        return concat_arrow_tables(part_tables)
+
     def get_partition(self, idx: PartID) -> vPartition:
         return self._partitions[idx]
 
@@ -113,15 +129,36 @@ class LocalLogicalPartitionOpRunner(LogicalPartitionOpRunner):
         nodes: List[LogicalPlan],
         num_partitions: int,
         resource_request: ResourceRequest,
+        limit: Optional[int] = None,
     ) -> PartitionSet:
         # NOTE: resource_request is ignored since there isn't any actual distribution of workloads in PyRunner
         result = LocalPartitionSet({})
+        num_rows = 0
+        input_partition_ids = self._input_partition_ids(inputs, nodes, num_partitions)
         for i in range(num_partitions):
-            input_partitions = {nid: inputs[nid].get_partition(i) for nid in inputs}
+            if limit is not None and i > 0 and num_rows >= limit:
+                result.set_partition(i, result.get_partition(0).empty_like(partition_id=i))
+                continue
+            input_partitions = {
+                nid: self._read_input_partition(inputs[nid], input_partition_ids[nid][i], partition_id=i)
+                for nid in inputs
+            }
             result_partition = self.run_node_list_single_partition(input_partitions, nodes=nodes, partition_id=i)
             result.set_partition(i, result_partition)
+            num_rows += len(result_partition)
         return result
 
+    def _read_input_partition(self, pset: PartitionSet, partition_ids: List[PartID], partition_id: int) -> vPartition:
+        if len(partition_ids) == 0:
+            first: vPartition = pset.get_partition(0)
+            return first.empty_like(partition_id=partition_id)
+        return vPartition.merge_partitions(
+            [pset.get_partition(pid) for pid in partition_ids], verify_partition_id=False
+        )
+
+    def _key_ranges(self, pset: PartitionSet, expr: Expression) -> List[Optional[Tuple[Any, Any]]]:
+        return [partition_key_range(pset.get_partition(i), expr) for i in range(pset.num_partitions())]
+
 
 class LocalLogicalGlobalOpRunner(LogicalGlobalOpRunner):
     shuffle_ops: ClassVar[Dict[Type[ShuffleOp], Type[Shuffler]]] = {
@@ -154,6 +191,11 @@ class PyRunner(Runner):
                     Once,
                     [PushDownPredicates(), FoldProjections(), DropRepartition()],
                 ),
+                RuleBatch(
+                    "PushDownClausesIntoScan",
+                    FixedPointPolicy(3),
+                    [PruneColumns(), PushDownClausesIntoScan()],
+                ),
                 RuleBatch(
                     "PushDownLimits",
                     FixedPointPolicy(3),
@@ -193,7 +235,11 @@ class PyRunner(Runner):
                     )
                 else:
                     result_partition_set = self._part_op_runner.run_node_list(
-                        input_partition_set, exec_op.logical_ops, exec_op.num_partitions, exec_op.resource_request()
+                        input_partition_set,
+                        exec_op.logical_ops,
+                        exec_op.num_partitions,
+                        exec_op.resource_request(),
+                        limit=exec_op.limit,
                     )
 
                 for child_id in data_deps:
@@ -1,28 +1,40 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable, ClassVar, Dict, List, Optional, Type
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, Type
 
 import pandas as pd
+import pyarrow as pa
 import ray
 
+from daft.config import DaftSettings
 from daft.execution.execution_plan import ExecutionPlan
 from daft.execution.logical_op_runners import (
     LogicalGlobalOpRunner,
     LogicalPartitionOpRunner,
     ReduceType,
+    partition_key_range,
 )
+from daft.expressions import Expression
 from daft.internal.rule_runner import FixedPointPolicy, Once, RuleBatch, RuleRunner
 from daft.logical.logical_plan import LogicalPlan
 from daft.logical.optimizer import (
     DropRepartition,
     FoldProjections,
+    PruneColumns,
+    PushDownClausesIntoScan,
     PushDownLimit,
     PushDownPredicates,
 )
 from daft.logical.schema import ExpressionList
 from daft.resource_request import ResourceRequest
-from daft.runners.partitioning import PartID, PartitionManager, PartitionSet, vPartition
+from daft.runners.partitioning import (
+    PartID,
+    PartitionManager,
+    PartitionSet,
+    concat_arrow_tables,
+    vPartition,
+)
 from daft.runners.profiler import profiler
 from daft.runners.runner import Runner
 from daft.runners.shuffle_ops import (
@@ -47,6 +59,11 @@ class RayPartitionSet(PartitionSet[ray.ObjectRef]):
         part_dfs = [part.to_pandas(schema=schema) for part in all_partitions]
         return pd.concat([pdf for pdf in part_dfs if not pdf.empty], ignore_index=True)
 
+    def to_arrow(self, schema: Optional[ExpressionList] = None) -> pa.Table:
+        partition_ids = sorted(list(self._partitions.keys()))
+        all_partitions = ray.get([self._partitions[pid] for pid in partition_ids])
+        return concat_arrow_tables([part.to_arrow(schema=schema) for part in all_partitions])
+
     def get_partition(self, idx: PartID) -> ray.ObjectRef:
         return self._partitions[idx]
 
@@ -148,10 +165,31 @@ def _ray_partition_single_part_runner(
     nodes: List[LogicalPlan],
     partition_id: int,
 ) -> vPartition:
-    input_partitions = {id: val for id, val in zip(input_node_ids, input_parts)}
+    # Inputs that are read from many partitions have a node ID per partition, and their partitions are merged
+    parts_by_node_id: Dict[int, List[vPartition]] = {}
+    for id, val in zip(input_node_ids, input_parts):
+        parts_by_node_id.setdefault(id, []).append(val)
+    input_partitions = {
+        id: vPartition.merge_partitions(parts, verify_partition_id=False) for id, parts in parts_by_node_id.items()
+    }
     return op_runner.run_node_list_single_partition(input_partitions, nodes=nodes, partition_id=partition_id)
 
 
+@ray.remote
+def _ray_partition_len(part: vPartition) -> int:
+    return len(part)
+
+
+@ray.remote
+def _ray_partition_key_range(part: vPartition, expr: Expression) -> Optional[Tuple[Any, Any]]:
+    return partition_key_range(part, expr)
+
+
+@ray.remote
+def _ray_empty_partition(part: vPartition, partition_id: int) -> vPartition:
+    return part.empty_like(partition_id=partition_id)
+
+
 def _get_ray_task_options(resource_request: ResourceRequest) -> Dict[str, Any]:
     options = {}
     if resource_request.num_cpus is not None:
@@ -168,18 +206,50 @@ class RayLogicalPartitionOpRunner(LogicalPartitionOpRunner):
         nodes: List[LogicalPlan],
         num_partitions: int,
         resource_request: ResourceRequest,
+        limit: Optional[int] = None,
     ) -> PartitionSet:
         single_part_runner = _ray_partition_single_part_runner.options(**_get_ray_task_options(resource_request))
-        node_ids = list(inputs.keys())
-        results = []
-        for i in range(num_partitions):
-            input_partitions = [inputs[nid].get_partition(i) for nid in node_ids]
-            result_partition = single_part_runner.remote(
-                *input_partitions, input_node_ids=node_ids, op_runner=self, nodes=nodes, partition_id=i
+        # A broadcast input is a single object in the object store, which is referenced by the task of every partition
+        input_partition_ids = self._input_partition_ids(inputs, nodes, num_partitions)
+
+        def run_partition(i: int) -> ray.ObjectRef:
+            input_partitions = []
+            input_node_ids = []
+            for nid, pset in inputs.items():
+                partition_ids = input_partition_ids[nid][i]
+                if len(partition_ids) == 0:
+                    input_partitions.append(_ray_empty_partition.remote(pset.get_partition(0), i))
+                    input_node_ids.append(nid)
+                for pid in partition_ids:
+                    input_partitions.append(pset.get_partition(pid))
+                    input_node_ids.append(nid)
+            result: ray.ObjectRef = single_part_runner.remote(
+                *input_partitions, input_node_ids=input_node_ids, op_runner=self, nodes=nodes, partition_id=i
             )
-            results.append(result_partition)
+            return result
+
+        if limit is None:
+            return RayPartitionSet({i: run_partition(i) for i in range(num_partitions)})
+
+        # Partitions are launched in waves, starting with one partition and multiplying the number of launched
+        # partitions by DAFT_LIMIT_SCALE_UP_FACTOR, until the computed partitions produce enough rows for the limit
+        results: List[ray.ObjectRef] = []
+        num_rows = 0
+        while len(results) < num_partitions and (len(results) == 0 or num_rows < limit):
+            num_to_launch = max(len(results) * (DaftSettings.DAFT_LIMIT_SCALE_UP_FACTOR - 1), 1)
+            wave = [run_partition(i) for i in range(len(results), min(len(results) + num_to_launch, num_partitions))]
+            results.extend(wave)
+            num_rows += sum(ray.get([_ray_partition_len.remote(part) for part in wave]))
+        for i in range(len(results), num_partitions):
+            results.append(_ray_empty_partition.remote(results[0], i))
         return RayPartitionSet({i: part for i, part in enumerate(results)})
 
+    def _key_ranges(self, pset: PartitionSet, expr: Expression) -> List[Optional[Tuple[Any, Any]]]:
+        key_ranges: List[Optional[Tuple[Any, Any]]] = ray.get(
+            [_ray_partition_key_range.remote(pset.get_partition(i), expr) for i in range(pset.num_partitions())]
+        )
+        return key_ranges
+
 
 class RayLogicalGlobalOpRunner(LogicalGlobalOpRunner):
     shuffle_ops: ClassVar[Dict[Type[ShuffleOp], Type[Shuffler]]] = {
@@ -217,6 +287,11 @@ class RayRunner(Runner):
                     Once,
                     [PushDownPredicates(), FoldProjections(), DropRepartition()],
                 ),
+                RuleBatch(
+                    "PushDownClausesIntoScan",
+                    FixedPointPolicy(3),
+                    [PruneColumns(), PushDownClausesIntoScan()],
+                ),
                 RuleBatch(
                     "PushDownLimits",
                     FixedPointPolicy(3),
@@ -241,7 +316,11 @@ class RayRunner(Runner):
                     )
                 else:
                     result_partition_set = self._part_op_runner.run_node_list(
-                        input_partition_set, exec_op.logical_ops, exec_op.num_partitions, exec_op.resource_request()
+                        input_partition_set,
+                        exec_op.logical_ops,
+                        exec_op.num_partitions,
+                        exec_op.resource_request(),
+                        limit=exec_op.limit,
                     )
                 del input_partition_set
                 for child_id in data_deps:
@@ -0,0 +1,35 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from daft.dataframe import DataFrame
+
+NUM_ROWS = 300
+
+
+@pytest.fixture(scope="function")
+def large_values() -> DataFrame:
+    # Values whose mean is large compared to their spread, where sums of squares lose the variance to cancellation
+    table = pa.table({"group": [i % 2 for i in range(NUM_ROWS)], "x": [1e9 + i % 3 for i in range(NUM_ROWS)]})
+    return DataFrame.from_arrow(table, num_partitions=4)
+
+
+def test_variance_of_large_values(large_values: DataFrame) -> None:
+    x = np.array([1e9 + i % 3 for i in range(NUM_ROWS)])
+    pd_df = large_values.agg([("x", "variance")]).to_pandas()
+    assert pd_df["x"][0] == pytest.approx(np.var(x, ddof=1))
+    pd_df = large_values.agg([("x", "stddev")]).to_pandas()
+    assert pd_df["x"][0] == pytest.approx(np.std(x, ddof=1))
+
+
+def test_variance_of_large_values_groupby(large_values: DataFrame) -> None:
+    x = np.array([1e9 + i % 3 for i in range(NUM_ROWS)])
+    groups = np.arange(NUM_ROWS) % 2
+    pd_df = large_values.groupby("group").agg([("x", "variance")]).sort("group").to_pandas()
+    assert pd_df["x"].tolist() == pytest.approx([np.var(x[groups == g], ddof=1) for g in range(2)])
+
+
+def test_variance_of_single_value() -> None:
+    df = DataFrame.from_pydict({"group": [0, 1, 1], "x": [1.0, 2.0, 4.0]})
+    pd_df = df.groupby("group").agg([("x", "variance")]).sort("group").to_pandas()
+    assert np.isnan(pd_df["x"][0]) and pd_df["x"][1] == 2.0
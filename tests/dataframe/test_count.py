@@ -0,0 +1,73 @@
+import pathlib
+from typing import List
+
+import pyarrow as pa
+import pytest
+from pyarrow import parquet
+
+from daft.config import DaftSettings
+from daft.dataframe import DataFrame
+from daft.execution import scan_operators
+from daft.expressions import col
+
+ROWS_PER_FILE = 10
+
+
+@pytest.fixture(scope="function")
+def hive_parquet_dir(tmp_path: pathlib.Path) -> str:
+    for region in ["us", "eu", "apac"]:
+        (tmp_path / f"region={region}").mkdir()
+        table = pa.table({"id": list(range(ROWS_PER_FILE)), "name": [f"{region}-{i}" for i in range(ROWS_PER_FILE)]})
+        parquet.write_table(table, str(tmp_path / f"region={region}" / "data.parquet"), row_group_size=3)
+    return str(tmp_path)
+
+
+@pytest.fixture(scope="function")
+def columns_read(monkeypatch) -> List[List[str]]:
+    columns_read = []
+    iter_parquet = scan_operators.iter_parquet
+
+    def recording_iter_parquet(split, columns, *args, **kwargs):
+        columns_read.append(columns)
+        return iter_parquet(split, columns, *args, **kwargs)
+
+    monkeypatch.setattr(scan_operators, "iter_parquet", recording_iter_parquet)
+    return columns_read
+
+
+def test_count_from_metadata(hive_parquet_dir: str, columns_read: List[List[str]]) -> None:
+    df = DataFrame.from_parquet(hive_parquet_dir)
+    assert df.count() == 3 * ROWS_PER_FILE
+    assert df.where(col("region") == "eu").count() == ROWS_PER_FILE
+    assert df.where(col("region") != "eu").select("name").count() == 2 * ROWS_PER_FILE
+    assert df.where(col("region") == "africa").count() == 0
+    # The counts are read from the footers, so no data is read
+    assert columns_read == []
+
+
+@pytest.mark.parametrize(
+    ["predicate", "expected"],
+    [
+        (col("id") < 4, 3 * 4),
+        ((col("id") < 4) & (col("region") == "eu"), 4),
+        (col("id") > 100, 0),
+        ((col("id") + 1) % 2 == 0, 3 * ROWS_PER_FILE // 2),
+    ],
+)
+def test_count_with_filter(hive_parquet_dir: str, predicate, expected: int) -> None:
+    assert DataFrame.from_parquet(hive_parquet_dir).where(predicate).count() == expected
+
+
+@pytest.mark.skipif(DaftSettings.DAFT_RUNNER.upper() != "PY", reason="requires PyRunner to be in use")
+def test_count_reads_one_column(hive_parquet_dir: str, columns_read: List[List[str]]) -> None:
+    df = DataFrame.from_parquet(hive_parquet_dir).where(col("id") >= 5)
+    assert df.count() == 3 * 5
+    assert all(columns == ["id"] for columns in columns_read)
+
+
+def test_count_in_memory() -> None:
+    df = DataFrame.from_pydict({"x": [1, 2, None, 4], "obj": [object() for _ in range(4)]})
+    assert df.count() == 4
+    assert df.where(col("x") > 1).count() == 2
+    assert df.select("obj").limit(3).count() == 3
+    assert df.collect().count() == 4
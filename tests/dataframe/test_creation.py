@@ -1,8 +1,16 @@
 import csv
+import dataclasses
 import tempfile
 from typing import Dict, List
 
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from daft.config import DaftSettings
 from daft.dataframe import DataFrame
+from daft.datasources import InMemorySourceInfo
+from daft.logical import logical_plan
 
 
 def test_create_dataframe(valid_data: List[Dict[str, float]]) -> None:
@@ -16,6 +24,78 @@ def test_create_dataframe_pydict(valid_data: List[Dict[str, float]]) -> None:
     assert df.column_names() == ["sepal_length", "sepal_width", "petal_length", "petal_width", "variety"]
 
 
+def test_create_dataframe_pydict_converts_to_arrow_once() -> None:
+    class MyObj:
+        pass
+
+    objs = [MyObj() for _ in range(10)]
+    df = DataFrame.from_pydict({"a": list(range(10)), "obj": objs})
+    source_info = df.plan()._source_info
+    assert isinstance(source_info, InMemorySourceInfo)
+    assert source_info.table == pa.table({"a": list(range(10))})
+    assert source_info.py_columns == {"obj": objs}
+
+
+def test_in_memory_partitions_are_balanced_slices() -> None:
+    df = DataFrame.from_pydict({"a": list(range(10))})
+    source_info = df.plan()._source_info
+    assert isinstance(source_info, InMemorySourceInfo)
+    scan = logical_plan.Scan(
+        schema=df.plan()._schema.unresolve(),
+        source_info=InMemorySourceInfo(table=source_info.table, num_partitions=3),
+    )
+    df = DataFrame(scan).collect()
+    # No rows are dropped when the number of rows is not a multiple of the number of partitions
+    assert df._result is not None and df._result.len_of_partitions() == [3, 3, 4]
+    assert sorted(df.to_pandas()["a"].tolist()) == list(range(10))
+
+
+@pytest.mark.parametrize("num_partitions", [1, 3])
+def test_create_dataframe_arrow(num_partitions: int) -> None:
+    table = pa.table({"a": list(range(10)), "b": [str(i) for i in range(10)], "nested": [[i] for i in range(10)]})
+    df = DataFrame.from_arrow(table, num_partitions=num_partitions)
+    assert df.column_names() == ["a", "b", "nested"]
+
+    source_info = df.plan()._source_info
+    assert isinstance(source_info, InMemorySourceInfo)
+    assert source_info.num_partitions == num_partitions
+    # Supported columns are not copied, and nested columns are read as Python objects
+    assert source_info.table["a"].chunks[0].buffers()[1].address == table["a"].chunks[0].buffers()[1].address
+    assert source_info.py_columns == {"nested": [[i] for i in range(10)]}
+
+    assert df.to_arrow().select(["a", "b"]) == table.select(["a", "b"])
+
+
+def test_create_dataframe_arrow_batches() -> None:
+    batches = [pa.RecordBatch.from_pydict({"a": [i, i + 1]}) for i in range(0, 6, 2)]
+    df = DataFrame.from_arrow(batches, num_partitions=2)
+    assert df.to_arrow()["a"].to_pylist() == list(range(6))
+
+
+def test_create_dataframe_pandas() -> None:
+    @dataclasses.dataclass
+    class MyObj:
+        x: int
+
+    objs = [MyObj(i) for i in range(4)]
+    pd_df = pd.DataFrame({"a": [1, 2, 3, 4], "b": [0.5, None, 1.5, 2.0], "obj": objs}, index=[10, 11, 12, 13])
+    df = DataFrame.from_pandas(pd_df, num_partitions=2)
+    assert df.column_names() == ["a", "b", "obj"]
+    result = df.to_pandas()
+    assert result["a"].tolist() == [1, 2, 3, 4]
+    assert result["b"].isnull().tolist() == [False, True, False, False]
+    assert result["obj"].tolist() == objs
+
+
+@pytest.mark.skipif(DaftSettings.DAFT_RUNNER.upper() != "PY", reason="requires PyRunner to be in use")
+def test_to_arrow_without_copying_partitions() -> None:
+    table = pa.table({"a": list(range(10))})
+    result = DataFrame.from_arrow(table, num_partitions=3).to_arrow()
+    assert result == table
+    assert [len(chunk) for chunk in result["a"].chunks] == [3, 3, 4]
+    assert result["a"].chunks[0].buffers()[1].address == table["a"].chunks[0].buffers()[1].address
+
+
 def test_create_dataframe_csv(valid_data: List[Dict[str, float]]) -> None:
     with tempfile.NamedTemporaryFile("w") as f:
         header = list(valid_data[0].keys())
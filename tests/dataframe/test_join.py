@@ -0,0 +1,191 @@
+import decimal
+import pathlib
+from typing import Optional
+
+import pyarrow as pa
+import pytest
+from pyarrow import parquet
+
+from daft.config import DaftSettings
+from daft.dataframe import DataFrame
+from daft.expressions import col
+from daft.logical import logical_plan
+
+NUM_FACTS = 100
+NUM_COUNTRIES = 5
+
+
+@pytest.fixture(scope="function")
+def facts() -> DataFrame:
+    table = pa.table({"id": list(range(NUM_FACTS)), "country_id": [i % (NUM_COUNTRIES + 1) for i in range(NUM_FACTS)]})
+    return DataFrame.from_arrow(table, num_partitions=4)
+
+
+@pytest.fixture(scope="function")
+def countries() -> DataFrame:
+    table = pa.table({"country_id": list(range(NUM_COUNTRIES)), "name": [f"country-{i}" for i in range(NUM_COUNTRIES)]})
+    return DataFrame.from_arrow(table, num_partitions=2)
+
+
+def _expected_rows():
+    return sorted(
+        (i, i % (NUM_COUNTRIES + 1), f"country-{i % (NUM_COUNTRIES + 1)}")
+        for i in range(NUM_FACTS)
+        if i % (NUM_COUNTRIES + 1) < NUM_COUNTRIES
+    )
+
+
+def _rows(df: DataFrame):
+    pd_df = df.to_pandas()
+    return sorted(zip(pd_df["id"], pd_df["country_id"], pd_df["name"]))
+
+
+def test_join_broadcasts_small_side(facts: DataFrame, countries: DataFrame) -> None:
+    joined = facts.join(countries, on="country_id")
+    join = joined.plan()
+    assert isinstance(join, logical_plan.Join)
+    assert join._strategy == logical_plan.JoinStrategy.BROADCAST
+    # The smaller right side is gathered into a single partition, and the left side is not repartitioned
+    assert join.broadcast_child() is join._children()[1]
+    assert isinstance(join._children()[1], logical_plan.Coalesce)
+    assert join.num_partitions() == facts.plan().num_partitions()
+    assert _rows(joined) == _expected_rows()
+
+
+def test_join_broadcasts_left_side(facts: DataFrame, countries: DataFrame) -> None:
+    joined = countries.join(facts, on="country_id")
+    join = joined.plan()
+    assert isinstance(join, logical_plan.Join)
+    assert join.broadcast_child() is join._children()[0]
+    assert join.num_partitions() == facts.plan().num_partitions()
+    assert _rows(joined) == _expected_rows()
+
+
+def test_join_hash_over_threshold(facts: DataFrame, countries: DataFrame, monkeypatch) -> None:
+    monkeypatch.setattr(DaftSettings, "DAFT_BROADCAST_JOIN_THRESHOLD_BYTES", 0)
+    joined = facts.join(countries, on="country_id")
+    join = joined.plan()
+    assert isinstance(join, logical_plan.Join)
+    assert join._strategy == logical_plan.JoinStrategy.HASH
+    assert join.broadcast_child() is None
+    assert all(isinstance(child, logical_plan.Repartition) for child in join._children())
+    assert _rows(joined) == _expected_rows()
+
+
+@pytest.mark.parametrize("strategy", ["hash", "broadcast"])
+def test_join_strategy_override(facts: DataFrame, countries: DataFrame, strategy: str) -> None:
+    joined = facts.join(countries, on="country_id", strategy=strategy)
+    join = joined.plan()
+    assert isinstance(join, logical_plan.Join)
+    assert join._strategy == logical_plan.JoinStrategy(strategy)
+    assert _rows(joined) == _expected_rows()
+
+
+@pytest.mark.parametrize("strategy", [None, "hash", "broadcast"])
+def test_join_after_sort_with_empty_partitions(strategy: Optional[str]) -> None:
+    # Sorting more partitions than there are rows leaves some partitions without any chunks
+    left = DataFrame.from_pydict({"key": [1, 2], "id": [0, 1]}).repartition(6).sort("key")
+    joined = left.join(DataFrame.from_pydict({"key": [1]}), on="key", strategy=strategy)
+    assert joined.to_pandas()["id"].tolist() == [0]
+
+
+@pytest.mark.parametrize("strategy", ["hash", "broadcast"])
+def test_join_rebuild_keeps_repartitions_of_inputs(facts: DataFrame, countries: DataFrame, strategy: str) -> None:
+    join = facts.repartition(3).join(countries, on="country_id", strategy=strategy).plan()
+    rebuilt = join.rebuild()
+    assert rebuilt.is_disjoint(join)
+    # Only the exchanges that the Join added are replaced, so the Repartition of the left side is kept
+    shape = [(type(node), node.num_partitions()) for node in join.post_order()]
+    assert [(type(node), node.num_partitions()) for node in rebuilt.post_order()] == shape
+
+
+def test_join_unknown_strategy(facts: DataFrame, countries: DataFrame) -> None:
+    with pytest.raises(ValueError):
+        facts.join(countries, on="country_id", strategy="nested_loop")
+
+
+def test_estimate_size_bytes_of_files(tmp_path: pathlib.Path, countries: DataFrame) -> None:
+    parquet.write_table(countries.to_arrow(), str(tmp_path / "countries.parquet"))
+    df = DataFrame.from_parquet(str(tmp_path))
+    size_bytes = (tmp_path / "countries.parquet").stat().st_size
+    assert logical_plan.estimate_size_bytes(df.plan()) == size_bytes
+    # Only the fraction of the columns that are read is counted
+    assert logical_plan.estimate_size_bytes(df.select("name").plan()) == size_bytes // 2
+    assert logical_plan.estimate_size_bytes(df.groupby("name").agg([("country_id", "sum")]).plan()) is None
+
+
+@pytest.mark.parametrize("desc", [False, True])
+def test_join_sort_merge(facts: DataFrame, countries: DataFrame, desc: bool) -> None:
+    sorted_facts = facts.sort("country_id", desc=desc)
+    sorted_countries = countries.repartition(3).sort("country_id", desc=desc)
+    joined = sorted_facts.join(sorted_countries, on="country_id")
+    join = joined.plan()
+    assert isinstance(join, logical_plan.Join)
+    assert join._strategy == logical_plan.JoinStrategy.SORT_MERGE
+    assert join.sorted_desc() == desc
+    # Neither side is repartitioned, and the output keeps the order of the left side
+    assert join._children()[0] is sorted_facts.plan() and join._children()[1] is sorted_countries.plan()
+    assert join.partition_spec().scheme == logical_plan.PartitionScheme.RANGE
+    assert _rows(joined) == _expected_rows()
+    country_ids = joined.to_pandas()["country_id"].tolist()
+    assert country_ids == sorted(country_ids, reverse=desc)
+
+
+def test_join_sort_merge_requires_same_order(facts: DataFrame, countries: DataFrame) -> None:
+    joined = facts.sort("country_id").join(countries.sort("country_id", desc=True), on="country_id")
+    join = joined.plan()
+    assert isinstance(join, logical_plan.Join)
+    assert join._strategy != logical_plan.JoinStrategy.SORT_MERGE
+    assert _rows(joined) == _expected_rows()
+
+    with pytest.raises(ValueError):
+        facts.sort("id").join(countries.sort("country_id"), on="country_id", strategy="sort_merge")
+
+
+def test_join_sort_merge_requires_sorted_partitions(facts: DataFrame, countries: DataFrame) -> None:
+    # A broadcast Join keeps the partitions of the sorted side, but not the order of their rows
+    broadcast = facts.sort("id").join(countries, on="country_id", strategy="broadcast")
+    assert broadcast.plan().partition_spec().scheme != logical_plan.PartitionScheme.RANGE
+    ids = DataFrame.from_pydict({"fact_id": list(range(NUM_FACTS + 1))}).repartition(3).sort("fact_id")
+    joined = broadcast.join(ids, left_on="id", right_on="fact_id")
+    join = joined.plan()
+    assert isinstance(join, logical_plan.Join)
+    assert join._strategy != logical_plan.JoinStrategy.SORT_MERGE
+    assert _rows(joined) == _expected_rows()
+
+    # A Filter keeps the order of the sorted rows below it
+    sorted_facts = facts.sort("id").where(col("id") >= 0)
+    filtered = sorted_facts.join(ids.where(col("fact_id") >= 0), left_on="id", right_on="fact_id")
+    assert filtered.plan()._strategy == logical_plan.JoinStrategy.SORT_MERGE
+    assert filtered.to_pandas()["id"].tolist() == list(range(NUM_FACTS))
+
+
+@pytest.mark.parametrize(
+    "left_key,right_key",
+    [
+        pytest.param(
+            pa.array([decimal.Decimal(f"{i}.5") for i in range(NUM_COUNTRIES)]),
+            pa.array([decimal.Decimal(f"{i}.5") for i in range(0, 2 * NUM_COUNTRIES, 2)]),
+            id="decimal",
+        ),
+        pytest.param(
+            pa.array(list(range(NUM_COUNTRIES)), type=pa.timestamp("s")),
+            pa.array(list(range(0, 2000 * NUM_COUNTRIES, 2000)), type=pa.timestamp("ms")),
+            id="timestamp_units",
+        ),
+    ],
+)
+@pytest.mark.parametrize("desc", [False, True])
+# Sorting more partitions than there are rows leaves some partitions without any chunks
+@pytest.mark.parametrize("num_partitions", [2, NUM_COUNTRIES + 3])
+def test_join_sort_merge_falls_back_to_hash_join(
+    left_key: pa.Array, right_key: pa.Array, desc: bool, num_partitions: int
+) -> None:
+    # Keys that the merge kernel cannot compare are hash joined within each pair of partitions
+    left = DataFrame.from_arrow(pa.table({"key": left_key, "id": list(range(NUM_COUNTRIES))}), num_partitions=2)
+    right = DataFrame.from_arrow(pa.table({"other_key": right_key}), num_partitions=2)
+    left, right = left.repartition(num_partitions), right.repartition(num_partitions)
+    joined = left.sort("key", desc=desc).join(right.sort("other_key", desc=desc), left_on="key", right_on="other_key")
+    assert joined.plan()._strategy == logical_plan.JoinStrategy.SORT_MERGE
+    ids = joined.to_pandas()["id"].tolist()
+    assert ids == sorted([0, 2, 4], reverse=desc)
@@ -1,8 +1,20 @@
+import pathlib
 from typing import Dict, List
 
+import pyarrow as pa
+import pytest
+from pyarrow import parquet
+
+from daft.config import DaftSettings
 from daft.dataframe import DataFrame
+from daft.execution import scan_operators
 from daft.expressions import col
+from daft.internal.rule_runner import FixedPointPolicy, RuleBatch, RuleRunner
 from daft.logical import logical_plan
+from daft.logical.optimizer import PushDownLimit
+
+NUM_FILES = 10
+ROWS_PER_FILE = 10
 
 
 def test_limit(valid_data: List[Dict[str, float]]) -> None:
@@ -14,3 +26,80 @@ def test_limit(valid_data: List[Dict[str, float]]) -> None:
     df = df.limit(10)
 
     assert isinstance(df.plan(), logical_plan.GlobalLimit)
+
+
+def test_limit_pushed_into_scan(valid_data: List[Dict[str, float]]) -> None:
+    optimizer = RuleRunner([RuleBatch("PushDownLimits", FixedPointPolicy(3), [PushDownLimit()])])
+    df = DataFrame.from_pylist(valid_data).select("sepal_length").limit(10)
+    optimized = optimizer(df.plan())
+
+    # Both limits are pushed below the Projection, and the LocalLimit into the Scan
+    assert isinstance(optimized, logical_plan.Projection)
+    global_limit = optimized._children()[0]
+    assert isinstance(global_limit, logical_plan.GlobalLimit)
+    scan = global_limit._children()[0]
+    assert isinstance(scan, logical_plan.Scan)
+    assert scan._limit == 10
+
+
+@pytest.fixture(scope="function")
+def parquet_files(tmp_path: pathlib.Path, monkeypatch) -> str:
+    # Every file is read as its own partition
+    monkeypatch.setattr(DaftSettings, "DAFT_SCAN_PARTITION_SIZE_BYTES", 1)
+    for i in range(NUM_FILES):
+        table = pa.table({"id": list(range(i * ROWS_PER_FILE, (i + 1) * ROWS_PER_FILE))})
+        parquet.write_table(table, str(tmp_path / f"part-{i:02}.parquet"))
+    return str(tmp_path)
+
+
+@pytest.fixture(scope="function")
+def files_read(monkeypatch) -> List[str]:
+    files_read = []
+    iter_parquet = scan_operators.iter_parquet
+
+    def recording_iter_parquet(split, *args, **kwargs):
+        files_read.append(split.path)
+        return iter_parquet(split, *args, **kwargs)
+
+    monkeypatch.setattr(scan_operators, "iter_parquet", recording_iter_parquet)
+    return files_read
+
+
+@pytest.mark.parametrize(
+    ["predicate", "num", "expected"],
+    [
+        (None, 5, list(range(5))),
+        (None, 25, list(range(25))),
+        (col("id") >= 45, 3, [45, 46, 47]),
+        (col("id") % 7 == 0, 4, [0, 7, 14, 21]),
+        (col("id") < 0, 4, []),
+    ],
+)
+def test_limit_over_partitions(parquet_files: str, predicate, num: int, expected: List[int]) -> None:
+    df = DataFrame.from_parquet(parquet_files)
+    if predicate is not None:
+        df = df.where(predicate)
+    df = df.limit(num).collect()
+    assert df._result is not None
+    assert df._result.num_partitions() == NUM_FILES
+    assert df.to_arrow()["id"].to_pylist() == expected
+
+
+@pytest.mark.skipif(DaftSettings.DAFT_RUNNER.upper() != "PY", reason="requires PyRunner to be in use")
+@pytest.mark.parametrize(
+    ["predicate", "num", "num_files_read"],
+    [
+        (None, 5, 1),
+        (None, 25, 3),
+        (col("id") >= 45, 3, 5),
+        (col("id") < 0, 3, NUM_FILES),
+    ],
+)
+def test_limit_stops_reading_partitions(
+    parquet_files: str, files_read: List[str], predicate, num: int, num_files_read: int
+) -> None:
+    df = DataFrame.from_parquet(parquet_files)
+    if predicate is not None:
+        df = df.where(predicate)
+    df.limit(num).collect()
+    assert len(files_read) == num_files_read
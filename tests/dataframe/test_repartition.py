@@ -0,0 +1,9 @@
+from daft.dataframe import DataFrame
+
+
+def test_hash_repartition_after_sort_with_empty_partitions() -> None:
+    # Sorting more partitions than there are rows leaves some partitions without any chunks
+    df = DataFrame.from_pydict({"key": [2, 1, 2], "id": [0, 1, 2]}).repartition(6).sort("key")
+    repartitioned = df.repartition(3, "key")
+    assert repartitioned.plan().num_partitions() == 3
+    assert sorted(repartitioned.to_pandas()["id"].tolist()) == [0, 1, 2]
@@ -1,15 +1,20 @@
+import pathlib
 from typing import Dict, List
 
+import pyarrow as pa
 import pytest
+from pyarrow import csv, parquet
 
+from daft.config import DaftSettings
 from daft.dataframe import DataFrame
 from daft.datasources import InMemorySourceInfo
 from daft.expressions import col
-from daft.internal.rule_runner import Once, RuleBatch, RuleRunner
+from daft.internal.rule_runner import FixedPointPolicy, Once, RuleBatch, RuleRunner
 from daft.logical import logical_plan
 from daft.logical.logical_plan import LogicalPlan
 from daft.logical.optimizer import (
     FoldProjections,
+    PruneColumns,
     PushDownClausesIntoScan,
     PushDownPredicates,
 )
@@ -35,7 +40,9 @@ def test_filter_scan_pushdown(valid_data: List[Dict[str, float]], optimizer) ->
         schema=original_schema,
         predicate=ExpressionList([predicate_expr]),
         columns=None,
-        source_info=InMemorySourceInfo(data={header: [row[header] for row in valid_data] for header in valid_data[0]}),
+        source_info=InMemorySourceInfo(
+            table=pa.table({header: [row[header] for row in valid_data] for header in valid_data[0]})
+        ),
     )
     assert isinstance(optimized, logical_plan.Scan)
     assert optimized.is_eq(expected)
@@ -53,6 +60,129 @@ def test_projection_scan_pushdown(valid_data: List[Dict[str, float]], optimizer)
         schema=original_schema,
         predicate=None,
         columns=selected_columns,
-        source_info=InMemorySourceInfo(data={header: [row[header] for row in valid_data] for header in valid_data[0]}),
+        source_info=InMemorySourceInfo(
+            table=pa.table({header: [row[header] for row in valid_data] for header in valid_data[0]})
+        ),
     )
     assert optimized.is_eq(expected)
+
+
+@pytest.fixture(scope="function")
+def pruning_optimizer() -> RuleRunner[LogicalPlan]:
+    return RuleRunner(
+        [
+            RuleBatch(
+                "prune_into_scan",
+                FixedPointPolicy(3),
+                [PushDownPredicates(), PruneColumns(), FoldProjections(), PushDownClausesIntoScan()],
+            )
+        ]
+    )
+
+
+def test_aliased_projection_scan_pushdown(valid_data: List[Dict[str, float]], optimizer) -> None:
+    df = DataFrame.from_pylist(valid_data)
+    df = df.select(col("sepal_length").alias("foo"))
+
+    optimized = optimizer(df.plan())
+    assert isinstance(optimized, logical_plan.Projection)
+    scan = optimized._children()[0]
+    assert isinstance(scan, logical_plan.Scan)
+    assert scan.schema().names == ["sepal_length"]
+
+
+def test_projection_pruned_through_filter(valid_data: List[Dict[str, float]], pruning_optimizer) -> None:
+    df = DataFrame.from_pylist(valid_data)
+    df = df.where(col("sepal_width") > 3.0).select("sepal_length")
+
+    optimized = pruning_optimizer(df.plan())
+    assert isinstance(optimized, logical_plan.Scan)
+    assert optimized.schema().names == ["sepal_length"]
+    assert optimized._predicate.required_columns().names == ["sepal_width"]
+
+
+def test_projection_pruned_through_aggregate(valid_data: List[Dict[str, float]], pruning_optimizer) -> None:
+    df = DataFrame.from_pylist(valid_data)
+    df = df.select("sepal_length", "sepal_width", "variety").sort("sepal_width")
+    plan = logical_plan.LocalAggregate(df.plan(), agg=[(col("sepal_length"), "sum")], group_by=None)
+
+    optimized = pruning_optimizer(plan)
+    scan = optimized
+    while not isinstance(scan, logical_plan.Scan):
+        scan = scan._children()[0]
+    assert sorted(scan.schema().names) == ["sepal_length", "sepal_width"]
+
+
+@pytest.fixture(scope="function")
+def hive_partitioned_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    for date in ["2022-08-01", "2022-08-02"]:
+        for region in ["us", "eu"]:
+            directory = tmp_path / f"date={date}" / f"region={region}"
+            directory.mkdir(parents=True)
+            table = pa.table({"id": [1, 2, 3], "value": [f"{date}-{region}-{i}" for i in range(3)]})
+            parquet.write_table(table, str(directory / "part-0.parquet"))
+            csv.write_csv(table, str(directory / "part-0.csv"))
+    return tmp_path
+
+
+@pytest.mark.parametrize("read", [DataFrame.from_parquet, DataFrame.from_csv])
+def test_hive_partition_columns(hive_partitioned_dir: pathlib.Path, read) -> None:
+    extension = "parquet" if read == DataFrame.from_parquet else "csv"
+    df = read(str(hive_partitioned_dir / "*" / "*" / f"*.{extension}"))
+    assert df.schema().column_names() == ["id", "value", "date", "region"]
+
+    pd_df = df.where((col("region") == "eu") & (col("id") > 1)).select("region", "date", "value").to_pandas()
+    assert sorted(pd_df.itertuples(index=False)) == [
+        ("eu", "2022-08-01", "2022-08-01-eu-1"),
+        ("eu", "2022-08-01", "2022-08-01-eu-2"),
+        ("eu", "2022-08-02", "2022-08-02-eu-1"),
+        ("eu", "2022-08-02", "2022-08-02-eu-2"),
+    ]
+
+
+def test_hive_partitions_pruned_at_planning(hive_partitioned_dir: pathlib.Path, optimizer) -> None:
+    for path in hive_partitioned_dir.glob("**/*.csv"):
+        path.unlink()
+    df = DataFrame.from_parquet(str(hive_partitioned_dir))
+    df = df.where((col("date") > "2022-08-01") & (col("region") != "us"))
+
+    optimized = optimizer(df.plan())
+    assert isinstance(optimized, logical_plan.Scan)
+    assert optimized._source_info.filepaths == [
+        str(hive_partitioned_dir / "date=2022-08-02" / "region=eu" / "part-0.parquet")
+    ]
+    assert optimized.num_partitions() == 1
+
+    # Only partition columns are selected, so no columns need to be read from the files
+    pd_df = df.select("date", "region").to_pandas()
+    assert pd_df.values.tolist() == [["2022-08-02", "eu"]] * 3
+
+
+def test_hive_partitions_all_pruned(hive_partitioned_dir: pathlib.Path, optimizer) -> None:
+    df = DataFrame.from_parquet(str(hive_partitioned_dir / "*" / "*" / "*.parquet"))
+    df = df.where(col("region") == "asia")
+
+    optimized = optimizer(df.plan())
+    assert isinstance(optimized, logical_plan.Scan)
+    assert optimized._source_info.filepaths == []
+    assert optimized.num_partitions() == 1
+    result = df.collect()._result
+    assert result is not None and result.len_of_partitions() == [0]
+
+
+def test_hive_partitions_pruned_below_operators(hive_partitioned_dir: pathlib.Path, optimizer, monkeypatch) -> None:
+    # Every file is planned into its own partition of the Scan
+    monkeypatch.setattr(DaftSettings, "DAFT_SCAN_PARTITION_SIZE_BYTES", 100)
+    df = DataFrame.from_parquet(str(hive_partitioned_dir / "*" / "*" / "*.parquet"))
+    assert df.plan().num_partitions() == 4
+
+    # Pruned partitions are kept empty, so the number of partitions of the operators above the Scan still holds
+    projected = df.with_column("id2", col("id") * 2).where(col("region") == "eu")
+    optimized = optimizer(projected.plan())
+    assert optimized.num_partitions() == 4
+    pd_df = projected.to_pandas()
+    assert sorted(pd_df["id2"].tolist()) == [2, 2, 4, 4, 6, 6]
+
+    aggregated = df.where(col("region") == "eu").groupby("date").agg([(col("id").alias("total"), "sum")])
+    pd_df = aggregated.sort("date").to_pandas()
+    assert pd_df.values.tolist() == [["2022-08-01", 6], ["2022-08-02", 6]]
@@ -0,0 +1,110 @@
+import pathlib
+
+import pyarrow as pa
+import pytest
+from pyarrow import parquet
+
+from daft.dataframe import DataFrame
+from daft.expressions import col
+
+NUM_ROWS = 100
+
+
+@pytest.fixture(scope="function")
+def df() -> DataFrame:
+    table = pa.table(
+        {
+            "id": list(range(NUM_ROWS)),
+            "name": [f"name-{i:03}" for i in range(NUM_ROWS)],
+            "region": [["us", "eu", None][i % 3] for i in range(NUM_ROWS)],
+        }
+    )
+    return DataFrame.from_arrow(table, num_partitions=3)
+
+
+def test_write_parquet(df: DataFrame, tmp_path: pathlib.Path) -> None:
+    written = df.write_parquet(str(tmp_path)).to_pandas()
+    assert written.columns.tolist() == ["path", "num_rows", "size_bytes", "column_stats"]
+    assert written["num_rows"].tolist() == [33, 33, 34]
+
+    for _, file in written.iterrows():
+        metadata = parquet.ParquetFile(file["path"]).metadata
+        assert metadata.num_rows == file["num_rows"]
+        assert pathlib.Path(file["path"]).stat().st_size == file["size_bytes"]
+    assert written["column_stats"][0]["id"] == {"min": 0, "max": 32, "null_count": 0}
+    assert written["column_stats"][2]["region"]["null_count"] == 11
+
+    read = DataFrame.from_parquet(str(tmp_path)).to_pandas()
+    assert sorted(read["id"].tolist()) == list(range(NUM_ROWS))
+
+
+def test_write_csv(df: DataFrame, tmp_path: pathlib.Path) -> None:
+    written = df.where(col("id") < 50).write_csv(str(tmp_path)).to_pandas()
+    assert sum(written["num_rows"]) == 50
+    assert all(path.endswith(".csv") for path in written["path"])
+
+    read = DataFrame.from_csv(str(tmp_path)).to_pandas()
+    assert sorted(read["name"].tolist()) == [f"name-{i:03}" for i in range(50)]
+
+
+def test_write_ipc(df: DataFrame, tmp_path: pathlib.Path) -> None:
+    written = df.write_ipc(str(tmp_path)).to_pandas()
+    assert written["num_rows"].tolist() == [33, 33, 34]
+    assert all(path.endswith(".arrow") for path in written["path"])
+
+    read = DataFrame.from_ipc(str(tmp_path))
+    assert read.schema().column_names() == ["id", "name", "region"]
+    result = read.where(col("id") >= 90).select("name", "id").to_pandas()
+    assert sorted(result["name"].tolist()) == [f"name-{i:03}" for i in range(90, NUM_ROWS)]
+
+
+_READERS = {
+    DataFrame.write_parquet: DataFrame.from_parquet,
+    DataFrame.write_csv: DataFrame.from_csv,
+    DataFrame.write_ipc: DataFrame.from_ipc,
+}
+
+
+@pytest.mark.parametrize("write", [DataFrame.write_parquet, DataFrame.write_csv, DataFrame.write_ipc])
+def test_write_partition_by(df: DataFrame, tmp_path: pathlib.Path, write) -> None:
+    written = write(df, str(tmp_path), partition_by=["region"]).to_pandas()
+    # Each of the 3 partitions has rows of every region
+    assert len(written) == 9
+    assert sorted({str(pathlib.Path(path).parent.relative_to(tmp_path)) for path in written["path"]}) == [
+        "region=__HIVE_DEFAULT_PARTITION__",
+        "region=eu",
+        "region=us",
+    ]
+    # Partition columns are only stored in the directory names
+    assert all(set(stats.keys()) == {"id", "name"} for stats in written["column_stats"])
+
+    read = _READERS[write](str(tmp_path))
+    eu_ids = read.where(col("region") == "eu").select("id").to_pandas()["id"].tolist()
+    assert sorted(eu_ids) == [i for i in range(NUM_ROWS) if i % 3 == 1]
+
+
+def test_write_partition_by_multiple_columns(df: DataFrame, tmp_path: pathlib.Path) -> None:
+    df = df.with_column("parity", col("id") % 2)
+    written = df.repartition(1).write_parquet(str(tmp_path), partition_by=["region", "parity"]).to_pandas()
+    assert [str(pathlib.Path(path).parent.relative_to(tmp_path)) for path in written["path"]] == [
+        "region=us/parity=0",
+        "region=eu/parity=1",
+        "region=__HIVE_DEFAULT_PARTITION__/parity=0",
+        "region=us/parity=1",
+        "region=eu/parity=0",
+        "region=__HIVE_DEFAULT_PARTITION__/parity=1",
+    ]
+    # Rows keep their order within each directory
+    ids = parquet.read_table(written["path"][2])["id"].to_pylist()
+    assert ids == [i for i in range(NUM_ROWS) if i % 3 == 2 and i % 2 == 0]
+
+
+def test_write_target_file_size(df: DataFrame, tmp_path: pathlib.Path) -> None:
+    written = df.write_parquet(str(tmp_path), target_file_size=256).to_pandas()
+    assert len(written) > 3
+    assert sum(written["num_rows"]) == NUM_ROWS
+
+
+def test_write_partition_by_unknown_column(df: DataFrame, tmp_path: pathlib.Path) -> None:
+    with pytest.raises(ValueError):
+        df.write_parquet(str(tmp_path), partition_by=["country"])
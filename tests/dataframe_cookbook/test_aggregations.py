@@ -96,3 +96,168 @@ def test_sum_groupby_sorted(daft_df, sort_desc, service_requests_csv_pd_df, repa
     ).reset_index()
     daft_pd_df = daft_df.to_pandas()
     assert_df_equals(daft_pd_df, service_requests_csv_pd_df, assert_ordering=True)
+
+
+@parametrize_service_requests_csv_repartition
+@parametrize_service_requests_csv_daft_df
+def test_global_aggs(daft_df, service_requests_csv_pd_df, repartition_nparts):
+    """Mixed aggregations across entire columns for the entire table"""
+    daft_df = daft_df.repartition(repartition_nparts).agg(
+        [
+            (col("Unique Key").alias("unique_key_min"), "min"),
+            (col("Unique Key").alias("unique_key_max"), "max"),
+            (col("Borough").alias("borough_min"), "min"),
+            (col("Borough").alias("borough_count_distinct"), "count_distinct"),
+            (col("Unique Key").alias("unique_key_variance"), "variance"),
+            (col("Unique Key").alias("unique_key_stddev"), "stddev"),
+        ]
+    )
+    service_requests_csv_pd_df = pd.DataFrame.from_records(
+        [
+            {
+                "unique_key_min": service_requests_csv_pd_df["Unique Key"].min(),
+                "unique_key_max": service_requests_csv_pd_df["Unique Key"].max(),
+                "borough_min": service_requests_csv_pd_df["Borough"].min(),
+                "borough_count_distinct": service_requests_csv_pd_df["Borough"].nunique(),
+                "unique_key_variance": service_requests_csv_pd_df["Unique Key"].var(),
+                "unique_key_stddev": service_requests_csv_pd_df["Unique Key"].std(),
+            }
+        ]
+    )
+    daft_pd_df = daft_df.to_pandas()
+    assert_df_equals(daft_pd_df, service_requests_csv_pd_df, sort_key="unique_key_min")
+
+
+@parametrize_service_requests_csv_repartition
+@parametrize_service_requests_csv_daft_df
+@pytest.mark.parametrize(
+    "keys",
+    [
+        pytest.param(["Borough"], id="NumGroupByKeys:1"),
+        pytest.param(["Borough", "Complaint Type"], id="NumGroupByKeys:2"),
+    ],
+)
+def test_aggs_groupby(daft_df, service_requests_csv_pd_df, repartition_nparts, keys):
+    """Mixed aggregations across groups"""
+    daft_df = (
+        daft_df.repartition(repartition_nparts)
+        .groupby(*[col(k) for k in keys])
+        .agg(
+            [
+                (col("Unique Key").alias("unique_key_min"), "min"),
+                (col("Unique Key").alias("unique_key_max"), "max"),
+                (col("Descriptor").alias("descriptor_max"), "max"),
+                (col("Descriptor").alias("descriptor_count_distinct"), "count_distinct"),
+                (col("Unique Key").alias("unique_key_count"), "count"),
+                (col("Unique Key").alias("unique_key_variance"), "variance"),
+                (col("Unique Key").alias("unique_key_stddev"), "stddev"),
+            ]
+        )
+    )
+    service_requests_csv_pd_df = (
+        service_requests_csv_pd_df.groupby(keys)
+        .agg(
+            unique_key_min=("Unique Key", "min"),
+            unique_key_max=("Unique Key", "max"),
+            descriptor_max=("Descriptor", "max"),
+            descriptor_count_distinct=("Descriptor", "nunique"),
+            unique_key_count=("Unique Key", "count"),
+            unique_key_variance=("Unique Key", "var"),
+            unique_key_stddev=("Unique Key", "std"),
+        )
+        .reset_index()
+    )
+    daft_pd_df = daft_df.to_pandas()
+    assert_df_equals(daft_pd_df, service_requests_csv_pd_df, sort_key=keys)
+
+
+@parametrize_service_requests_csv_repartition
+@parametrize_service_requests_csv_daft_df
+def test_approx_aggs(daft_df, service_requests_csv_pd_df, repartition_nparts):
+    """Approximate distinct counts and quantiles across entire columns for the entire table"""
+    daft_df = daft_df.repartition(repartition_nparts).agg(
+        [
+            (col("Descriptor").alias("descriptor_count_distinct"), "approx_count_distinct"),
+            (col("Unique Key").alias("unique_key_median"), "approx_quantile"),
+            (col("Unique Key").alias("unique_key_p90"), "approx_quantile(0.9)"),
+        ]
+    )
+    daft_pd_df = daft_df.to_pandas()
+    assert len(daft_pd_df) == 1
+    # Few distinct values are counted from the empty registers of the sketch, which undercounts values whose hashes
+    # collide in a register
+    assert daft_pd_df["descriptor_count_distinct"][0] == pytest.approx(
+        service_requests_csv_pd_df["Descriptor"].nunique(), rel=0.1
+    )
+    unique_keys = service_requests_csv_pd_df["Unique Key"]
+    assert daft_pd_df["unique_key_median"][0] == pytest.approx(unique_keys.quantile(0.5), rel=1e-3)
+    assert daft_pd_df["unique_key_p90"][0] == pytest.approx(unique_keys.quantile(0.9), rel=1e-3)
+
+
+@parametrize_service_requests_csv_repartition
+@parametrize_service_requests_csv_daft_df
+@pytest.mark.parametrize(
+    "keys",
+    [
+        pytest.param(["Borough"], id="NumGroupByKeys:1"),
+        pytest.param(["Borough", "Complaint Type"], id="NumGroupByKeys:2"),
+    ],
+)
+def test_approx_aggs_groupby(daft_df, service_requests_csv_pd_df, repartition_nparts, keys):
+    """Approximate distinct counts and quantiles across groups"""
+    daft_df = (
+        daft_df.repartition(repartition_nparts)
+        .groupby(*[col(k) for k in keys])
+        .agg(
+            [
+                (col("Descriptor").alias("descriptor_count_distinct"), "approx_count_distinct"),
+                (col("Unique Key").alias("unique_key_median"), "approx_quantile(0.5)"),
+            ]
+        )
+    )
+    service_requests_csv_pd_df = (
+        service_requests_csv_pd_df.groupby(keys)
+        .agg(
+            descriptor_count_distinct=("Descriptor", "nunique"),
+            unique_key_median=("Unique Key", "median"),
+            unique_key_min=("Unique Key", "min"),
+            unique_key_max=("Unique Key", "max"),
+        )
+        .reset_index()
+    )
+    daft_pd_df = daft_df.to_pandas().merge(service_requests_csv_pd_df, on=keys, suffixes=("", "_expected"))
+    assert len(daft_pd_df) == len(service_requests_csv_pd_df)
+    assert (
+        (daft_pd_df["descriptor_count_distinct"] - daft_pd_df["descriptor_count_distinct_expected"]).abs()
+        <= 0.1 * daft_pd_df["descriptor_count_distinct_expected"] + 1
+    ).all()
+    # Medians of small groups are interpolated between their values
+    assert (daft_pd_df["unique_key_median"] >= daft_pd_df["unique_key_min"]).all()
+    assert (daft_pd_df["unique_key_median"] <= daft_pd_df["unique_key_max"]).all()
+
+
+@parametrize_service_requests_csv_repartition
+@parametrize_service_requests_csv_daft_df
+def test_first_groupby(daft_df, service_requests_csv_pd_df, repartition_nparts):
+    """Takes a value of each group"""
+    daft_df = (
+        daft_df.repartition(repartition_nparts)
+        .groupby(col("Borough"))
+        .agg([(col("Borough").alias("borough_first"), "first"), (col("Unique Key").alias("unique_key"), "first")])
+    )
+    daft_pd_df = daft_df.to_pandas()
+    assert (daft_pd_df["Borough"] == daft_pd_df["borough_first"]).all()
+    assert sorted(daft_pd_df["Borough"]) == sorted(service_requests_csv_pd_df["Borough"].unique())
+    unique_keys_by_borough = service_requests_csv_pd_df.groupby("Borough")["Unique Key"].apply(set)
+    for borough, unique_key in zip(daft_pd_df["Borough"], daft_pd_df["unique_key"]):
+        assert unique_key in unique_keys_by_borough[borough]
+
+
+@parametrize_service_requests_csv_repartition
+@parametrize_service_requests_csv_daft_df
+def test_distinct(daft_df, service_requests_csv_pd_df, repartition_nparts):
+    """Drops duplicate rows with string columns"""
+    daft_df = daft_df.repartition(repartition_nparts).select(col("Borough"), col("Complaint Type")).distinct()
+    service_requests_csv_pd_df = service_requests_csv_pd_df[["Borough", "Complaint Type"]].drop_duplicates()
+    daft_pd_df = daft_df.to_pandas()
+    assert_df_equals(daft_pd_df, service_requests_csv_pd_df, sort_key=["Borough", "Complaint Type"])
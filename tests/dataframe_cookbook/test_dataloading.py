@@ -3,6 +3,7 @@ import pathlib
 import pandas as pd
 import pytest
 
+from daft.config import DaftSettings
 from daft.dataframe import DataFrame
 from daft.execution.operators import ExpressionType
 from daft.expressions import col
@@ -102,3 +103,79 @@ def test_load_pylist():
     pd_df = pd.DataFrame.from_records(data)
     daft_pd_df = daft_df.to_pandas()
     assert_df_equals(daft_pd_df, pd_df, sort_key="foo")
+
+
+@pytest.fixture(scope="function")
+def small_scan_partitions(monkeypatch):
+    monkeypatch.setattr(DaftSettings, "DAFT_SCAN_PARTITION_SIZE_BYTES", 1024)
+
+
+def test_load_csv_split(small_scan_partitions):
+    """Loading a CSV file that is split into many partitions reads every row exactly once"""
+    daft_df = DataFrame.from_csv(IRIS_CSV)
+    assert daft_df.plan().num_partitions() > 1
+    pd_df = pd.read_csv(IRIS_CSV)
+    daft_pd_df = daft_df.to_pandas()
+    assert_df_equals(daft_pd_df, pd_df, assert_ordering=True)
+
+
+def test_load_json_split(tmp_path: pathlib.Path, small_scan_partitions):
+    """Loading a JSON file that is split into many partitions reads every row exactly once"""
+    json_file = tmp_path / "iris.json"
+    pd_df = pd.read_csv(IRIS_CSV)
+    pd_df.to_json(json_file, lines=True, orient="records")
+    daft_df = DataFrame.from_json(str(json_file))
+    assert daft_df.plan().num_partitions() > 1
+    daft_pd_df = daft_df.to_pandas()
+    assert_df_equals(daft_pd_df, pd_df, assert_ordering=True)
+
+
+def test_load_parquet_split(tmp_path: pathlib.Path, small_scan_partitions):
+    """Loading a Parquet file that is split at row groups into many partitions reads every row exactly once"""
+    parquet_file = tmp_path / "iris.parquet"
+    pd_df = pd.read_csv(IRIS_CSV)
+    pd_df.to_parquet(parquet_file, row_group_size=10)
+    daft_df = DataFrame.from_parquet(str(parquet_file))
+    assert daft_df.plan().num_partitions() > 1
+    daft_pd_df = daft_df.to_pandas()
+    assert_df_equals(daft_pd_df, pd_df, assert_ordering=True)
+
+
+def test_load_many_small_csvs(tmp_path: pathlib.Path):
+    """Loading many small CSV files packs them into fewer partitions"""
+    pd_df = pd.read_csv(IRIS_CSV)
+    for i in range(0, len(pd_df), 10):
+        pd_df.iloc[i : i + 10].to_csv(tmp_path / f"iris-{i:03}.csv", index=False)
+    daft_df = DataFrame.from_csv(str(tmp_path))
+    assert daft_df.plan().num_partitions() == 1
+    daft_pd_df = daft_df.to_pandas()
+    assert_df_equals(daft_pd_df, pd_df, assert_ordering=True)
+
+
+def test_load_csvs_with_unified_schema(tmp_path: pathlib.Path):
+    """Schemas inferred from multiple CSV files are unified, widening numeric types"""
+    (tmp_path / "0.csv").write_text("foo,bar\n1,a\n2,b\n")
+    (tmp_path / "1.csv").write_text("foo,bar\n1.5,c\n,d\n")
+    daft_df = DataFrame.from_csv(str(tmp_path))
+    assert daft_df.schema()["foo"].daft_type == ExpressionType.from_py_type(float)
+    daft_pd_df = daft_df.to_pandas()
+    pd_df = pd.DataFrame({"foo": [1.0, 2.0, 1.5, None], "bar": ["a", "b", "c", "d"]})
+    assert_df_equals(daft_pd_df, pd_df, assert_ordering=True)
+
+
+def test_load_parquets_with_unified_schema(tmp_path: pathlib.Path):
+    """Schemas of multiple Parquet files are unified, and columns are read with the unified types"""
+    pd.DataFrame({"foo": [1, 2]}).to_parquet(tmp_path / "0.parquet")
+    pd.DataFrame({"foo": [1.5, 2.5]}).to_parquet(tmp_path / "1.parquet")
+    daft_df = DataFrame.from_parquet(str(tmp_path))
+    assert daft_df.schema()["foo"].daft_type == ExpressionType.from_py_type(float)
+    daft_pd_df = daft_df.to_pandas()
+    assert_df_equals(daft_pd_df, pd.DataFrame({"foo": [1.0, 2.0, 1.5, 2.5]}), assert_ordering=True)
+
+
+def test_load_csvs_with_mismatched_schemas(tmp_path: pathlib.Path):
+    """Files with schemas that cannot be unified are reported when the DataFrame is created"""
+    (tmp_path / "0.csv").write_text("foo,bar\n1,a\n")
+    (tmp_path / "1.csv").write_text("foo,baz\n1,a\n")
+    with pytest.raises(ValueError):
+        DataFrame.from_csv(str(tmp_path))
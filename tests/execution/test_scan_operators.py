@@ -0,0 +1,176 @@
+import pathlib
+
+import pyarrow as pa
+import pytest
+from pyarrow import parquet
+
+from daft.config import DaftSettings
+from daft.dataframe import DataFrame
+from daft.datasources import FileSplit
+from daft.execution import scan_operators
+from daft.execution.operators import OperatorEnum
+from daft.execution.scan_operators import (
+    ColumnComparison,
+    extract_column_comparisons,
+    iter_ipc,
+    iter_parquet,
+    iter_text_split,
+    prune_row_groups,
+)
+from daft.expressions import col, lit
+from daft.logical.logical_plan import Scan
+from daft.logical.schema import ExpressionList
+
+NUM_ROWS = 100
+ROW_GROUP_SIZE = 10
+
+
+@pytest.fixture(scope="function")
+def events_parquet(tmp_path: pathlib.Path) -> str:
+    table = pa.table(
+        {
+            "id": list(range(NUM_ROWS)),
+            "name": [f"event-{i:03}" for i in range(NUM_ROWS)],
+            "nulls": pa.array([None] * NUM_ROWS, type=pa.int64()),
+        }
+    )
+    path = str(tmp_path / "events.parquet")
+    parquet.write_table(table, path, row_group_size=ROW_GROUP_SIZE)
+    return path
+
+
+def _scan_schema(path: str) -> ExpressionList:
+    plan = DataFrame.from_parquet(path).plan()
+    assert isinstance(plan, Scan)
+    return plan._schema
+
+
+def test_extract_column_comparisons(events_parquet: str) -> None:
+    schema = _scan_schema(events_parquet)
+    predicate = ExpressionList([(((col("id") > 5) & (lit(10) >= col("id"))) | (col("id") == 1)) & (col("id") < 50)])
+    assert extract_column_comparisons(predicate.resolve(schema), schema) == [
+        ColumnComparison(column_name="id", op=OperatorEnum.LT, value=50),
+    ]
+
+    predicate = ExpressionList([(col("id") > 5) & (lit(10) >= col("id"))])
+    assert extract_column_comparisons(predicate.resolve(schema), schema) == [
+        ColumnComparison(column_name="id", op=OperatorEnum.GT, value=5),
+        ColumnComparison(column_name="id", op=OperatorEnum.LE, value=10),
+    ]
+
+
+@pytest.mark.parametrize(
+    ["comparisons", "expected"],
+    [
+        ([], list(range(NUM_ROWS // ROW_GROUP_SIZE))),
+        ([ColumnComparison("id", OperatorEnum.LT, 15)], [0, 1]),
+        ([ColumnComparison("id", OperatorEnum.LE, 10)], [0, 1]),
+        ([ColumnComparison("id", OperatorEnum.GT, 89)], [9]),
+        ([ColumnComparison("id", OperatorEnum.GE, 89)], [8, 9]),
+        ([ColumnComparison("id", OperatorEnum.EQ, 42)], [4]),
+        ([ColumnComparison("id", OperatorEnum.GT, 20), ColumnComparison("id", OperatorEnum.LT, 40)], [2, 3]),
+        ([ColumnComparison("id", OperatorEnum.GT, 1000)], []),
+        ([ColumnComparison("nulls", OperatorEnum.EQ, 1)], []),
+        ([ColumnComparison("id", OperatorEnum.EQ, "not comparable")], list(range(NUM_ROWS // ROW_GROUP_SIZE))),
+    ],
+)
+def test_prune_row_groups(events_parquet: str, comparisons, expected) -> None:
+    metadata = parquet.ParquetFile(events_parquet).metadata
+    assert prune_row_groups(metadata, comparisons) == expected
+
+
+def test_iter_parquet_with_all_row_groups_pruned(events_parquet: str) -> None:
+    schema = _scan_schema(events_parquet)
+    predicate = ExpressionList([col("id") > 1000]).resolve(schema)
+    tables = list(
+        iter_parquet(
+            FileSplit(events_parquet), columns=["name", "id"], predicate=predicate, schema=schema, batch_size=1
+        )
+    )
+    assert len(tables) == 1
+    assert len(tables[0]) == 0
+    assert tables[0].column_names == ["name", "id"]
+
+
+def test_iter_parquet_in_batches(events_parquet: str) -> None:
+    schema = _scan_schema(events_parquet)
+    predicate = ExpressionList([col("id") >= 25]).resolve(schema)
+    tables = list(
+        iter_parquet(FileSplit(events_parquet), columns=["id"], predicate=predicate, schema=schema, batch_size=64)
+    )
+    assert len(tables) > NUM_ROWS // ROW_GROUP_SIZE
+    # Pruning only skips whole row groups, the rest of the predicate is applied later
+    assert pa.concat_tables(tables)["id"].to_pylist() == list(range(20, NUM_ROWS))
+
+
+def test_parquet_scan_with_pruned_row_groups(events_parquet: str) -> None:
+    df = DataFrame.from_parquet(events_parquet)
+    df = df.where((col("name") > "event-048") & (col("id") % 2 == 0)).select("id")
+    result = df.to_pandas()
+    expected = [i for i in range(NUM_ROWS) if i > 48 and i % 2 == 0]
+    assert sorted(result["id"].tolist()) == expected
+
+
+def test_iter_ipc_is_zero_copy(tmp_path: pathlib.Path) -> None:
+    table = pa.table({"id": list(range(NUM_ROWS)), "name": [f"event-{i:03}" for i in range(NUM_ROWS)]})
+    path = str(tmp_path / "events.arrow")
+    with pa.ipc.new_file(path, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=ROW_GROUP_SIZE):
+            writer.write_batch(batch)
+    plan = DataFrame.from_ipc(path).plan()
+    assert isinstance(plan, Scan)
+    schema = plan._schema
+
+    allocated_before = pa.total_allocated_bytes()
+    tables = list(iter_ipc(FileSplit(path), columns=["name", "id"], schema=schema))
+    # Batches are read from the memory-mapped file rather than copied into memory allocated by Arrow
+    assert pa.total_allocated_bytes() == allocated_before
+    assert len(tables) == NUM_ROWS // ROW_GROUP_SIZE
+    assert pa.concat_tables(tables).equals(table.select(["name", "id"]))
+
+
+@pytest.mark.parametrize("num_splits", [1, 2, 3, 7, 50, 200])
+@pytest.mark.parametrize("block_size", [1, 16, 1024])
+def test_iter_text_split(tmp_path: pathlib.Path, num_splits: int, block_size: int) -> None:
+    lines = [f"{i}" * (i % 13) + "\n" for i in range(100)]
+    path = tmp_path / "lines.txt"
+    path.write_text("".join(lines))
+    size = path.stat().st_size
+    boundaries = [size * i // num_splits for i in range(num_splits + 1)]
+
+    read_lines = []
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        for block in iter_text_split(FileSplit(str(path), start=start, end=end), block_size=block_size):
+            assert block.endswith(b"\n")
+            read_lines.extend(block.decode().splitlines(keepends=True))
+    assert read_lines == lines
+
+
+@pytest.fixture(scope="function")
+def small_scan_batches(monkeypatch):
+    monkeypatch.setattr(DaftSettings, "DAFT_SCAN_BATCH_SIZE_BYTES", 64)
+
+
+def test_streamed_scan_filter_and_limit(events_parquet: str, small_scan_batches) -> None:
+    df = DataFrame.from_parquet(events_parquet)
+    df = df.where(col("id") % 3 == 0).select((col("id") * 2).alias("doubled")).limit(5)
+    assert df.to_pandas()["doubled"].tolist() == [0, 6, 12, 18, 24]
+
+
+@pytest.mark.skipif(DaftSettings.DAFT_RUNNER.upper() != "PY", reason="requires PyRunner to be in use")
+def test_streamed_scan_stops_at_limit(tmp_path: pathlib.Path, small_scan_batches, monkeypatch) -> None:
+    path = tmp_path / "lines.csv"
+    path.write_text("id\n" + "".join(f"{i}\n" for i in range(1000)))
+    num_batches_read = 0
+    iter_csv = scan_operators.iter_csv
+
+    def counting_iter_csv(*args, **kwargs):
+        nonlocal num_batches_read
+        for table in iter_csv(*args, **kwargs):
+            num_batches_read += 1
+            yield table
+
+    monkeypatch.setattr(scan_operators, "iter_csv", counting_iter_csv)
+    df = DataFrame.from_csv(str(path)).limit(3)
+    assert df.to_pandas()["id"].tolist() == [0, 1, 2]
+    assert num_batches_read == 1
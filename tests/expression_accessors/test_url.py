@@ -1,12 +1,18 @@
 import pathlib
+import threading
+import time
 import uuid
 from typing import List
 
 import pandas as pd
+import pyarrow as pa
 import pytest
 
-from daft import DataFrame
+from daft import DataFrame, filesystem
+from daft.config import DaftSettings
+from daft.execution import url_operators
 from daft.expressions import col
+from daft.runners.blocks import DataBlock
 from tests.conftest import assert_df_equals
 
 
@@ -45,3 +51,155 @@ def test_download_with_broken_urls(files):
     pd_df = pd.DataFrame.from_dict(data)
     pd_df["bytes"] = pd.Series([pathlib.Path(fn).read_bytes() if pathlib.Path(fn).exists() else None for fn in files])
     assert_df_equals(df.to_pandas(), pd_df, sort_key="id")
+
+
+@pytest.fixture(scope="function")
+def local_fs(monkeypatch):
+    """Tracks the calls to cat_file of the pooled local filesystem, optionally failing or delaying them"""
+    fs = filesystem.get_filesystem("file")
+    cat_file = fs.cat_file
+    calls: List[str] = []
+    state = {"active": 0, "completed": 0, "failures": 0, "delay": 0.0, "max_active": 0, "max_active_after_first": 0}
+    lock = threading.Lock()
+
+    def tracked_cat_file(path, *args, **kwargs):
+        with lock:
+            calls.append(path)
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+            if state["completed"] > 0:
+                state["max_active_after_first"] = max(state["max_active_after_first"], state["active"])
+            fail = state["failures"] > 0
+            state["failures"] -= 1 if fail else 0
+        try:
+            time.sleep(state["delay"])
+            if fail:
+                raise ConnectionError("connection reset")
+            return cat_file(path, *args, **kwargs)
+        finally:
+            with lock:
+                state["active"] -= 1
+                state["completed"] += 1
+
+    monkeypatch.setattr(fs, "cat_file", tracked_cat_file)
+    monkeypatch.setattr(DaftSettings, "DAFT_DOWNLOAD_RETRY_BACKOFF_SECONDS", 0.0)
+    return calls, state
+
+
+def _download(paths) -> List:
+    return url_operators.download(DataBlock.make_block(pa.chunked_array([paths], type=pa.string()))).iter_py()
+
+
+def test_download_deduplicates_urls(files, local_fs):
+    calls, _ = local_fs
+    paths = [str(f) for f in files] * 3
+    assert list(_download(paths)) == [pathlib.Path(path).read_bytes() for path in paths]
+    assert sorted(calls) == sorted(str(f) for f in files)
+
+
+def test_download_retries(files, local_fs):
+    calls, state = local_fs
+    state["failures"] = 2
+    assert list(_download([str(files[0])])) == [files[0].read_bytes()]
+    assert len(calls) == 3
+
+
+def test_download_gives_up_after_retries(files, local_fs, monkeypatch):
+    calls, state = local_fs
+    monkeypatch.setattr(DaftSettings, "DAFT_DOWNLOAD_NUM_RETRIES", 1)
+    state["failures"] = 2
+    assert list(_download([str(files[0])])) == [None]
+    assert len(calls) == 2
+
+
+def test_download_max_connections(files, local_fs, monkeypatch):
+    _, state = local_fs
+    monkeypatch.setattr(DaftSettings, "DAFT_DOWNLOAD_MAX_CONNECTIONS", 2)
+    state["delay"] = 0.01
+    assert len(list(_download([str(f) for f in files]))) == len(files)
+    assert 0 < state["max_active_after_first"] <= 2
+
+
+def test_download_max_inflight_bytes(files, local_fs, monkeypatch):
+    _, state = local_fs
+    # Every file is larger than the budget, so downloads run one at a time. The first downloads each reserve an even
+    # share of the budget per connection, which is at least one byte, before the size of any file is known
+    monkeypatch.setattr(DaftSettings, "DAFT_DOWNLOAD_MAX_CONNECTIONS", 2)
+    monkeypatch.setattr(DaftSettings, "DAFT_DOWNLOAD_MAX_INFLIGHT_BYTES", 1)
+    state["delay"] = 0.01
+    assert len(list(_download([str(f) for f in files]))) == len(files)
+    assert state["max_active"] == 1
+
+
+def test_download_does_not_stat_urls(files, local_fs, monkeypatch):
+    # Sizing the byte budget does not cost a request per URL on top of its download
+    fs = filesystem.get_filesystem("file")
+    stats: List[str] = []
+
+    def track_stats(method):
+        def tracked(path, *args, **kwargs):
+            stats.append(path)
+            return method(path, *args, **kwargs)
+
+        return tracked
+
+    monkeypatch.setattr(fs, "info", track_stats(fs.info))
+    monkeypatch.setattr(fs, "size", track_stats(fs.size))
+    assert list(_download([str(f) for f in files])) == [f.read_bytes() for f in files]
+    assert stats == []
+
+
+def test_byte_budget_reserves_minimum_for_unknown_sizes():
+    budget = url_operators._ByteBudget(max_bytes=10, min_bytes=4)
+    assert budget.acquire(None) == 4
+    assert budget.acquire(None) == 4
+    budget.release(4, downloaded=1)
+    # The mean size of completed downloads is reserved, but never less than the minimum
+    assert budget.acquire(None) == 4
+    budget.release(4, downloaded=None)
+    assert budget.acquire(2) == 2
+
+
+@pytest.fixture(scope="function")
+def download_cache_dir(tmp_path, monkeypatch) -> pathlib.Path:
+    monkeypatch.setattr(DaftSettings, "DAFT_DOWNLOAD_CACHE_DIR", str(tmp_path / "download_cache"))
+    return tmp_path / "download_cache"
+
+
+def test_download_cache(files, local_fs, download_cache_dir):
+    calls, _ = local_fs
+    paths = [str(f) for f in files]
+    expected = [f.read_bytes() for f in files]
+    assert list(_download(paths)) == expected
+    cache = url_operators.get_download_cache()
+    assert cache is not None
+    assert cache.cache_info()[:2] == (0, len(files))
+
+    assert list(_download(paths)) == expected
+    assert cache.cache_info()[:2] == (len(files), len(files))
+    # Hits are served without downloading the URLs again
+    assert len(calls) == len(files)
+
+
+def test_download_cache_revalidate(files, local_fs, download_cache_dir):
+    assert list(_download([str(files[0])])) == [files[0].read_bytes()]
+    files[0].write_bytes(b"overwritten with a different size")
+    assert list(_download([str(files[0])])) == [b"overwritten with a different size"]
+    cache = url_operators.get_download_cache()
+    assert cache is not None
+    assert cache.cache_info()[:2] == (0, 2)
+
+
+def test_download_cache_without_revalidation(files, local_fs, download_cache_dir, monkeypatch):
+    # Cached downloads are keyed by URL alone, so a URL whose contents change is served from the cache
+    monkeypatch.setattr(DaftSettings, "DAFT_DOWNLOAD_CACHE_REVALIDATE", False)
+    original = files[0].read_bytes()
+    assert list(_download([str(files[0])])) == [original]
+    files[0].write_bytes(b"overwritten with a different size")
+    assert list(_download([str(files[0])])) == [original]
+
+
+def test_download_cache_eviction(files, local_fs, download_cache_dir, monkeypatch):
+    monkeypatch.setattr(DaftSettings, "DAFT_DOWNLOAD_CACHE_SIZE_BYTES", 3 * len(files[0].read_bytes()))
+    assert len(list(_download([str(f) for f in files]))) == len(files)
+    assert len(list(download_cache_dir.iterdir())) == 3
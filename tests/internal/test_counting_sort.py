@@ -0,0 +1,43 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from daft.internal.counting_sort import counting_sort_partition
+
+
+@pytest.mark.parametrize("num_partitions", [1, 2, 7, 64])
+@pytest.mark.parametrize("num_rows", [0, 1, 100, 1000])
+def test_counting_sort_partition_with_reference(num_rows, num_partitions):
+    targets = np.random.randint(0, num_partitions, size=num_rows)
+    permutation, offsets = counting_sort_partition(pa.array(targets), num_partitions)
+    assert offsets.tolist() == [0] + np.cumsum(np.bincount(targets, minlength=num_partitions)).tolist()
+    expected = np.argsort(targets, kind="stable")
+    if permutation is None:
+        assert np.array_equal(expected, np.arange(num_rows))
+    else:
+        assert permutation.type == pa.int64()
+        assert np.array_equal(permutation.to_numpy(), expected)
+
+
+def test_counting_sort_partition_grouped_targets():
+    permutation, offsets = counting_sort_partition(pa.array([0, 0, 2, 2, 3], type=pa.uint64()), 5)
+    assert permutation is None
+    assert offsets.tolist() == [0, 2, 2, 4, 5, 5]
+
+
+@pytest.mark.parametrize("shift", range(0, 4))
+def test_counting_sort_partition_sliced_chunked_array(shift):
+    targets = pa.chunked_array([[1, 0, 2], [0, 1]], type=pa.int32())[shift:]
+    permutation, offsets = counting_sort_partition(targets, 3)
+    expected = np.argsort(targets.to_numpy(), kind="stable")
+    assert np.array_equal(np.arange(len(targets)) if permutation is None else permutation.to_numpy(), expected)
+    assert offsets[-1] == len(targets)
+
+
+def test_counting_sort_partition_invalid_targets():
+    with pytest.raises(ValueError):
+        counting_sort_partition(pa.array([0, 3]), 3)
+    with pytest.raises(ValueError):
+        counting_sort_partition(pa.array([0, -1]), 3)
+    with pytest.raises(ValueError):
+        counting_sort_partition(pa.array([0, None]), 3)
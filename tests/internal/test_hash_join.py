@@ -0,0 +1,81 @@
+import random
+
+import pyarrow as pa
+import pytest
+
+from daft.internal.hash_join import hash_join_indices
+
+
+def _reference_join(left_rows, right_rows):
+    return sorted(
+        (i, j)
+        for i, left in enumerate(left_rows)
+        for j, right in enumerate(right_rows)
+        if None not in left and left == right
+    )
+
+
+def _join_pairs(left_keys, right_keys):
+    left_index, right_index = hash_join_indices(left_keys, right_keys)
+    assert left_index.type == pa.int64() and right_index.type == pa.int64()
+    return sorted(zip(left_index.to_pylist(), right_index.to_pylist()))
+
+
+@pytest.mark.parametrize("num_left,num_right", [(0, 10), (10, 0), (20, 100), (100, 20)])
+@pytest.mark.parametrize(
+    "dtype,make_value",
+    [
+        (pa.int64(), lambda i: i),
+        (pa.uint8(), lambda i: i),
+        (pa.float64(), lambda i: i / 2),
+        (pa.string(), lambda i: f"key-{i}" if i % 5 else ""),
+        (pa.large_string(), lambda i: f"key-{i}"),
+        (pa.binary(), lambda i: bytes([i])),
+        (pa.bool_(), lambda i: i % 2 == 0),
+    ],
+)
+def test_hash_join_with_reference(num_left, num_right, dtype, make_value):
+    left = [None if random.random() < 0.1 else make_value(random.randint(0, 15)) for _ in range(num_left)]
+    right = [None if random.random() < 0.1 else make_value(random.randint(0, 15)) for _ in range(num_right)]
+    pairs = _join_pairs([pa.array(left, type=dtype)], [pa.array(right, type=dtype)])
+    assert pairs == _reference_join([(v,) for v in left], [(v,) for v in right])
+
+
+def test_hash_join_multi_column_keys():
+    left_a = [random.randint(0, 3) for _ in range(50)]
+    left_b = [random.choice(["x", "y", None]) for _ in range(50)]
+    right_a = [random.randint(0, 3) for _ in range(30)]
+    right_b = [random.choice(["x", "y", None]) for _ in range(30)]
+    pairs = _join_pairs([pa.array(left_a), pa.array(left_b)], [pa.array(right_a), pa.array(right_b)])
+    assert pairs == _reference_join(list(zip(left_a, left_b)), list(zip(right_a, right_b)))
+
+
+@pytest.mark.parametrize("shift", range(0, 4))
+def test_hash_join_sliced_chunked_arrays(shift):
+    left = pa.chunked_array([["a", None, "b"], ["c", "a"]])[shift:]
+    right = pa.chunked_array([[1, 2, None, 3], [4, 5]], type=pa.int32())[shift:]
+    right_strings = pa.chunked_array([["a", "b", "c", None], ["a", "d"]])[shift:]
+    pairs = _join_pairs([left], [right_strings])
+    assert pairs == _reference_join([(v,) for v in left.to_pylist()], [(v,) for v in right_strings.to_pylist()])
+
+    left_ints = pa.chunked_array([[2, 3, None], [5]], type=pa.int64())
+    pairs = _join_pairs([left_ints], [right])
+    assert pairs == _reference_join([(v,) for v in left_ints.to_pylist()], [(v,) for v in right.to_pylist()])
+
+
+def test_hash_join_unifies_key_types():
+    assert _join_pairs([pa.array([1, 2, 3], type=pa.int8())], [pa.array([3, 1], type=pa.uint32())]) == [(0, 1), (2, 0)]
+    assert _join_pairs([pa.array([1, 2])], [pa.array([2.0, 2.5])]) == [(1, 0)]
+    assert _join_pairs([pa.array(["a", "b"])], [pa.array(["b"], type=pa.large_string())]) == [(1, 0)]
+    assert _join_pairs([pa.array(["a", "b"]).dictionary_encode()], [pa.array(["b", "a"])]) == [(0, 1), (1, 0)]
+    assert _join_pairs([pa.array([-0.0])], [pa.array([0.0])]) == [(0, 0)]
+
+
+def test_hash_join_null_keys_never_match():
+    assert _join_pairs([pa.array([None, None])], [pa.array([None])]) == []
+    assert _join_pairs([pa.array([None, 1], type=pa.int64())], [pa.array([None, 1], type=pa.int64())]) == [(1, 1)]
+
+
+def test_hash_join_mismatched_number_of_keys():
+    with pytest.raises(ValueError):
+        hash_join_indices([pa.array([1])], [pa.array([1]), pa.array([1])])
@@ -1,3 +1,4 @@
+import decimal
 import random
 import string
 
@@ -6,7 +7,7 @@ import pyarrow as pa
 import pytest
 import xxhash
 
-from daft.internal.hashing import hash_chunked_array
+from daft.internal.hashing import NULL_HASH, hash_chunked_array, hash_partition
 
 int_types = [pa.int8(), pa.uint8(), pa.int16(), pa.uint16(), pa.int32(), pa.uint32(), pa.int64(), pa.uint64()]
 
@@ -72,9 +73,124 @@ def test_hash_chunked_str_array_with_reference(shift, str_len, num_chunks):
         scalar = v.as_py()
         hash_scalar = hv.as_py()
         if scalar is None:
-            assert hash_scalar is None
-        elif hash_scalar is None:
-            assert scalar is None, f"{i}"
+            assert hash_scalar == NULL_HASH
         else:
             ref_value = xxhash.xxh3_64_intdigest(scalar.encode())
             assert ref_value == hash_scalar
+
+
+@pytest.mark.parametrize("dtype", int_types, ids=[repr(it) for it in int_types])
+def test_hash_chunked_int_array_slice_of_larger_array(dtype):
+    arr = pa.chunked_array([pa.array(range(100), type=dtype)[10:20]])
+    hash_sliced = hash_chunked_array(arr)
+    assert hash_sliced == hash_chunked_array(pa.chunked_array([list(range(10, 20))], type=dtype))
+
+
+@pytest.mark.parametrize(
+    "dtype,values",
+    [
+        (pa.float32(), [1.5, -2.0, 3.25]),
+        (pa.float64(), [1.5, -2.0, 3.25]),
+        (pa.date32(), [0, 1, 18000]),
+        (pa.date64(), [0, 86400000, 1555200000000]),
+        (pa.timestamp("us"), [0, 1, 1_600_000_000_000_000]),
+        (pa.time64("ns"), [0, 1, 86_399_999_999_999]),
+        (pa.duration("s"), [0, -1, 3600]),
+        (pa.decimal128(10, 2), [decimal.Decimal("1.50"), decimal.Decimal("-2.00"), decimal.Decimal("0.01")]),
+        (pa.binary(3), [b"abc", b"def", b"\x00\x00\x00"]),
+    ],
+)
+def test_hash_chunked_fixed_width_array_with_reference(dtype, values):
+    arr = pa.chunked_array([pa.array(values + [None], type=dtype)])
+    hash_all = hash_chunked_array(arr)
+    assert hash_all.null_count == 0
+    data_buffer = arr.chunk(0).buffers()[1]
+    nbytes = dtype.bit_width // 8
+    for i, hv in enumerate(hash_all[: len(values)]):
+        assert hv.as_py() == xxhash.xxh3_64_intdigest(data_buffer[i * nbytes : (i + 1) * nbytes].to_pybytes())
+    assert hash_all[len(values)].as_py() == NULL_HASH
+
+
+@pytest.mark.parametrize("dtype", [pa.string(), pa.large_string(), pa.binary(), pa.large_binary()])
+@pytest.mark.parametrize("shift", range(0, 4))
+def test_hash_chunked_binary_array_with_reference(dtype, shift):
+    values = [None, "", "a", "ab", None, "abc"]
+    if pa.types.is_binary(dtype) or pa.types.is_large_binary(dtype):
+        values = [v.encode() if v is not None else None for v in values]
+    arr = pa.chunked_array([values, values], type=dtype)[shift:]
+    hash_all = hash_chunked_array(arr)
+    for v, hv in zip(arr.to_pylist(), hash_all.to_pylist()):
+        if v is None:
+            assert hv == NULL_HASH
+        else:
+            assert hv == xxhash.xxh3_64_intdigest(v.encode() if isinstance(v, str) else v)
+
+
+def test_hash_chunked_string_types_agree():
+    values = ["a", "bc", None, ""]
+    expected = hash_chunked_array(pa.chunked_array([values], type=pa.string()))
+    for dtype in [pa.large_string(), pa.binary(), pa.large_binary()]:
+        assert hash_chunked_array(pa.chunked_array([values], type=dtype)) == expected
+
+
+@pytest.mark.parametrize("shift", range(0, 9))
+def test_hash_chunked_bool_array(shift):
+    values = [True, False, None, True, True, False, None, False, True, False, True]
+    arr = pa.chunked_array([values])[shift:]
+    expected = {True: xxhash.xxh3_64_intdigest(b"\x01"), False: xxhash.xxh3_64_intdigest(b"\x00"), None: NULL_HASH}
+    assert hash_chunked_array(arr).to_pylist() == [expected[v] for v in values[shift:]]
+
+
+@pytest.mark.parametrize("dtype", [pa.float32(), pa.float64()])
+def test_hash_chunked_float_array_equal_values_hash_equal(dtype):
+    hashes = hash_chunked_array(pa.chunked_array([[0.0, -0.0, float("nan"), -float("nan")]], type=dtype)).to_pylist()
+    assert hashes[0] == hashes[1]
+    assert hashes[2] == hashes[3]
+
+
+def test_hash_chunked_null_array():
+    assert hash_chunked_array(pa.chunked_array([[None, None]], type=pa.null())).to_pylist() == [NULL_HASH, NULL_HASH]
+
+
+def test_hash_chunked_nested_array_raises():
+    with pytest.raises(TypeError):
+        hash_chunked_array(pa.chunked_array([[[1, 2], [3]]]))
+
+
+def _combine_reference(hashes):
+    combined = hashes[0]
+    for hashed in hashes[1:]:
+        combined = combined ^ (hashed + 0x9E3779B9 + (combined << 6) + (combined >> 2))
+    return combined
+
+
+@pytest.mark.parametrize("num_partitions", [1, 3, 16])
+@pytest.mark.parametrize("shift", range(0, 3))
+def test_hash_partition_with_reference(num_partitions, shift):
+    columns = [
+        pa.chunked_array([[1, None, 3, 4], [5, 6]], type=pa.int32())[shift:],
+        pa.chunked_array([["a", "b", None], ["d", "e", "f"]])[shift:],
+        pa.chunked_array([[1.5, 0.0, -0.0, None, float("nan"), 2.0]])[shift:],
+    ]
+    for num_columns in range(1, len(columns) + 1):
+        hashes, targets = hash_partition(columns[:num_columns], num_partitions)
+        expected = _combine_reference([hash_chunked_array(c).to_numpy() for c in columns[:num_columns]])
+        assert hashes.type == pa.uint64() and targets.type == pa.int64()
+        assert hashes.to_numpy().tolist() == expected.tolist()
+        assert targets.to_numpy().tolist() == (expected % num_partitions).tolist()
+
+
+def test_hash_partition_dictionary_column():
+    values = ["a", None, "b", "a"]
+    _, targets = hash_partition([pa.chunked_array([pa.array(values).dictionary_encode()])], 7)
+    _, expected = hash_partition([pa.chunked_array([values])], 7)
+    assert targets == expected
+
+
+def test_hash_partition_invalid_arguments():
+    with pytest.raises(ValueError):
+        hash_partition([], 2)
+    with pytest.raises(ValueError):
+        hash_partition([pa.chunked_array([[1, 2]])], 0)
+    with pytest.raises(ValueError):
+        hash_partition([pa.chunked_array([[1, 2]]), pa.chunked_array([[1]])], 2)
@@ -0,0 +1,84 @@
+import random
+
+import pyarrow as pa
+import pytest
+
+from daft.internal.merge_join import can_merge_join, merge_join_indices
+
+
+def _reference_join(left, right):
+    return sorted(
+        (i, j)
+        for i, left_value in enumerate(left)
+        for j, right_value in enumerate(right)
+        if left_value is not None and left_value == left_value and left_value == right_value
+    )
+
+
+def _sorted_keys(values, desc):
+    # Nulls are sorted last, as they are by Sort
+    non_null = sorted([v for v in values if v is not None], reverse=desc)
+    return non_null + [None] * (len(values) - len(non_null))
+
+
+@pytest.mark.parametrize("desc", [False, True])
+@pytest.mark.parametrize("num_left,num_right", [(0, 10), (10, 0), (20, 100), (100, 20)])
+@pytest.mark.parametrize(
+    "dtype,make_value",
+    [
+        (pa.int64(), lambda i: i),
+        (pa.uint8(), lambda i: i),
+        (pa.float64(), lambda i: i / 2),
+        (pa.string(), lambda i: f"key-{i}" if i % 5 else ""),
+        (pa.large_binary(), lambda i: bytes([i]) * (i % 3)),
+    ],
+)
+def test_merge_join_with_reference(desc, num_left, num_right, dtype, make_value):
+    left = _sorted_keys(
+        [None if random.random() < 0.1 else make_value(random.randint(0, 15)) for _ in range(num_left)], desc
+    )
+    right = _sorted_keys(
+        [None if random.random() < 0.1 else make_value(random.randint(0, 15)) for _ in range(num_right)], desc
+    )
+    left_index, right_index = merge_join_indices(pa.array(left, type=dtype), pa.array(right, type=dtype), desc=desc)
+    assert left_index.type == pa.int64() and right_index.type == pa.int64()
+    pairs = list(zip(left_index.to_pylist(), right_index.to_pylist()))
+    assert sorted(pairs) == _reference_join(left, right)
+    # Pairs are produced in the order of the left rows
+    assert [i for i, _ in pairs] == sorted(i for i, _ in pairs)
+
+
+@pytest.mark.parametrize("shift", range(0, 4))
+def test_merge_join_sliced_chunked_arrays(shift):
+    left = pa.chunked_array([[1, 2, 2], [3, 5, None]])[shift:]
+    right = pa.chunked_array([[0, 2, 2], [3, 3, 4]], type=pa.int32())[shift:]
+    left_index, right_index = merge_join_indices(left, right)
+    pairs = sorted(zip(left_index.to_pylist(), right_index.to_pylist()))
+    assert pairs == _reference_join(left.to_pylist(), right.to_pylist())
+
+
+def test_merge_join_drops_nan_keys():
+    left_index, right_index = merge_join_indices(pa.array([1.0, float("nan")]), pa.array([1, 2]))
+    assert left_index.to_pylist() == [0] and right_index.to_pylist() == [0]
+    left_index, right_index = merge_join_indices(pa.array([float("nan")]), pa.array([float("nan")]))
+    assert len(left_index) == 0 and len(right_index) == 0
+
+
+def test_merge_join_incompatible_keys():
+    with pytest.raises(TypeError):
+        merge_join_indices(pa.array([1]), pa.array(["1"]))
+
+
+def test_can_merge_join():
+    assert can_merge_join(pa.int32(), pa.float64())
+    assert can_merge_join(pa.dictionary(pa.int32(), pa.string()), pa.large_string())
+    assert can_merge_join(pa.timestamp("ms"), pa.timestamp("ms"))
+    assert can_merge_join(pa.null(), pa.decimal128(2, 1))
+    assert not can_merge_join(pa.decimal128(2, 1), pa.decimal128(2, 1))
+    assert not can_merge_join(pa.timestamp("ms"), pa.timestamp("us"))
+    assert not can_merge_join(pa.int64(), pa.string())
+
+
+def test_merge_join_empty_chunked_array():
+    left_index, right_index = merge_join_indices(pa.chunked_array([], type=pa.int64()), pa.chunked_array([[1, 2]]))
+    assert len(left_index) == 0 and len(right_index) == 0
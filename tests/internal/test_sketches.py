@@ -0,0 +1,94 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from daft.internal.sketches import (
+    hll_cardinality,
+    hll_merge,
+    hll_sketch,
+    tdigest_merge,
+    tdigest_quantile,
+    tdigest_sketch,
+)
+
+
+@pytest.mark.parametrize("num_distinct", [0, 1, 10, 1000, 100000])
+def test_hll_cardinality_with_reference(num_distinct):
+    values = pa.array(np.random.permutation(np.repeat(np.arange(num_distinct), 3)))
+    estimate = hll_cardinality(hll_sketch(values, None, 1)).to_pylist()[0]
+    assert estimate == pytest.approx(num_distinct, rel=0.05, abs=1)
+
+
+def test_hll_sketch_ignores_nulls():
+    values = pa.chunked_array([["a", None, "b"], ["a", "c", None]])
+    sketches = hll_sketch(values, None, 1)
+    assert len(sketches[0].as_py()) == 4096
+    assert hll_cardinality(sketches).to_pylist() == [3]
+
+
+def test_hll_merge_equals_sketch_of_union():
+    values = pa.array(np.arange(20000) % 7000)
+    group_ids = np.arange(20000) % 5
+    sketches = hll_sketch(values, group_ids, 5)
+    assert hll_merge(sketches, None, 1) == hll_sketch(values, None, 1)
+    merged_group_ids = np.array([0, 1, 0, 1, 2])
+    assert hll_merge(sketches, merged_group_ids, 3) == hll_sketch(values, merged_group_ids[group_ids], 3)
+
+
+def test_hll_invalid_groups():
+    with pytest.raises(ValueError):
+        hll_sketch(pa.array([1, 2]), np.array([0, 2]), 2)
+    with pytest.raises(ValueError):
+        hll_merge(hll_sketch(pa.array([1, 2]), None, 1), np.array([0, 0]), 1)
+    with pytest.raises(ValueError):
+        hll_cardinality(pa.array([b"not a sketch"]))
+
+
+@pytest.mark.parametrize("num_rows", [1, 10, 1000, 100000])
+def test_tdigest_quantile_with_reference(num_rows):
+    values = np.random.normal(size=num_rows)
+    digests = tdigest_sketch(pa.array(values), None, 1)
+    assert tdigest_quantile(digests, 0.0).to_pylist() == [values.min()]
+    assert tdigest_quantile(digests, 1.0).to_pylist() == [values.max()]
+    for q in [0.01, 0.25, 0.5, 0.9, 0.99]:
+        # Quantiles are estimated to within a fraction of a percent of the rank of their value
+        estimate = tdigest_quantile(digests, q).to_pylist()[0]
+        assert np.mean(values <= estimate) == pytest.approx(q, abs=max(0.005, 1 / num_rows))
+
+
+def test_tdigest_merge_of_partitions():
+    values = np.random.exponential(size=100000)
+    digests = pa.chunked_array([tdigest_sketch(pa.array(part), None, 1) for part in np.array_split(values, 20)])
+    merged = tdigest_merge(digests, None, 1)
+    # The digest of all values stays at about a hundred centroids
+    assert len(merged[0].as_py()) < 2048
+    for q in [0.01, 0.5, 0.99]:
+        estimate = tdigest_quantile(merged, q).to_pylist()[0]
+        assert np.mean(values <= estimate) == pytest.approx(q, abs=0.005)
+
+
+def test_tdigest_groups():
+    values = pa.chunked_array([[1, 2, None], [3, 10, 20]])
+    digests = tdigest_sketch(values, np.array([0, 0, 0, 1, 1, 1]), 3)
+    assert tdigest_quantile(digests, 0.0).to_pylist() == [1.0, 3.0, None]
+    assert tdigest_quantile(digests, 1.0).to_pylist() == [2.0, 20.0, None]
+    merged = tdigest_merge(digests, np.array([0, 0, 1]), 2)
+    assert tdigest_quantile(merged, 0.5).to_pylist() == [3.0, None]
+
+
+def test_tdigest_ignores_nans():
+    digests = tdigest_sketch(pa.array([1.0, float("nan"), None, 3.0]), None, 1)
+    assert tdigest_quantile(digests, 0.5).to_pylist() == [2.0]
+
+
+def test_tdigest_invalid_quantile():
+    with pytest.raises(ValueError):
+        tdigest_quantile(tdigest_sketch(pa.array([1.0]), None, 1), 1.5)
+
+
+def test_sketches_of_columns_without_chunks():
+    values = pa.chunked_array([], type=pa.float64())
+    assert hll_cardinality(hll_merge(pa.chunked_array([hll_sketch(values, None, 1)]), None, 1)).to_pylist() == [0]
+    digests = tdigest_merge(pa.chunked_array([], type=pa.binary()), None, 1)
+    assert tdigest_quantile(digests, 0.5).to_pylist() == [None]
+    assert tdigest_quantile(tdigest_sketch(values, None, 1), 0.5).to_pylist() == [None]
@@ -1,3 +1,4 @@
+import pyarrow as pa
 import pytest
 
 from daft.datasources import InMemorySourceInfo
@@ -21,7 +22,7 @@ def schema():
 
 @pytest.fixture(scope="function")
 def source_info():
-    return InMemorySourceInfo(data={})
+    return InMemorySourceInfo(table=pa.table({}))
 
 
 def test_scan_predicates(schema, source_info) -> None:
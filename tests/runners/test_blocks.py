@@ -1,10 +1,12 @@
 import datetime
+import pickle
 
 import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pytest
 
+from daft.execution.operators import OperatorEnum
 from daft.runners import blocks
 
 
@@ -88,3 +90,82 @@ def test_make_block(block_in, block_out):
             np.testing.assert_almost_equal(actual, expected)
     else:
         assert b.data == block_out.data
+
+
+@pytest.mark.parametrize(
+    "op,expected",
+    [
+        ("sum", [6, None, 10]),
+        ("count", [3, 0, 2]),
+        ("min", [1, None, 5]),
+        ("max", [3, None, 5]),
+        ("first", [3, None, 5]),
+        ("count_distinct", [3, 0, 1]),
+    ],
+)
+def test_group_by_agg(op, expected):
+    group_by = blocks.DataBlock.make_block(pa.chunked_array([["a", "b", None], ["a", None, "a"]]))
+    to_agg = blocks.DataBlock.make_block(pa.chunked_array([[3, None, 5], [1, 5, 2]]))
+    gcols, acols = blocks.DataBlock.group_by_agg([group_by], [to_agg], [op])
+    assert dict(zip(gcols[0].data.to_pylist(), acols[0].data.to_pylist())) == dict(zip(["a", "b", None], expected))
+
+
+def test_group_by_agg_merges_distinct_values():
+    group_by = blocks.DataBlock.make_block(pa.chunked_array([["a", "b"], ["a", "b", "c"]]))
+    to_agg = blocks.DataBlock.make_block(pa.chunked_array([[1, 2], [1, None, 3]]))
+    _, distinct = blocks.DataBlock.group_by_agg([group_by], [to_agg], ["distinct"])
+    assert pa.types.is_list(distinct[0].data.type)
+
+    # Partial states of two partitions are merged by counting the distinct values of each group
+    merged_group_by = blocks.DataBlock.make_block(pa.chunked_array([["a", "b", "c"], ["c", "a"]]))
+    merged_distinct = blocks.DataBlock.make_block(pa.chunked_array([[[1], [2], []], [[3, 4], [1, 5]]]))
+    gcols, acols = blocks.DataBlock.group_by_agg([merged_group_by], [merged_distinct], ["count_distinct"])
+    assert dict(zip(gcols[0].data.to_pylist(), acols[0].data.to_pylist())) == {"a": 2, "b": 1, "c": 2}
+    assert merged_distinct.agg("count_distinct").data.to_pylist() == [5]
+
+
+def test_group_by_agg_moments():
+    group_by = blocks.DataBlock.make_block(pa.chunked_array([["a", "b", "a"], ["b", "a", "c"]]))
+    to_agg = blocks.DataBlock.make_block(pa.chunked_array([[1e9, 1e9 + 2, 1e9 + 1], [None, 1e9 + 2, 1e9]]))
+    gcols, acols = blocks.DataBlock.group_by_agg([group_by], [to_agg], ["moments"])
+    assert acols[0].data.type == pa.binary()
+
+    # Moments of each group are merged with the deviations of their means from the mean of the group, so merging
+    # every state with itself keeps the mean and doubles the count and squared deviations
+    merged_gcols, merged = blocks.DataBlock.group_by_agg(
+        [blocks.DataBlock.merge_blocks(gcols + gcols)],
+        [blocks.DataBlock.merge_blocks(acols + acols)],
+        ["moments_merge"],
+    )
+    variances = merged[0].run_unary_operator(OperatorEnum.MOMENTS_VARIANCE)
+    assert dict(zip(merged_gcols[0].data.to_pylist(), variances.data.to_pylist())) == {
+        "a": pytest.approx(0.8),
+        "b": pytest.approx(0.0),
+        "c": pytest.approx(0.0),
+    }
+    total = acols[0].agg("moments_merge").run_unary_operator(OperatorEnum.MOMENTS_VARIANCE)
+    assert total.data.to_pylist() == [pytest.approx(np.var([1e9, 1e9 + 2, 1e9 + 1, 1e9 + 2, 1e9], ddof=1))]
+
+
+def test_group_by_agg_sketches():
+    group_by = blocks.DataBlock.make_block(pa.chunked_array([["a", "b", "a"], ["b", "a"]]))
+    to_agg = blocks.DataBlock.make_block(pa.chunked_array([[1.0, 2.0, 3.0], [None, 1.0]]))
+    gcols, acols = blocks.DataBlock.group_by_agg([group_by], [to_agg, to_agg], ["hll_sketch", "tdigest_sketch"])
+    assert all(acol.data.type == pa.binary() for acol in acols)
+
+    # Sketches of each group are merged and then estimated
+    _, merged = blocks.DataBlock.group_by_agg(gcols, acols, ["hll_merge", "tdigest_merge"])
+    counts = merged[0].run_unary_operator(OperatorEnum.HLL_CARDINALITY)
+    medians = merged[1].run_binary_operator(blocks.DataBlock.make_block(pa.scalar(0.5)), OperatorEnum.TDIGEST_QUANTILE)
+    assert dict(zip(gcols[0].data.to_pylist(), counts.data.to_pylist())) == {"a": 2, "b": 1}
+    assert dict(zip(gcols[0].data.to_pylist(), medians.data.to_pylist())) == {"a": 1.0, "b": 2.0}
+    assert acols[0].agg("hll_merge").run_unary_operator(OperatorEnum.HLL_CARDINALITY).data.to_pylist() == [3]
+
+
+def test_pickle_scattered_blocks_is_compact():
+    block = blocks.DataBlock.make_block(pa.chunked_array([pa.array(range(100_000)), pa.array(range(10))[:1]]))
+    scattered = block.scatter(None, np.array([0, 10, 100_001]))
+    # Each scattered block is pickled with only its own rows, not the buffers of the whole block
+    assert len(pickle.dumps(scattered[0])) < 1_000
+    assert pickle.loads(pickle.dumps(scattered[0])).data.to_pylist() == list(range(10))
+    assert pickle.loads(pickle.dumps(scattered[1])).data.to_pylist() == block.data.to_pylist()[10:]
@@ -262,3 +262,74 @@ def test_hash_partition(n) -> None:
                 values_expected = pylist
             assert values_expected == pylist
         values_seen.update(pylist)
+
+
+@pytest.mark.parametrize("n", [1, 3, 8])
+def test_split_by_index_random(n) -> None:
+    targets = np.random.randint(0, n, size=100)
+    tiles = {
+        0: PyListTile(column_id=0, column_name="ints", partition_id=0, block=DataBlock.make_block(np.arange(100))),
+        1: PyListTile(
+            column_id=1, column_name="objs", partition_id=0, block=DataBlock.make_block([{"i": i} for i in range(100)])
+        ),
+    }
+    part = vPartition(columns=tiles, partition_id=0)
+    new_parts = part.split_by_index(n, DataBlock.make_block(data=targets))
+    assert len(new_parts) == n
+
+    for i, new_part in enumerate(new_parts):
+        expected = np.flatnonzero(targets == i).tolist()
+        assert new_part.partition_id == i
+        assert all(tile.partition_id == i for tile in new_part.columns.values())
+        assert list(new_part.columns[0].block.iter_py()) == expected
+        assert list(new_part.columns[1].block.iter_py()) == [{"i": j} for j in expected]
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [1.5, None, -2.0, 1.5, None, 0.0, -0.0],
+        [b"a", None, b"", b"a", None],
+        [True, None, False, True],
+        pa.array([0, None, 18000, 0], type=pa.date32()),
+        pa.array([5, None, 5, 7], type=pa.timestamp("ms")),
+    ],
+)
+def test_hash_partition_colocates_equal_keys(values) -> None:
+    expr = resolve_expr(col("x"))
+    col_id = expr.required_columns()[0].get_id()
+    block = DataBlock.make_block(values if isinstance(values, pa.Array) else pa.array(values))
+    part = vPartition(columns={col_id: PyListTile(col_id, "x", partition_id=0, block=block)}, partition_id=0)
+    new_parts = part.split_by_hash(ExpressionList([expr]), 3)
+    assert sum(len(new_part) for new_part in new_parts) == len(values)
+    partition_of = {}
+    for i, new_part in enumerate(new_parts):
+        for val in new_part.columns[col_id].block.iter_py():
+            assert partition_of.setdefault(val, i) == i
+
+
+def test_hash_partition_column_without_chunks() -> None:
+    expr = resolve_expr(col("x"))
+    col_id = expr.required_columns()[0].get_id()
+    block = DataBlock.make_block(pa.chunked_array([], type=pa.int64()))
+    part = vPartition(columns={col_id: PyListTile(col_id, "x", partition_id=0, block=block)}, partition_id=0)
+    new_parts = part.split_by_hash(ExpressionList([expr]), 3)
+    assert [len(new_part) for new_part in new_parts] == [0, 0, 0]
+
+
+def test_hash_partition_multiple_keys() -> None:
+    exprs = [resolve_expr(col("x")), resolve_expr(col("y"))]
+    xs = [i % 3 for i in range(60)]
+    ys = [None if i % 7 == 0 else f"{i % 4}" for i in range(60)]
+    tiles = {}
+    for expr, values in zip(exprs, [xs, ys]):
+        col_id = expr.required_columns()[0].get_id()
+        tiles[col_id] = PyListTile(col_id, expr.name(), partition_id=0, block=DataBlock.make_block(pa.array(values)))
+    part = vPartition(columns=tiles, partition_id=0)
+    new_parts = part.split_by_hash(ExpressionList(exprs), 4)
+    assert sum(len(new_part) for new_part in new_parts) == 60
+    partition_of = {}
+    for i, new_part in enumerate(new_parts):
+        pd_df = new_part.to_pandas()
+        for key in zip(pd_df["x"], pd_df["y"]):
+            assert partition_of.setdefault(key, i) == i
@@ -0,0 +1,121 @@
+import pathlib
+
+import pyarrow as pa
+from pyarrow import parquet
+
+from daft.datasources import (
+    FileSplit,
+    InMemorySourceInfo,
+    get_hive_partition_table,
+    get_hive_partitions,
+    infer_hive_partition_schema,
+    pack_splits,
+    plan_text_partitions,
+    split_parquet_file,
+    split_text_file,
+)
+from daft.filesystem import FileInfo
+
+
+def test_split_text_file() -> None:
+    assert split_text_file("foo.csv", 100, target_partition_size=100) == [FileSplit("foo.csv")]
+    assert split_text_file("foo.csv", 0, target_partition_size=100) == [FileSplit("foo.csv")]
+    assert split_text_file("foo.csv", 250, target_partition_size=100) == [
+        FileSplit("foo.csv", start=0, end=83),
+        FileSplit("foo.csv", start=83, end=166),
+        FileSplit("foo.csv", start=166, end=250),
+    ]
+
+
+def test_split_compressed_text_file() -> None:
+    assert split_text_file("foo.csv.gz", 1000, target_partition_size=100) == [FileSplit("foo.csv.gz")]
+
+
+def test_split_parquet_file(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "foo.parquet")
+    parquet.write_table(pa.table({"foo": list(range(1000))}), path, row_group_size=100)
+    metadata = parquet.ParquetFile(path).metadata
+    row_group_size = max(metadata.row_group(i).column(0).total_compressed_size for i in range(10))
+
+    assert split_parquet_file(path, metadata, target_partition_size=metadata.serialized_size * 1000) == [
+        FileSplit(path)
+    ]
+    splits = split_parquet_file(path, metadata, target_partition_size=row_group_size * 3)
+    assert [split.row_groups for split in splits] == [(0, 1, 2), (3, 4, 5), (6, 7, 8), (9,)]
+    splits = split_parquet_file(path, metadata, target_partition_size=1)
+    assert [split.row_groups for split in splits] == [(i,) for i in range(10)]
+
+
+def test_pack_splits() -> None:
+    splits = [FileSplit(f"{i}.csv") for i in range(6)]
+    sizes = [10, 10, 80, 150, 30, 30]
+    assert pack_splits(list(zip(splits, sizes)), target_partition_size=100) == [
+        splits[0:3],
+        splits[3:4],
+        splits[4:6],
+    ]
+    assert pack_splits(list(zip(splits, sizes)), target_partition_size=1) == [[split] for split in splits]
+    assert pack_splits([], target_partition_size=100) == []
+
+
+def test_plan_text_partitions() -> None:
+    files = [
+        FileInfo("small-0.csv", size=10),
+        FileInfo("small-1.csv", size=10),
+        FileInfo("large.csv", size=250),
+        FileInfo("small-2.csv", size=10),
+    ]
+    assert plan_text_partitions(files, target_partition_size=100) == [
+        [FileSplit("small-0.csv"), FileSplit("small-1.csv")],
+        [FileSplit("large.csv", start=0, end=83)],
+        [FileSplit("large.csv", start=83, end=166)],
+        [FileSplit("large.csv", start=166, end=250), FileSplit("small-2.csv")],
+    ]
+
+
+def test_get_hive_partitions() -> None:
+    assert get_hive_partitions("s3://bucket/events/date=2022-08-01/region=us/part-0.parquet") == {
+        "date": "2022-08-01",
+        "region": "us",
+    }
+    assert get_hive_partitions("events/city=New%20York/region=__HIVE_DEFAULT_PARTITION__/part-0.csv") == {
+        "city": "New York",
+        "region": None,
+    }
+    # The name of the file itself is never a partition
+    assert get_hive_partitions("events/key=value.csv") == {}
+
+
+def test_infer_hive_partition_schema(tmp_path: pathlib.Path) -> None:
+    root = tmp_path / "key=root" / "events"
+    paths = [
+        root / "date=2022-08-01" / "hour=1" / "region=us" / "score=0.5" / "part-0.csv",
+        root / "date=2022-08-02" / "hour=__HIVE_DEFAULT_PARTITION__" / "region=eu" / "score=2" / "part-0.csv",
+        root / "date=2022-08-02" / "hour=23" / "score=-1" / "part-0.csv",
+    ]
+    files = [FileInfo(path=str(path), size=0) for path in paths]
+    # Directories above the root of the listing and keys that only some files have are not partitions
+    assert infer_hive_partition_schema(str(root), files) == pa.schema(
+        [("date", pa.string()), ("hour", pa.int64()), ("score", pa.float64())]
+    )
+    assert infer_hive_partition_schema(str(root / "*" / "*" / "*" / "*.csv"), files[2:]) == pa.schema(
+        [("date", pa.string()), ("hour", pa.int64()), ("score", pa.int64())]
+    )
+    assert infer_hive_partition_schema(str(paths[0]), files[:1]) == pa.schema([])
+
+
+def test_get_hive_partition_table() -> None:
+    schema = pa.schema([("hour", pa.int64()), ("region", pa.string())])
+    table = get_hive_partition_table(
+        ["hour=1/region=us/a.csv", "hour=__HIVE_DEFAULT_PARTITION__/region=eu/b.csv"], schema
+    )
+    assert table.to_pydict() == {"hour": [1, None], "region": ["us", "eu"]}
+
+
+def test_in_memory_partition_bounds() -> None:
+    source_info = InMemorySourceInfo(table=pa.table({"a": list(range(10))}), num_partitions=4)
+    bounds = [source_info.get_partition_bounds(i) for i in range(4)]
+    assert bounds == [(0, 2), (2, 5), (5, 7), (7, 10)]
+
+    py_source_info = InMemorySourceInfo(table=pa.table({}), py_columns={"a": [object()] * 3}, num_partitions=2)
+    assert [py_source_info.get_partition_bounds(i) for i in range(2)] == [(0, 1), (1, 3)]
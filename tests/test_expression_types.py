@@ -67,6 +67,18 @@ EXCLUDE_OPS = {
     "MIN",
     "MAX",
     "COUNT",
+    "FIRST",
+    "COUNT_DISTINCT",
+    "DISTINCT",
+    "MOMENTS",
+    "MOMENTS_MERGE",
+    "MOMENTS_VARIANCE",
+    "HLL_SKETCH",
+    "HLL_MERGE",
+    "HLL_CARDINALITY",
+    "TDIGEST_SKETCH",
+    "TDIGEST_MERGE",
+    "TDIGEST_QUANTILE",
 }
 
 # Mapping between ExpressionTypes and their expected numpy dtype
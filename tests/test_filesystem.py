@@ -0,0 +1,178 @@
+import os
+import pathlib
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import fsspec
+import pyarrow as pa
+import pytest
+from pyarrow import parquet
+
+from daft.config import DaftSettings
+from daft.dataframe import DataFrame
+from daft.filesystem import (
+    FileInfo,
+    _read_parquet_metadata,
+    get_block_cache,
+    get_filesystem,
+    get_parquet_metadata,
+    list_files,
+    open_file,
+)
+
+
+def test_parquet_metadata_cache(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "foo.parquet")
+    parquet.write_table(pa.table({"foo": [1, 2, 3]}), path)
+
+    misses = _read_parquet_metadata.cache_info().misses
+    assert get_parquet_metadata(path).num_rows == 3
+    assert get_parquet_metadata(path).num_rows == 3
+    assert _read_parquet_metadata.cache_info().misses == misses + 1
+
+    # Overwriting the file changes its size and modification time, which invalidates the cached footer
+    parquet.write_table(pa.table({"foo": [1, 2, 3, 4], "bar": ["a", "b", "c", "d"]}), path)
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+    metadata = get_parquet_metadata(path)
+    assert metadata.num_rows == 4
+    assert metadata.num_columns == 2
+    assert _read_parquet_metadata.cache_info().misses == misses + 2
+
+
+@pytest.fixture(scope="function")
+def nested_files(tmp_path: pathlib.Path) -> pathlib.Path:
+    for path in ["a/x.csv", "a/y.csv", "a/b/z.csv", "c/x.csv", "c/_SUCCESS", ".hidden/x.csv", "d.json"]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("foo")
+    return tmp_path
+
+
+@pytest.fixture(scope="function")
+def no_listing_cache(monkeypatch):
+    monkeypatch.setattr(DaftSettings, "DAFT_LISTING_CACHE_TTL_SECONDS", 0)
+
+
+def _relative_paths(files: List[FileInfo], root: pathlib.Path) -> List[str]:
+    return [str(pathlib.Path(file.path).relative_to(root)) for file in files]
+
+
+@pytest.mark.parametrize(
+    ["pattern", "expected"],
+    [
+        ("a/x.csv", ["a/x.csv"]),
+        ("a", ["a/b/z.csv", "a/x.csv", "a/y.csv"]),
+        ("", ["a/b/z.csv", "a/x.csv", "a/y.csv", "c/x.csv", "d.json"]),
+        ("*/x.csv", ["a/x.csv", "c/x.csv"]),
+        ("a/*", ["a/x.csv", "a/y.csv"]),
+        ("*/*.csv", ["a/x.csv", "a/y.csv", "c/x.csv"]),
+        ("*/b/*.csv", ["a/b/z.csv"]),
+        ("a/[xz].csv", ["a/x.csv"]),
+        ("missing/*.csv", []),
+        ("missing.csv", []),
+    ],
+)
+def test_list_files(nested_files: pathlib.Path, no_listing_cache, pattern: str, expected: List[str]) -> None:
+    files = list_files(str(nested_files / pattern))
+    assert _relative_paths(files, nested_files) == expected
+    assert all(file.size == 3 for file in files)
+
+
+def test_list_files_not_cached_by_default(nested_files: pathlib.Path) -> None:
+    path = str(nested_files / "a")
+    assert _relative_paths(list_files(path), nested_files) == ["a/b/z.csv", "a/x.csv", "a/y.csv"]
+    (nested_files / "a" / "new.csv").write_text("foo")
+    assert _relative_paths(list_files(path), nested_files) == ["a/b/z.csv", "a/new.csv", "a/x.csv", "a/y.csv"]
+
+
+def test_list_files_cache(nested_files: pathlib.Path, monkeypatch) -> None:
+    monkeypatch.setattr(DaftSettings, "DAFT_LISTING_CACHE_TTL_SECONDS", 300)
+    path = str(nested_files / "a")
+    assert _relative_paths(list_files(path), nested_files) == ["a/b/z.csv", "a/x.csv", "a/y.csv"]
+    (nested_files / "a" / "new.csv").write_text("foo")
+    assert _relative_paths(list_files(path), nested_files) == ["a/b/z.csv", "a/x.csv", "a/y.csv"]
+
+
+def test_parquet_metadata_cache_with_cached_listing(tmp_path: pathlib.Path, monkeypatch) -> None:
+    monkeypatch.setattr(DaftSettings, "DAFT_LISTING_CACHE_TTL_SECONDS", 300)
+    path = str(tmp_path / "foo.parquet")
+    parquet.write_table(pa.table({"foo": [1, 2, 3]}), path)
+    assert DataFrame.from_parquet(path).schema().column_names() == ["foo"]
+
+    # The listing of the overwritten file is still cached, but its footer is looked up by a fresh stat of the file
+    parquet.write_table(pa.table({"foo": [1, 2, 3, 4], "bar": ["a", "b", "c", "d"]}), path)
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+    assert DataFrame.from_parquet(path).schema().column_names() == ["foo", "bar"]
+
+
+def test_get_filesystem_is_pooled() -> None:
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        filesystems = list(pool.map(lambda _: get_filesystem("memory"), range(32)))
+    assert all(fs is filesystems[0] for fs in filesystems)
+    assert get_filesystem("file", auto_mkdir=True) is get_filesystem("file", auto_mkdir=True)
+    assert get_filesystem("file", auto_mkdir=True) is not get_filesystem("file", auto_mkdir=False)
+
+
+BLOCK_SIZE = 16
+
+
+@pytest.fixture(scope="function")
+def block_cache_dir(tmp_path: pathlib.Path, monkeypatch) -> pathlib.Path:
+    monkeypatch.setattr(DaftSettings, "DAFT_BLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(DaftSettings, "DAFT_BLOCK_CACHE_BLOCK_SIZE_BYTES", BLOCK_SIZE)
+    return tmp_path / "cache"
+
+
+@pytest.fixture(scope="function")
+def remote_path() -> str:
+    # The in-memory filesystem is not local, so its files are read through the block cache
+    path = f"/{uuid.uuid4().hex}/data.txt"
+    fsspec.filesystem("memory").pipe(path, bytes(range(100)))
+    return f"memory://{path}"
+
+
+def test_block_cache(block_cache_dir: pathlib.Path, remote_path: str) -> None:
+    with open_file(remote_path) as f:
+        f.seek(32)
+        assert f.read(10) == bytes(range(32, 42))
+    cache = get_block_cache()
+    assert cache is not None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    with open_file(remote_path) as f:
+        assert f.read() == bytes(range(100))
+    assert (cache.hits, cache.misses) == (1, 7)
+    assert sorted(path.stat().st_size for path in block_cache_dir.iterdir()) == [4] + [BLOCK_SIZE] * 6
+
+    # Overwriting the file changes its size, so its blocks are read again
+    fsspec.filesystem("memory").pipe(remote_path, b"foo")
+    with open_file(remote_path) as f:
+        assert f.read() == b"foo"
+    assert cache.misses == 8
+
+
+def test_block_cache_eviction(block_cache_dir: pathlib.Path, remote_path: str, monkeypatch) -> None:
+    monkeypatch.setattr(DaftSettings, "DAFT_BLOCK_CACHE_SIZE_BYTES", 3 * BLOCK_SIZE)
+    with open_file(remote_path) as f:
+        assert f.read() == bytes(range(100))
+    assert sum(path.stat().st_size for path in block_cache_dir.iterdir()) <= 3 * BLOCK_SIZE
+
+    # The most recently read blocks are kept
+    cache = get_block_cache()
+    assert cache is not None
+    with open_file(remote_path) as f:
+        f.seek(64)
+        assert f.read() == bytes(range(64, 100))
+    assert (cache.hits, cache.misses) == (3, 7)
+
+
+def test_scan_through_block_cache(block_cache_dir: pathlib.Path, remote_path: str) -> None:
+    fsspec.filesystem("memory").pipe(remote_path, b"a,b\n" + b"".join(f"{i},{i * 2}\n".encode() for i in range(100)))
+    assert DataFrame.from_csv(remote_path).to_pandas()["b"].sum() == 9900
+    cache = get_block_cache()
+    assert cache is not None
+    misses = cache.misses
+    assert DataFrame.from_csv(remote_path).to_pandas()["b"].sum() == 9900
+    assert cache.misses == misses